@@ -1,96 +1,125 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, send_file
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, send_file
 import threading
 import json
 import os
+import time
 from pathlib import Path
-from datetime import datetime
-from backend.amazon_review import AmazonReviewExtractor
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from backend.amazon_review import AmazonReviewExtractor, SAVE_FORMATS, create_driver_pool
+from backend.jobs import create_job_registry, QUEUED, RUNNING, COMPLETED, FAILED, DEFAULT_JOB_WORKERS, JOB_BACKEND
+from backend.review_store import ReviewStore, REVIEW_STORE_PATH
+from backend.results_view import get_results_view, precompute_results_view
+from backend.review_index import get_review_index, DEFAULT_PAGE_SIZE
+from backend.summary_cache import SummaryCache
+from backend.review_dedup import ReviewDedupIndex
+from backend.diagnostics import default_recorder
+from backend.metrics import DRIVER_POOL_SESSIONS, JOB_SECONDS, JOBS, render_metrics
+from backend.log_setup import configure_logging
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['REVIEWS_DIR'] = 'reviews'
+app.config['EXTRACTION_ENGINE'] = os.environ.get('EXTRACTION_ENGINE', 'selenium')
+app.config['EXTRACTION_WORKERS'] = int(os.environ.get('EXTRACTION_WORKERS', 1))
+app.config['INCREMENTAL_CRAWL'] = os.environ.get('INCREMENTAL_CRAWL', 'false').lower() == 'true'
+app.config['PIPELINED_RUN'] = os.environ.get('PIPELINED_RUN', 'false').lower() == 'true'
+app.config['JOB_BACKEND'] = JOB_BACKEND
+# Progress streams send a keep-alive comment when idle and are closed after a while; the browser reconnects
+app.config['SSE_HEARTBEAT_SECONDS'] = int(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+app.config['SSE_MAX_STREAM_SECONDS'] = int(os.environ.get('SSE_MAX_STREAM_SECONDS', 600))
+
+# Share of the progress bar reached when each extraction stage starts
+STAGE_PROGRESS = {'starting': 5, 'crawl': 10, 'sentiment': 80, 'summary': 85, 'save': 92, 'saved': 95}
 
 # Ensure reviews directory exists
 Path(app.config['REVIEWS_DIR']).mkdir(exist_ok=True)
 
-# Thread-safe extraction status
-extraction_status_lock = threading.Lock()
-extraction_status = {
-    'running': False,
-    'progress': 0,
-    'message': '',
-    'results_file': None,
-    'summary_file': None,
-    'product_url': None,
-    'num_pages': None,
-    'error': None
-}
-
-def run_extraction(product_url, num_pages, output_format, debug=True):
-    global extraction_status
+# Web processes tag their records per job too. With the sqlite backend several of them run at once, so the
+# rotating log file is left to worker.py and web processes log to stdout only.
+configure_logging(to_file=app.config['JOB_BACKEND'] == 'memory')
+
+# Warm browser sessions shared by all extraction jobs
+driver_pool = create_driver_pool(debug_mode=False)
+prewarm_sessions = int(os.environ.get('DRIVER_POOL_PREWARM', 1))
+
+def prewarm_driver_pool():
+    if prewarm_sessions > 0:
+        threading.Thread(target=driver_pool.warm, args=(prewarm_sessions,), daemon=True).start()
+
+# With the sqlite job backend extractions run in worker.py, so web processes never launch browsers
+if app.config['JOB_BACKEND'] == 'memory':
+    prewarm_driver_pool()
+
+# Reviews are persisted per ASIN so repeat extractions only crawl what is new
+review_store = ReviewStore(REVIEW_STORE_PATH)
+# LLM summaries are reused when a product's reviews have not (or barely) changed
+summary_cache = SummaryCache()
+# Copied and near-duplicate reviews are flagged against everything crawled before, across products
+dedup_index = ReviewDedupIndex()
+# Screenshots and page sources are written by one background thread shared across jobs
+diagnostics = default_recorder()
+
+def local_stats():
+    # Stats of the pool, cache and recorder in this process; worker.py publishes them with its heartbeat
+    pool = driver_pool.stats()
+    for state in ('open', 'idle', 'in_use'):
+        DRIVER_POOL_SESSIONS.labels(state=state).set(pool[state])
+    return {'driver_pool': pool, 'summary_cache': summary_cache.stats(), 'diagnostics': diagnostics.stats()}
+
+def extraction_stats():
+    # With the sqlite backend the web process's own pool and cache are never used; report the worker's instead
+    if app.config['JOB_BACKEND'] == 'sqlite':
+        worker = job_registry.worker_status()
+        stats = worker.pop('stats')
+        return {key: stats.get(key) for key in ('driver_pool', 'summary_cache', 'diagnostics')} | {'worker': worker}
+    return local_stats()
+
+def progress_percent(progress):
+    stage = progress.get('stage')
+    if stage != 'crawl' or not progress.get('pages_done'):
+        return STAGE_PROGRESS.get(stage, 0)
+    crawl_share = STAGE_PROGRESS['sentiment'] - STAGE_PROGRESS['crawl']
+    if progress.get('max_pages'):
+        fraction = min(1.0, progress['pages_done'] / progress['max_pages'])
+    else:
+        # Unknown page count: approach the end of the crawl share without reaching it
+        fraction = progress['pages_done'] / (progress['pages_done'] + 5)
+    return STAGE_PROGRESS['crawl'] + int(crawl_share * fraction)
+
+def run_extraction(job_id, params):
+    product_url = params['product_url']
+    num_pages = params['num_pages']
+    output_format = params['output_format']
+
+    def on_progress(progress):
+        job_registry.update(job_id, progress=progress_percent(progress), **progress)
+
+    extractor = AmazonReviewExtractor(driver_pool=driver_pool, review_store=review_store, summary_cache=summary_cache,
+                                      diagnostics=diagnostics, progress_callback=on_progress, log_context=job_id,
+                                      dedup_index=dedup_index)
+    started = time.perf_counter()
+    result = None
     try:
-        with extraction_status_lock:
-            extraction_status.update({
-                'running': True,
-                'progress': 10,
-                'message': "Initializing extractor...",
-                'results_file': None,
-                'summary_file': None,
-                'product_url': product_url,
-                'num_pages': num_pages,
-                'error': None
-            })
-
-        extractor = AmazonReviewExtractor()
-
-        with extraction_status_lock:
-            extraction_status.update({
-                'progress': 30,
-                'message': "Setting up WebDriver..."
-            })
-
-        with extraction_status_lock:
-            extraction_status.update({
-                'progress': 50,
-                'message': f"Extracting up to {num_pages or 'all'} pages..."
-            })
-
-        result = extractor.run(product_url=product_url, max_pages=num_pages, save_format=output_format, debug=debug)
-        
-        with extraction_status_lock:
-            if result:
-                filepath = result
-                extraction_status.update({
-                    'results_file': filepath,
-                    'progress': 100,
-                    'message': "Extraction complete!",
-                    'running': False
-                })
-                if output_format.lower() == 'csv':
-                    asin = extractor.product_asin or 'unknown_asin'
-                    timestamp = Path(filepath).stem.split('_')[-1]
-                    summary_path = Path(app.config['REVIEWS_DIR']) / f"amazon_reviews_{asin}_{timestamp}_summary.json"
-                    if summary_path.exists():
-                        extraction_status['summary_file'] = str(summary_path)
-                    else:
-                        extraction_status['summary_file'] = None
-                else:
-                    extraction_status['summary_file'] = None  # Explicitly set to None for JSON output
-            else:
-                extraction_status.update({
-                    'error': "Extraction failed or no reviews found",
-                    'progress': 100,
-                    'running': False
-                })
-
-    except Exception as e:
-        with extraction_status_lock:
-            extraction_status.update({
-                'error': str(e),
-                'running': False,
-                'progress': 100
-            })
+        result = extractor.run(product_url=product_url, max_pages=num_pages, save_format=output_format, debug=params['debug'],
+                               engine=app.config['EXTRACTION_ENGINE'], workers=app.config['EXTRACTION_WORKERS'],
+                               incremental=app.config['INCREMENTAL_CRAWL'], pipeline=app.config['PIPELINED_RUN'])
+    finally:
+        JOB_SECONDS.labels(outcome='completed' if result else 'failed').observe(time.perf_counter() - started)
+    job_registry.update(job_id, timeline=extractor.stage_timeline.summary())
+
+    if result:
+        summary_file = None
+        if output_format.lower() == 'csv' and extractor.summary_file and Path(extractor.summary_file).exists():
+            summary_file = extractor.summary_file
+        job_registry.update(job_id, progress=97, stage='results', message="Preparing results view...")
+        precompute_results_view(result, summary_file, product_url)
+        job_registry.update(job_id, state=COMPLETED, results_file=result, summary_file=summary_file,
+                            message="Extraction complete!")
+    else:
+        job_registry.update(job_id, state=FAILED, error="Extraction failed or no reviews found")
+
+# Jobs are queued and served by a fixed number of worker threads, in this process (memory) or in worker.py (sqlite)
+job_registry = create_job_registry(app.config['JOB_BACKEND'], run_extraction,
+                                   workers=int(os.environ.get('JOB_WORKERS', DEFAULT_JOB_WORKERS)))
 
 @app.route('/', methods=['GET', 'POST'])
 def index():
@@ -99,179 +128,124 @@ def index():
         num_pages = request.form.get('num_pages', type=int)
         output_format = request.form.get('output_format', 'json').lower()
 
-        if output_format not in ['json', 'csv']:
-            return render_template('index.html', error="Invalid output format. Choose 'json' or 'csv'.")
+        if output_format not in SAVE_FORMATS:
+            return render_template('index.html', error=f"Invalid output format. Choose one of {', '.join(SAVE_FORMATS)}.")
 
         if not product_url:
             return render_template('index.html', error="Product URL is required")
 
-        with extraction_status_lock:
-            global extraction_status
-            extraction_status = {
-                'running': True,
-                'progress': 0,
-                'message': 'Starting extraction...',
-                'results_file': None,
-                'summary_file': None,
-                'product_url': product_url,
-                'num_pages': num_pages,
-                'error': None
-            }
-
-        thread = threading.Thread(
-            target=run_extraction,
-            args=(product_url, num_pages, output_format, app.debug)
-        )
-        thread.start()
-
-        return redirect(url_for('loading'))
-
-    return render_template('index.html')
+        job_id = job_registry.submit(product_url=product_url, num_pages=num_pages,
+                                     output_format=output_format, debug=app.debug)
 
-@app.route('/loading')
-def loading():
-    return render_template('loading.html')
+        return redirect(url_for('loading', job_id=job_id))
 
-@app.route('/status')
-def status():
-    with extraction_status_lock:
-        return jsonify(extraction_status)
+    return render_template('index.html', error=request.args.get('error'))
 
-@app.route('/download/<file_type>')
-def download_file(file_type):
-    with extraction_status_lock:
-        filepath = extraction_status.get('results_file') if file_type == 'results' else extraction_status.get('summary_file')
+@app.route('/loading/<job_id>')
+def loading(job_id):
+    job = job_registry.get(job_id)
+    if job is None:
+        return redirect(url_for('index'))
+    return render_template('loading.html', job_id=job_id)
+
+@app.route('/status/<job_id>')
+def status(job_id):
+    job = job_registry.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job', 'running': False}), 404
+    job.pop('params', None)
+    return jsonify(job | {'jobs': job_registry.stats()} | extraction_stats())
+
+@app.route('/metrics')
+def metrics():
+    jobs = job_registry.stats()
+    for state in (QUEUED, RUNNING, COMPLETED, FAILED):
+        JOBS.labels(state=state).set(jobs[state])
+    if app.config['JOB_BACKEND'] == 'memory':
+        # worker.py sets the pool gauges itself with every heartbeat
+        local_stats()
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
+@app.route('/stream/<job_id>')
+def stream(job_id):
+    if job_registry.get(job_id) is None:
+        return jsonify({'error': 'Unknown job', 'running': False}), 404
+    heartbeat = app.config['SSE_HEARTBEAT_SECONDS']
+    deadline = time.monotonic() + app.config['SSE_MAX_STREAM_SECONDS']
+
+    def events():
+        version = -1
+        yield "retry: 2000\n\n"
+        while time.monotonic() < deadline:
+            job = job_registry.wait_for_change(job_id, version, timeout=heartbeat)
+            if job is None:
+                return
+            if job['version'] == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = job['version']
+            job.pop('params', None)
+            yield f"id: {version}\nevent: progress\ndata: {json.dumps(job)}\n\n"
+            if not job['running']:
+                return
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/download/<job_id>/<file_type>')
+def download_file(job_id, file_type):
+    job = job_registry.get(job_id) or {}
+    filepath = job.get('results_file') if file_type == 'results' else job.get('summary_file')
 
     if not filepath or not Path(filepath).exists():
         return redirect(url_for('index'), code=302)
 
     return send_file(filepath, as_attachment=True, download_name=Path(filepath).name)
 
-@app.route('/results')
-def results():
-    with extraction_status_lock:
-        status = extraction_status.copy()
+@app.route('/results/<job_id>')
+def results(job_id):
+    status = job_registry.get(job_id)
+    if status is None:
+        return redirect(url_for('index'))
+    status['product_url'] = status['params']['product_url']
 
     if status.get('error'):
         return render_template('index.html', error=status['error'])
 
     if not status.get('results_file'):
-        return redirect(url_for('index'))
+        return redirect(url_for('loading', job_id=job_id))
 
     filepath = status['results_file']
     if not Path(filepath).exists():
         return render_template('index.html', error="Results file not found")
 
-    results = {}
-    summary = {}
-    reviews = []
-
-    analyzer = SentimentIntensityAnalyzer()
-
-    if filepath.endswith('.json'):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            results = json.load(f)
-        reviews = results.get('reviews', [])
-        summary = results.get('summary', {})
-        sentiment_counts = results.get('sentiment_analysis', {'positive': 0, 'negative': 0, 'neutral': 0})
-        summary_file = None  # JSON output doesn't have a separate summary file
-    elif filepath.endswith('.csv'):
-        import pandas as pd
-        df = pd.read_csv(filepath, encoding='utf-8-sig')
-        reviews = df.to_dict('records')
-        summary_file = status.get('summary_file')
-        if summary_file and Path(summary_file).exists():
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                summary = json.load(f)
-            # For CSV, use the review_counts from the summary file
-            sentiment_counts = summary.get('review_counts', {'positive': 0, 'negative': 0, 'neutral': 0})
-        else:
-            summary_file = None
-            sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
-        results = {
-            'metadata': {
-                'product_url': status.get('product_url', ''),
-                'extraction_date': datetime.now().isoformat(),
-                'total_reviews': len(df),
-                'source': 'Amazon',
-                'extractor_version': '1.1'
-            },
-            'reviews': reviews,
-            'summary': summary
-        }
-
-    # Ensure all expected fields are present in reviews
-    for review in reviews:
-        review.setdefault('reviewer_name', 'Unknown')
-        review.setdefault('rating', 0.0)
-        review.setdefault('title', 'No Title')
-        review.setdefault('date', 'Unknown Date')
-        review.setdefault('body', '')
-        review.setdefault('sentiment', 'neutral')
-
-    # Step 1: Compute initial sentiment scores using VADER to rank reviews
-    sentiment_scores = []
-    for review in reviews:
-        text = review.get("body", "")
-        if not text:
-            score = 0.0  # Neutral default for empty reviews
-        else:
-            scores = analyzer.polarity_scores(text)
-            score = scores["compound"]
-        sentiment_scores.append((review, score))
-
-    # Step 2: Sort reviews by compound score (highest to lowest)
-    sentiment_scores.sort(key=lambda x: x[1], reverse=True)
-
-    # Step 3: Assign sentiments to match the counts from sentiment_analysis
-    target_counts = {
-        'positive': sentiment_counts['positive'],
-        'negative': sentiment_counts['negative'],
-        'neutral': sentiment_counts['neutral']
-    }
-    assigned_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
-
-    # Assign positive sentiments to the highest-scoring reviews
-    for review, score in sentiment_scores:
-        if assigned_counts['positive'] < target_counts['positive']:
-            review['sentiment'] = 'positive'
-            assigned_counts['positive'] += 1
-        elif assigned_counts['negative'] < target_counts['negative'] and score < 0:
-            review['sentiment'] = 'negative'
-            assigned_counts['negative'] += 1
-        else:
-            # Assign remaining reviews as neutral or negative based on score
-            if assigned_counts['negative'] < target_counts['negative'] and score < -0.05:
-                review['sentiment'] = 'negative'
-                assigned_counts['negative'] += 1
-            else:
-                review['sentiment'] = 'neutral'
-                assigned_counts['neutral'] += 1
-
-    # Ensure summary has all expected fields
-    summary.setdefault('pros', ['No pros available'] * 5)
-    summary.setdefault('cons', ['No cons available'] * 5)
-    summary.setdefault('summary', ['No summary available'] * 5)
-    summary.setdefault('total_score', 0)
-    # Use the counts from sentiment_analysis
-    summary['review_counts'] = {
-        'positive': sentiment_counts['positive'],
-        'negative': sentiment_counts['negative'],
-        'neutral': sentiment_counts['neutral'],
-        'total': len(reviews)
-    }
-
-    context = {
-        'product_url': results['metadata']['product_url'],
-        'total_reviews': results['metadata']['total_reviews'],
-        'extraction_date': results['metadata']['extraction_date'],
-        'reviews': reviews,
-        'sentiment': sentiment_counts,
-        'summary': summary,
-        'summary_file': summary_file
-    }
-
-    return render_template('results.html', **context)
+    view = get_results_view(filepath, status.get('summary_file'), status['product_url'])
+    return render_template('results.html', **view, job_id=job_id)
+
+@app.route('/api/reviews')
+def api_reviews():
+    job = job_registry.get(request.args.get('job_id', ''))
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    filepath = job.get('results_file')
+    if not filepath or not Path(filepath).exists():
+        return jsonify({'error': 'Results not available for this job'}), 404
+
+    verified = request.args.get('verified')
+    try:
+        index = get_review_index(filepath, job.get('summary_file'), job['params']['product_url'])
+        page = index.query(
+            sentiment=request.args.get('sentiment') or None,
+            rating=request.args.get('rating', type=int),
+            verified=None if not verified else verified.lower() == 'true',
+            sort=request.args.get('sort', 'default'),
+            cursor=request.args.get('cursor') or None,
+            limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(page)
 
 if __name__ == '__main__':
     # Use environment variables for port to work with Render
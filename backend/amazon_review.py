@@ -2,15 +2,16 @@ import logging
 import time
 import random
 import json
-import pandas as pd
 import sys
 import os
 import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import openai
 from tenacity import retry, wait_fixed, stop_after_attempt
 from pathlib import Path
-from urllib.parse import quote
+from urllib.parse import quote, urlencode, urlparse
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -24,186 +25,327 @@ from selenium.common.exceptions import (
     ElementClickInterceptedException,
     StaleElementReferenceException
 )
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 from dotenv import load_dotenv
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Loaded once, before the backend modules below read their configuration from the environment
+load_dotenv()
+
+if __package__ in (None, ""):
+    # Allow running as `python backend/amazon_review.py` as well as `python -m backend.amazon_review`
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.driver_pool import DriverPool, PooledDriver
+from backend.review_fields import REVIEW_ELEMENT_SELECTORS, REVIEW_FIELD_SELECTORS, build_review_record, content_review_id
+from backend.http_engine import HttpReviewFetcher, parse_reviews_html, find_next_page_url
+from backend.politeness import PolitenessPolicy, POLITENESS_PRESETS
+from backend.review_store import ReviewStore, REVIEW_STORE_PATH
+from backend.sentiment import score_reviews, count_sentiments
+from backend.review_sink import ReviewSpool, atomic_path, write_json_export
+from backend.summarizer import ReviewSummarizer
+from backend.summary_cache import SummaryCache, SUMMARY_CACHE_DIR
+from backend.review_dedup import ReviewDedupIndex, DEDUP_INDEX_PATH
+from backend.pipeline import ReviewPipeline, StageTimeline
+from backend.browser_profile import BROWSER_PROFILE, BROWSER_PROFILES, apply_profile_network, apply_profile_options
+from backend.metrics import (CAPTCHAS, DUPLICATES_FLAGGED, DUPLICATES_SKIPPED, NAVIGATION_SECONDS, RETRIES,
+                             REVIEWS_PER_PAGE, count_retry)
+from backend.batch import BatchRunner, read_batch_file, BATCH_DEFAULT_DOMAIN, BATCH_DOMAIN_CONCURRENCY, BATCH_WORKERS
+from backend.diagnostics import DiagnosticsRecorder, DIAGNOSTICS_MODE, DIAGNOSTICS_MODES, default_recorder
+from backend.log_setup import job_logger
 
 # --- Configuration ---
-LOG_DIR = "logs"
 REVIEWS_DIR = "reviews"
+# Crawls stream reviews to reviews/spool/*.jsonl; the spool is removed once the export is written unless kept
+KEEP_REVIEW_SPOOL = os.getenv("KEEP_REVIEW_SPOOL", "false").lower() == "true"
 WAIT_TIMEOUT_SECONDS = 20
 MAX_NAVIGATION_RETRIES = 5
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Review pages come from the product URL's own marketplace unless this points every crawl at one host
+REVIEWS_BASE_URL = os.getenv("AMAZON_REVIEWS_BASE_URL", "")
+ENGINES = ["selenium", "http"]
+SAVE_FORMATS = ["json", "csv", "parquet"]
+REVIEW_PAGE_QUERY = {"ie": "UTF8", "reviewerType": "all_reviews"}
+INCREMENTAL_PAGE_QUERY = {"sortBy": "recent"}
+PARALLEL_CONCURRENCY_CAP = int(os.getenv("PARALLEL_CONCURRENCY_CAP", "4"))
+# A parallel crawl with no page limit stops scheduling pages once this many have failed
+PARALLEL_MAX_FAILED_PAGES = int(os.getenv("PARALLEL_MAX_FAILED_PAGES", "3"))
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+DRIVER_POOL_IDLE_TIMEOUT = float(os.getenv("DRIVER_POOL_IDLE_TIMEOUT", "300"))
+DRIVER_POOL_MAX_USES = int(os.getenv("DRIVER_POOL_MAX_USES", "20"))
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/117.0',
+    'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/117.0'
+]
+
+# Process-wide cap on concurrent page fetches, shared by every parallel crawl
+page_fetch_slots = threading.BoundedSemaphore(PARALLEL_CONCURRENCY_CAP)
+
+# Snapshot used to detect that in-place pagination has swapped the review list
+PAGE_STATE_SCRIPT = """
+const first = document.querySelector(arguments[0]);
+const selected = document.querySelector('ul.a-pagination li.a-selected');
+return {
+    url: location.href,
+    page: selected ? selected.innerText.trim() : null,
+    first_review: first ? (first.id || first.innerText.slice(0, 80)) : null,
+    reviews: document.querySelectorAll(arguments[0]).length,
+    ready: document.readyState
+};
+"""
+
+# Collects the raw text of every review field on the page in a single WebDriver round trip
+BULK_EXTRACT_SCRIPT = """
+const containerSelectors = arguments[0];
+const fields = arguments[1];
+let matched = null;
+let nodes = [];
+for (const selector of containerSelectors) {
+    nodes = Array.from(document.querySelectorAll(selector));
+    if (nodes.length) { matched = selector; break; }
+}
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText : null;
+};
+const reviews = nodes.map(el => {
+    const rating = el.querySelector(fields.rating);
+    return {
+        id: el.id || null,
+        name: text(el, fields.name),
+        rating: rating ? rating.textContent : null,
+        title: text(el, fields.title),
+        body: text(el, fields.body),
+        date: text(el, fields.date),
+        verified: text(el, fields.verified),
+        votes: text(el, fields.votes),
+        variant: text(el, fields.variant),
+        images: Array.from(el.querySelectorAll(fields.images)).map(img => img.src)
+    };
+});
+return JSON.stringify({selector: matched, reviews: reviews});
+"""
+
+def create_chrome_driver(logger: logging.Logger, debug_mode=True, user_agents: List[str] = USER_AGENTS,
+                         profile: str = BROWSER_PROFILE):
+    try:
+        chrome_options = Options()
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_argument(f'--user-agent={random.choice(user_agents)}')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--enable-unsafe-swiftshader')
+        chrome_options.add_argument('--start-maximized')
+        
+        # Always run in headless mode for Render deployment
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--ignore-certificate-errors')
+        chrome_options.add_argument('--ignore-ssl-errors')
+        chrome_options.add_argument('--disable-application-cache')
+        chrome_options.add_argument('--disable-extensions')
+        if not debug_mode:
+            chrome_options.add_argument('--headless=new')
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_argument('--disable-software-rasterizer')
+        apply_profile_options(chrome_options, profile)
+
+        # Use the pre-installed ChromeDriver in Docker container
+        try:
+            # Check if we're in the Docker container (pre-installed chromedriver)
+            if os.path.exists('/usr/local/bin/chromedriver'):
+                logger.info("Using pre-installed ChromeDriver in Docker container")
+                service = Service(executable_path='/usr/local/bin/chromedriver')
+            else:
+                # Fallback for local development
+                logger.info("Using local ChromeDriver")
+                # For Windows
+                if os.name == 'nt':
+                    chrome_driver_path = os.path.join(os.getcwd(), 'chromedriver.exe')
+                else:
+                    # For Linux/Mac
+                    chrome_driver_path = os.path.join(os.getcwd(), 'chromedriver')
+                
+                if not os.path.exists(chrome_driver_path):
+                    logger.warning(f"ChromeDriver not found at {chrome_driver_path}")
+                    logger.info("Please download ChromeDriver manually for local development")
+                    chrome_driver_path = 'chromedriver'  # Try using from PATH
+                
+                service = Service(executable_path=chrome_driver_path)
+        except Exception as e:
+            logger.error(f"Error setting up ChromeDriver service: {str(e)}")
+            return None
+        try:
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": random.choice(user_agents)})
+            apply_profile_network(driver, profile, logger)
+            return driver
+        except Exception as e:
+            logger.error(f"Failed to start ChromeDriver: {str(e)}")
+            # Check if it's a version mismatch error
+            if "session not created" in str(e) and "This version of ChromeDriver only supports Chrome version" in str(e):
+                logger.error("ChromeDriver version doesn't match Chrome browser version.")
+                logger.error("Please update the CHROMEDRIVER_VERSION in the Dockerfile to match your Chrome version.")
+            return None
+    except Exception as e:
+        logger.error(f"Error setting up WebDriver: {str(e)}", exc_info=True)
+        if "WinError 193" in str(e):
+            logger.error(
+                "WinError 193 detected: This indicates an architecture mismatch. "
+                "Since your system is 64-bit, ensure you are using 64-bit Python and 64-bit Google Chrome. "
+                "Also, verify that ChromeDriver matches your Chrome version."
+            )
+        return None
+
+
+def create_driver_pool(size=DRIVER_POOL_SIZE, idle_timeout=DRIVER_POOL_IDLE_TIMEOUT, max_uses=DRIVER_POOL_MAX_USES,
+                       debug_mode=True, logger: Optional[logging.Logger] = None,
+                       profile: str = BROWSER_PROFILE) -> DriverPool:
+    logger = logger or logging.getLogger("AmazonExtractorLogger")
+    return DriverPool(lambda: create_chrome_driver(logger, debug_mode, profile=profile), size=size,
+                      idle_timeout=idle_timeout, max_uses=max_uses, logger=logger)
+
+
 
 class AmazonReviewExtractor:
-    def __init__(self):
+    def __init__(self, driver_pool: Optional[DriverPool] = None, bulk_extraction: bool = True,
+                 politeness: Optional[PolitenessPolicy] = None, review_store: Optional[ReviewStore] = None,
+                 progress_callback: Optional[Callable[[Dict], None]] = None,
+                 summarizer: Optional[ReviewSummarizer] = None, summary_cache: Optional[SummaryCache] = None,
+                 diagnostics: Optional[DiagnosticsRecorder] = None, browser_profile: str = BROWSER_PROFILE,
+                 log_context: Optional[str] = None, dedup_index: Optional[ReviewDedupIndex] = None):
         self.driver = None
         self.wait = None
+        self.driver_pool = driver_pool
+        self.pooled_session: Optional[PooledDriver] = None
+        self.bulk_extraction = bulk_extraction
+        self.page_extraction_stats: List[Dict] = []
+        self.navigation_stats: List[Dict] = []
+        self.politeness = politeness or PolitenessPolicy.from_preset()
+        self.review_store = review_store
+        self.progress_callback = progress_callback
+        self.progress = {"stage": "starting", "pages_done": 0, "max_pages": None, "reviews": 0}
+        self.incremental = False
+        self.known_review_ids = set()
+        # Pages whose fetch failed after retries, as opposed to pages that were genuinely empty
+        self.failed_pages: List[int] = []
+        self.engine = "selenium"
+        self.workers = 1
+        self.debug_mode = True
+        self.browser_profile = browser_profile
+        self.http_cookies_seeded = False
         self.review_data = []
+        self.log_context = log_context
         self.logger = self.setup_logger()
-        load_dotenv()
+        self.summarizer = summarizer or ReviewSummarizer(logger=self.logger)
+        self.summary_cache = summary_cache
+        self.dedup_index = dedup_index
+        self.diagnostics = diagnostics or default_recorder()
         self.amazon_email = os.getenv('AMAZON_EMAIL')
         self.amazon_password = os.getenv('AMAZON_PASSWORD')
         self.product_url = None  # Will be set dynamically via frontend
-        self.user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/117.0',
-            'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/117.0'
-        ]
+        self.user_agents = list(USER_AGENTS)
         self.product_asin = None
+        self.summary_file = None
+        self.review_spool: Optional[ReviewSpool] = None
+        # Pipelined runs receive each page's new reviews here as soon as they are merged
+        self.page_sink: Optional[Callable[[List[Dict]], None]] = None
+        self.stage_timeline = StageTimeline()
+        self.page_started = time.perf_counter()
 
     def setup_logger(self):
-        log_dir_path = Path(__file__).parent / LOG_DIR
-        log_dir_path.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = log_dir_path / f"amazon_extractor_{timestamp}.log"
-
-        logger = logging.getLogger("AmazonExtractorLogger")
-        logger.setLevel(logging.INFO)
-
-        if not logger.handlers:
-            # File handler with UTF-8 encoding
-            file_handler = logging.FileHandler(log_filename, encoding='utf-8')
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-
-            # Console handler with UTF-8 encoding
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setFormatter(formatter)
-            if sys.platform.startswith('win'):
-                sys.stdout.reconfigure(encoding='utf-8')
-            logger.addHandler(console_handler)
-
-        return logger
+        # Tagged with the app job id or batch product; runs without one are tagged with the ASIN once known
+        return job_logger(self.log_context)
 
     def setup_driver(self, debug_mode=True):
-        try:
-            self.logger.info("Setting up WebDriver...")
-            chrome_options = Options()
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument(f'--user-agent={random.choice(self.user_agents)}')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--enable-unsafe-swiftshader')
-            chrome_options.add_argument('--start-maximized')
-            
-            # Always run in headless mode for Render deployment
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--ignore-certificate-errors')
-            chrome_options.add_argument('--ignore-ssl-errors')
-            chrome_options.add_argument('--disable-application-cache')
-            chrome_options.add_argument('--disable-extensions')
-            if not debug_mode:
-                chrome_options.add_argument('--headless=new')
-                chrome_options.add_argument('--blink-settings=imagesEnabled=false')
-                chrome_options.add_argument('--disable-software-rasterizer')
-
-            # Use the pre-installed ChromeDriver in Docker container
-            try:
-                # Check if we're in the Docker container (pre-installed chromedriver)
-                if os.path.exists('/usr/local/bin/chromedriver'):
-                    self.logger.info("Using pre-installed ChromeDriver in Docker container")
-                    service = Service(executable_path='/usr/local/bin/chromedriver')
-                else:
-                    # Fallback for local development
-                    self.logger.info("Using local ChromeDriver")
-                    # For Windows
-                    if os.name == 'nt':
-                        chrome_driver_path = os.path.join(os.getcwd(), 'chromedriver.exe')
-                    else:
-                        # For Linux/Mac
-                        chrome_driver_path = os.path.join(os.getcwd(), 'chromedriver')
-                    
-                    if not os.path.exists(chrome_driver_path):
-                        self.logger.warning(f"ChromeDriver not found at {chrome_driver_path}")
-                        self.logger.info("Please download ChromeDriver manually for local development")
-                        chrome_driver_path = 'chromedriver'  # Try using from PATH
-                    
-                    service = Service(executable_path=chrome_driver_path)
-            except Exception as e:
-                self.logger.error(f"Error setting up ChromeDriver service: {str(e)}")
-                return False
-            try:
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-                self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": random.choice(self.user_agents)})
-                self.wait = WebDriverWait(self.driver, WAIT_TIMEOUT_SECONDS)
-                self.logger.info("WebDriver setup completed successfully")
-                return True
-            except Exception as e:
-                self.logger.error(f"Failed to start ChromeDriver: {str(e)}")
-                # Check if it's a version mismatch error
-                if "session not created" in str(e) and "This version of ChromeDriver only supports Chrome version" in str(e):
-                    self.logger.error("ChromeDriver version doesn't match Chrome browser version.")
-                    self.logger.error("Please update the CHROMEDRIVER_VERSION in the Dockerfile to match your Chrome version.")
-                return False
-        except Exception as e:
-            self.logger.error(f"Error setting up WebDriver: {str(e)}", exc_info=True)
-            if "WinError 193" in str(e):
-                self.logger.error(
-                    "WinError 193 detected: This indicates an architecture mismatch. "
-                    "Since your system is 64-bit, ensure you are using 64-bit Python and 64-bit Google Chrome. "
-                    "Also, verify that ChromeDriver matches your Chrome version."
-                )
-            return False
+        self.logger.info("Setting up WebDriver...")
+        with self.stage_timeline.span("driver-setup", pooled=self.driver_pool is not None):
+            if self.driver_pool is not None:
+                self.pooled_session = self.driver_pool.acquire()
+                if self.pooled_session is None:
+                    self.logger.error("No WebDriver session available from the driver pool")
+                    return False
+                self.driver = self.pooled_session.driver
+                self.logger.info(f"Borrowed WebDriver from pool: {self.driver_pool.stats()}")
+            else:
+                self.driver = create_chrome_driver(self.logger, debug_mode, self.user_agents, self.browser_profile)
+                if self.driver is None:
+                    return False
+        self.wait = WebDriverWait(self.driver, WAIT_TIMEOUT_SECONDS)
+        self.logger.info("WebDriver setup completed successfully")
+        return True
+
+    def ensure_driver(self) -> bool:
+        if self.driver is not None:
+            return True
+        return self.setup_driver(debug_mode=self.debug_mode)
 
     def analyze_sentiment(self, reviews: List[Dict]) -> Dict[str, int]:
-        analyzer = SentimentIntensityAnalyzer()
-        sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-        for review in reviews:
-            text = review.get("body", "")
-            if not text:
-                continue
-            scores = analyzer.polarity_scores(text)
-            compound_score = scores["compound"]
-            if compound_score >= 0.05:
-                sentiment_counts["positive"] += 1
-            elif compound_score <= -0.05:
-                sentiment_counts["negative"] += 1
-            else:
-                sentiment_counts["neutral"] += 1
+        # Scores are computed once per review by score_reviews; later calls only count the stored labels
+        score_reviews(reviews)
+        sentiment_counts = count_sentiments(reviews)
         self.logger.info(f"Sentiment analysis: {sentiment_counts}")
         return sentiment_counts
 
-    def save_reviews(self, reviews: List[Dict]) -> str:
+    def score_sentiment(self, reviews: List[Dict]) -> int:
+        start = time.perf_counter()
+        scored = score_reviews(reviews)
+        elapsed = time.perf_counter() - start
+        if scored:
+            self.logger.info(f"Scored sentiment for {scored} reviews in {elapsed:.2f}s "
+                             f"({scored / max(elapsed, 1e-6):.0f} reviews/s)")
+            if self.review_store is not None:
+                self.review_store.save_sentiment(self.product_asin, reviews)
+        return scored
+
+    def save_reviews(self, reviews: List[Dict], summary: Optional[Dict] = None, save_format: str = "json") -> str:
         asin = self.product_asin if self.product_asin else "unknown_asin"
-        output_data = {
-            "metadata": {
-                "product_url": self.product_url,
-                "extraction_date": datetime.now().isoformat(),
-                "total_reviews": len(reviews),
-                "source": "Amazon",
-                "extractor_version": "1.1"
-            },
-            "reviews": reviews,
-            "sentiment_analysis": self.analyze_sentiment(reviews)
+        metadata = {
+            "product_url": self.product_url,
+            "extraction_date": datetime.now().isoformat(),
+            "total_reviews": len(reviews),
+            "duplicate_reviews": sum(1 for review in reviews if review.get('duplicate_of')),
+            "failed_pages": self.failed_pages,
+            "source": "Amazon",
+            "extractor_version": "1.1"
         }
+        trailer = {"sentiment_analysis": self.analyze_sentiment(reviews)}
+        if summary is not None:
+            trailer["summary"] = summary
 
-        output_path = Path(REVIEWS_DIR) / f"amazon_reviews_{asin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        extension = "parquet" if save_format == "parquet" else "json"
+        output_path = Path(REVIEWS_DIR) / f"amazon_reviews_{asin}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
         output_path.parent.mkdir(exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
-        self.logger.info(f"Reviews saved to: {output_path} with sentiment analysis: {output_data['sentiment_analysis']}")
+        if save_format == "parquet":
+            from backend.review_parquet import write_reviews_parquet
+            write_reviews_parquet(output_path, reviews, metadata, trailer)
+        else:
+            write_json_export(output_path, metadata, reviews, trailer)
+        self.logger.info(f"Reviews saved to: {output_path} with sentiment analysis: {trailer['sentiment_analysis']}")
         return str(output_path)
 
     def _safe_get(self, url: str, description: str) -> bool:
         for attempt in range(MAX_NAVIGATION_RETRIES):
+            attempt_start = time.perf_counter()
+            outcome = "failed"
+            if attempt:
+                RETRIES.labels(operation="navigation").inc()
             try:
                 self.logger.info(f"Attempt {attempt + 1}/{MAX_NAVIGATION_RETRIES}: Navigating to {description} URL: {url}")
+                start = time.perf_counter()
                 self.driver.get(url)
-                time.sleep(random.uniform(3, 5))
+                self.wait_for_document_ready()
                 current_url = self.driver.current_url.lower()
 
                 if "404" in current_url or "document not found" in self.driver.page_source.lower():
                     self.logger.warning(f"404 error detected on {description} URL: {current_url}")
+                    outcome = "not_found"
                     if attempt < MAX_NAVIGATION_RETRIES - 1:
-                        time.sleep(random.uniform(4, 8))
+                        self.politeness.pause("retry")
                         continue
                     else:
                         self.logger.error(f"Failed to navigate to {description} URL after {MAX_NAVIGATION_RETRIES} attempts due to 404.")
@@ -211,6 +353,8 @@ class AmazonReviewExtractor:
 
                 if 'captcha' in current_url or 'ap/challenge' in current_url:
                     self.logger.warning("CAPTCHA or challenge page detected during navigation.")
+                    outcome = "captcha"
+                    CAPTCHAS.labels(engine="selenium").inc()
                     try:
                         self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.a-row.a-text-center img")))
                         self.logger.error(
@@ -231,25 +375,22 @@ class AmazonReviewExtractor:
                             '.review',
                         ]
 
-                        found = False
-                        for selector in review_selectors:
-                            try:
-                                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                                self.logger.info(f"Successfully verified reviews page using selector: {selector}")
-                                found = True
-                                break
-                            except TimeoutException:
-                                continue
-
-                        if found:
+                        # One wait on the whole selector group instead of a full timeout per selector
+                        try:
+                            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(review_selectors))))
+                            self.record_navigation("get", start)
+                            outcome = "ok"
+                            self.logger.info(f"Successfully verified reviews page using selectors: {review_selectors}")
+                            self.politeness.pause("after_navigation")
                             return True
+                        except TimeoutException:
+                            pass
 
                         if "reviews" in self.driver.current_url.lower() or "review" in self.driver.current_url.lower():
                             self.logger.info(f"On reviews page based on URL, though review elements not found. URL: {self.driver.current_url}")
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            screenshot_path = f"reviews/reviews_page_{timestamp}.png"
-                            self.driver.save_screenshot(screenshot_path)
-                            self.logger.info(f"Saved screenshot to {screenshot_path}")
+                            self.diagnostics.capture(self.driver, "reviews_page_unverified", error=True)
+                            self.record_navigation("get", start)
+                            outcome = "ok"
                             return True
 
                         self.logger.warning("Could not verify reviews page with any known selectors.")
@@ -258,7 +399,7 @@ class AmazonReviewExtractor:
                 except TimeoutException:
                     self.logger.warning(f"Failed to verify {description} page load. Current URL: {self.driver.current_url}")
                     if attempt < MAX_NAVIGATION_RETRIES - 1:
-                        time.sleep(random.uniform(4, 8))
+                        self.politeness.pause("retry")
                     else:
                         self.logger.error(f"Failed to navigate to {description} URL after {MAX_NAVIGATION_RETRIES} attempts.")
                         return False
@@ -266,7 +407,7 @@ class AmazonReviewExtractor:
             except (TimeoutException, WebDriverException) as e:
                 self.logger.warning(f"Attempt {attempt + 1} failed to navigate to {description} URL: {e}")
                 if attempt < MAX_NAVIGATION_RETRIES - 1:
-                    time.sleep(random.uniform(4, 8))
+                    self.politeness.pause("retry")
                 else:
                     self.logger.error(f"Failed to navigate to {description} URL after {MAX_NAVIGATION_RETRIES} attempts.")
                     return False
@@ -274,6 +415,8 @@ class AmazonReviewExtractor:
             except Exception as e:
                 self.logger.error(f"An unexpected error occurred during navigation to {description} URL: {e}", exc_info=True)
                 return False
+            finally:
+                NAVIGATION_SECONDS.labels(outcome=outcome).observe(time.perf_counter() - attempt_start)
 
     def extract_asin_from_url(self, url: str) -> Optional[str]:
         try:
@@ -299,16 +442,22 @@ class AmazonReviewExtractor:
             if not asin:
                 self.logger.error(f"Could not extract ASIN from product URL: {self.product_url}")
                 return None
-            reviews_url = f"https://www.amazon.in/product-reviews/{asin}"
+            parsed = urlparse(self.product_url)
+            base_url = REVIEWS_BASE_URL or f"{parsed.scheme}://{parsed.netloc}"
+            reviews_url = f"{base_url.rstrip('/')}/product-reviews/{asin}"
             self.logger.info(f"Generated reviews URL: {reviews_url}")
             return reviews_url
         except Exception as e:
             self.logger.error(f"Error generating reviews URL: {str(e)}")
             return None
 
+    def get_page_url(self, reviews_url: str, page_num: int) -> str:
+        query = REVIEW_PAGE_QUERY | (INCREMENTAL_PAGE_QUERY if self.incremental else {}) | {'pageNumber': page_num}
+        return f"{reviews_url}?{urlencode(query)}"
+
     def extract_review_data(self, review_element) -> Dict:
         try:
-            review_id = review_element.get_attribute('id') or f"review_{random.randint(10000, 99999)}"
+            review_id = review_element.get_attribute('id')
             
             reviewer_name = "Unknown"
             try:
@@ -380,7 +529,7 @@ class AmazonReviewExtractor:
                 pass
             
             return {
-                'review_id': review_id,
+                'review_id': review_id or content_review_id(reviewer_name, date, title, body),
                 'reviewer_name': reviewer_name,
                 'rating': rating,
                 'title': title,
@@ -402,17 +551,37 @@ class AmazonReviewExtractor:
             }
 
     def extract_reviews_from_page(self) -> List[Dict]:
+        start = time.perf_counter()
+        reviews = self.extract_reviews_bulk() if self.bulk_extraction else None
+        mode = "bulk"
+        if not reviews:
+            reviews = self.extract_reviews_per_element()
+            mode = "per-element"
+        end = time.perf_counter()
+        elapsed_ms = (end - start) * 1000
+        self.stage_timeline.record("page-extraction", start, end, mode=mode)
+        self.page_extraction_stats.append({"mode": mode, "reviews": len(reviews), "latency_ms": round(elapsed_ms, 1)})
+        self.logger.info(f"Page extraction ({mode}) took {elapsed_ms:.1f} ms for {len(reviews)} reviews")
+        return reviews
+
+    def extract_reviews_bulk(self) -> Optional[List[Dict]]:
+        try:
+            payload = json.loads(self.driver.execute_script(BULK_EXTRACT_SCRIPT, REVIEW_ELEMENT_SELECTORS, REVIEW_FIELD_SELECTORS))
+            if not payload.get("reviews"):
+                self.logger.info("Bulk extraction found no reviews, falling back to per-element extraction")
+                return None
+            reviews = [build_review_record(raw) for raw in payload["reviews"]]
+            self.logger.info(f"Bulk extracted {len(reviews)} reviews using selector: {payload['selector']}")
+            return reviews
+        except Exception as e:
+            self.logger.warning(f"Bulk extraction failed, falling back to per-element extraction: {str(e)}")
+            return None
+
+    def extract_reviews_per_element(self) -> List[Dict]:
         reviews = []
         try:
-            review_selectors = [
-                'div[data-hook="review"]',
-                'div.a-section.review.aok-relative',
-                '#cm_cr-review_list div[data-hook="review"]',
-                '.review',
-            ]
-            
             review_elements = []
-            for selector in review_selectors:
+            for selector in REVIEW_ELEMENT_SELECTORS:
                 try:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     if elements:
@@ -423,14 +592,9 @@ class AmazonReviewExtractor:
                     self.logger.debug(f"Selector {selector} failed: {str(e)}")
             
             if not review_elements:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"no_reviews_found_{timestamp}.png"
-                self.driver.save_screenshot(screenshot_path)
-                self.logger.warning(f"No reviews found on current page. Saved screenshot to {screenshot_path}")
-                if "review" in self.driver.current_url.lower():
-                    with open(f"review_page_source_{timestamp}.html", "w", encoding="utf-8") as f:
-                        f.write(self.driver.page_source)
-                    self.logger.info(f"Saved page source to review_page_source_{timestamp}.html")
+                self.logger.warning("No reviews found on current page")
+                self.diagnostics.capture(self.driver, "no_reviews_found", error=True,
+                                         page_source="review" in self.driver.current_url.lower())
                 return []
             
             self.logger.info(f"Found {len(review_elements)} reviews on current page")
@@ -439,11 +603,7 @@ class AmazonReviewExtractor:
                 try:
                     review_data = self.extract_review_data(review_elem)
                     reviews.append(review_data)
-                    try:
-                        self.logger.info(f"Extracted review: {review_data['title']}")
-                    except UnicodeEncodeError as e:
-                        self.logger.error(f"Failed to log review title due to encoding issue: {str(e)}")
-                        self.logger.info(f"Extracted review: [Title contained non-ASCII characters]")
+                    self.logger.debug(f"Extracted review: {review_data['title']}")
                 except Exception as e:
                     self.logger.error(f"Error processing review: {str(e)}")
             
@@ -489,8 +649,8 @@ class AmazonReviewExtractor:
 
     def goto_next_page(self) -> bool:
         try:
-            current_url = self.driver.current_url
-            self.logger.debug(f"Current page URL: {current_url}")
+            before = self.get_page_state()
+            self.logger.debug(f"Current page state: {before}")
 
             next_page_selectors = [
                 'a[aria-label="Next page"]',
@@ -500,24 +660,32 @@ class AmazonReviewExtractor:
                 'a[data-hook="pagination-bar"]',
             ]
 
+            try:
+                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(next_page_selectors))))
+            except TimeoutException:
+                self.logger.info("No 'Next' button found. End of pagination.")
+                return False
+
             for selector in next_page_selectors:
                 try:
-                    next_button = self.wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
+                    candidates = [el for el in self.driver.find_elements(By.CSS_SELECTOR, selector)
+                                  if el.is_displayed() and el.is_enabled()]
+                    if not candidates:
+                        continue
+                    next_button = candidates[0]
                     self.logger.debug(f"Found next page button using selector: {selector}")
                     
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                    time.sleep(random.uniform(1, 2))
+                    self.politeness.pause("before_click")
                     
+                    start = time.perf_counter()
                     self.driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(random.uniform(3, 5))
 
-                    new_url = self.driver.current_url
-                    if new_url == current_url:
-                        self.logger.warning("Page URL did not change after clicking 'Next' button. Assuming end of pagination.")
+                    if not self.wait_for_page_change(before):
+                        self.logger.warning("Page did not change after clicking 'Next' button. Assuming end of pagination.")
                         return False
 
+                    self.record_navigation("next", start)
                     self.logger.info("Successfully navigated to next page")
                     return True
 
@@ -532,41 +700,251 @@ class AmazonReviewExtractor:
             self.logger.error(f"Error navigating to next page: {str(e)}")
             return False
 
-    def extract_all_reviews(self, max_pages=None) -> List[Dict]:
-        all_reviews = []
-        seen_review_ids = set()
-        page_num = 1
+    def get_page_state(self) -> Dict:
+        return self.driver.execute_script(PAGE_STATE_SCRIPT, ", ".join(REVIEW_ELEMENT_SELECTORS))
+
+    def wait_for_document_ready(self, timeout=WAIT_TIMEOUT_SECONDS) -> bool:
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            return True
+        except TimeoutException:
+            self.logger.warning(f"document.readyState did not reach 'complete' within {timeout}s")
+            return False
+
+    def wait_for_page_change(self, before: Dict, timeout=WAIT_TIMEOUT_SECONDS) -> bool:
+        # The review list is replaced in place, so watch the URL, the selected page number and the first review
+        def changed(driver):
+            state = self.get_page_state()
+            return state if any(state[key] != before[key] for key in ("url", "page", "first_review")) else False
+
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(changed)
+        except TimeoutException:
+            return False
+        def repopulated(driver):
+            state = self.get_page_state()
+            return state["ready"] == "complete" and state["reviews"] > 0
+
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(repopulated)
+        except TimeoutException:
+            self.logger.warning("Next page loaded but the review list was not repopulated within timeout")
+        return True
+
+    def record_navigation(self, kind: str, start: float):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.navigation_stats.append({"kind": kind, "ready_ms": round(elapsed_ms, 1)})
+        self.logger.info(f"Page ready after {kind} navigation in {elapsed_ms:.1f} ms")
+
+    def merge_page_reviews(self, page_reviews: List[Dict], all_reviews: List[Dict], seen_review_ids: set, page_num: int) -> int:
+        new_reviews = []
+        for review in page_reviews:
+            review_id = review.get('review_id')
+            if review_id and review_id not in seen_review_ids:
+                seen_review_ids.add(review_id)
+                new_reviews.append(review)
+            else:
+                self.logger.debug(f"Skipped duplicate review with ID: {review_id}")
+        flagged = {"exact": 0, "near": 0}
+        if self.dedup_index is not None and new_reviews:
+            # Same text under a different id (copied, syndicated across variants, re-crawled): flagged, not dropped
+            flagged = self.dedup_index.flag(self.product_asin, new_reviews)
+            for kind, count in flagged.items():
+                DUPLICATES_FLAGGED.labels(kind=kind).inc(count)
+        all_reviews.extend(new_reviews)
         
+        added = len(new_reviews)
+        duplicates_removed = len(page_reviews) - added
+        REVIEWS_PER_PAGE.labels(engine=self.engine).observe(len(page_reviews))
+        DUPLICATES_SKIPPED.inc(duplicates_removed)
+        self.logger.info(f"Extracted {len(page_reviews)} reviews from page {page_num}, {duplicates_removed} duplicates removed, "
+                         f"{flagged['exact']} exact and {flagged['near']} near duplicates flagged. Total unique reviews: {len(all_reviews)}")
+        if self.review_store is not None:
+            self.review_store.upsert_reviews(self.product_asin, page_reviews)
+        if self.page_sink is not None and new_reviews:
+            self.page_sink(new_reviews)
+        return added
+
+    def report_page_progress(self, pages_done: int, reviews: int):
+        now = time.perf_counter()
+        self.stage_timeline.record("crawl", self.page_started, now, page=pages_done)
+        self.page_started = now
+        max_pages = self.progress["max_pages"]
+        page_label = f"{pages_done} of {max_pages}" if max_pages else str(pages_done)
+        self.report_progress("crawl", f"Extracted page {page_label}, {reviews} reviews so far",
+                             pages_done=pages_done, reviews=reviews)
+
+    def report_progress(self, stage: str, message: str, **counters):
+        self.progress.update(counters, stage=stage, message=message)
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(dict(self.progress))
+        except Exception as e:
+            self.logger.warning(f"Progress callback failed: {str(e)}")
+
+    def open_review_spool(self) -> ReviewSpool:
+        asin = self.product_asin if self.product_asin else "unknown_asin"
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Jobs for the same product can start in the same second, in this process or another one
+        run_id = f"{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.review_spool = ReviewSpool(Path(REVIEWS_DIR) / "spool" / f"amazon_reviews_{asin}_{timestamp}_{run_id}.jsonl")
+        self.logger.info(f"Streaming extracted reviews to {self.review_spool.path}")
+        return self.review_spool
+
+    def page_already_known(self, page_reviews: List[Dict]) -> bool:
+        return self.incremental and bool(page_reviews) and all(
+            review.get('review_id') in self.known_review_ids for review in page_reviews
+        )
+
+    def extract_all_reviews(self, max_pages=None) -> List[Dict]:
         reviews_url = self.get_reviews_url()
         if not reviews_url:
             self.logger.error("Failed to generate reviews URL")
+            return []
+        
+        if self.incremental:
+            # Newest first, so the crawl can stop at the first page that is already stored
+            self.known_review_ids = self.review_store.known_ids(self.product_asin) if self.review_store else set()
+            self.logger.info(f"Incremental crawl: {len(self.known_review_ids)} reviews already stored for {self.product_asin}")
+        
+        if self.workers > 1:
+            return self.extract_all_reviews_parallel(reviews_url, max_pages, self.workers)
+        start_url = self.get_page_url(reviews_url, 1) if self.incremental else reviews_url
+        if self.engine == "http":
+            return self.extract_all_reviews_http(start_url, max_pages)
+        return self.extract_all_reviews_selenium(start_url, max_pages)
+
+    def extract_all_reviews_parallel(self, reviews_url: str, max_pages=None, workers=2) -> List[Dict]:
+        workers = max(1, min(workers, PARALLEL_CONCURRENCY_CAP, max_pages or workers))
+        page_results: Dict[int, List[Dict]] = {}
+        state = {"next_page": 1, "stop_at": max_pages + 1 if max_pages else None}
+        lock = threading.Lock()
+
+        def claim_page() -> Optional[int]:
+            with lock:
+                page_num = state["next_page"]
+                if state["stop_at"] is not None and page_num >= state["stop_at"]:
+                    return None
+                state["next_page"] += 1
+                return page_num
+
+        def record_page(page_num: int, reviews: List[Dict], failed: bool = False):
+            with lock:
+                if failed:
+                    self.failed_pages.append(page_num)
+                    self.logger.warning(f"Page {page_num} could not be fetched; its reviews are missing from this crawl")
+                    if len(self.failed_pages) >= PARALLEL_MAX_FAILED_PAGES and (state["stop_at"] is None or page_num < state["stop_at"]):
+                        self.logger.error(f"{len(self.failed_pages)} pages failed, not scheduling later pages")
+                        state["stop_at"] = page_num + 1
+                    return
+                page_results[page_num] = reviews
+                if not reviews and (state["stop_at"] is None or page_num < state["stop_at"]):
+                    self.logger.info(f"Page {page_num} came back empty, not scheduling later pages")
+                    state["stop_at"] = page_num
+                elif self.page_already_known(reviews) and (state["stop_at"] is None or page_num + 1 < state["stop_at"]):
+                    self.logger.info(f"Every review on page {page_num} is already stored, not scheduling later pages")
+                    state["stop_at"] = page_num + 1
+                self.report_page_progress(len(page_results), sum(len(r) for r in page_results.values()))
+
+        self.logger.info(f"Crawling review pages with {workers} parallel {self.engine} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page-worker") as executor:
+            futures = [executor.submit(self._page_worker, reviews_url, claim_page, record_page) for _ in range(workers)]
+            for future in futures:
+                future.result()
+
+        # Merge in page order so the output does not depend on worker scheduling
+        all_reviews = self.open_review_spool()
+        seen_review_ids = set()
+        for page_num in sorted(page_results):
+            if state["stop_at"] is not None and page_num >= state["stop_at"]:
+                break
+            self.merge_page_reviews(page_results[page_num], all_reviews, seen_review_ids, page_num)
+        self.failed_pages.sort()
+        if self.failed_pages:
+            self.logger.warning(f"Parallel crawl finished with {len(self.failed_pages)} failed pages: {self.failed_pages}")
+        return all_reviews
+
+    def _page_worker(self, reviews_url: str, claim_page, record_page):
+        fetcher = HttpReviewFetcher(self.user_agents, self.logger) if self.engine == "http" else None
+        browser = None
+        try:
+            while True:
+                page_num = claim_page()
+                if page_num is None:
+                    return
+                url = self.get_page_url(reviews_url, page_num)
+                reviews, failed, loaded_empty = [], False, False
+                try:
+                    if fetcher is not None:
+                        with page_fetch_slots:
+                            reviews, html, final_url = self._fetch_http_page(fetcher, url)
+                        loaded_empty = html is not None and not reviews and not fetcher.is_challenge(html, final_url)
+                    if not reviews:
+                        # Selenium workers, or an HTTP worker falling back after a challenge or empty page
+                        if browser is None:
+                            browser = AmazonReviewExtractor(driver_pool=self.driver_pool, bulk_extraction=self.bulk_extraction,
+                                                            politeness=self.politeness, diagnostics=self.diagnostics,
+                                                            browser_profile=self.browser_profile, log_context=self.log_context)
+                            browser.debug_mode = self.debug_mode
+                        # Waiting for a pooled driver happens before taking a fetch slot, so it never holds one up
+                        if not browser.ensure_driver():
+                            # Without a browser, an empty last page cannot be told apart from a blocked or broken one;
+                            # counting it as failed keeps a truncated crawl visible in failed_pages
+                            if loaded_empty:
+                                self.logger.warning(f"Page {page_num} loaded with no reviews and no browser is available "
+                                                    f"to confirm it is the last page")
+                            failed = True
+                        else:
+                            with page_fetch_slots:
+                                if browser._safe_get(url, "product reviews page"):
+                                    reviews = browser.extract_reviews_from_page()
+                                    if fetcher is not None and reviews:
+                                        fetcher.seed_cookies_from_driver(browser.driver)
+                                else:
+                                    failed = True
+                except Exception as e:
+                    self.logger.error(f"Error fetching review page {page_num}: {str(e)}")
+                    failed = True
+                record_page(page_num, reviews, failed)
+        finally:
+            if fetcher is not None:
+                fetcher.close()
+            if browser is not None:
+                self.page_extraction_stats.extend(browser.page_extraction_stats)
+                self.navigation_stats.extend(browser.navigation_stats)
+                browser.close()
+
+    def extract_all_reviews_selenium(self, reviews_url: str, max_pages=None, page_num=1,
+                                     all_reviews: Optional[List[Dict]] = None,
+                                     seen_review_ids: Optional[set] = None, navigate=True) -> List[Dict]:
+        all_reviews = self.open_review_spool() if all_reviews is None else all_reviews
+        seen_review_ids = set() if seen_review_ids is None else seen_review_ids
+        
+        if not self.ensure_driver():
+            self.logger.error("Failed to set up WebDriver")
             return all_reviews
         
-        if not self._safe_get(reviews_url, "product reviews page"):
+        if navigate and not self._safe_get(reviews_url, "product reviews page"):
             self.logger.error("Failed to navigate to reviews page")
             return all_reviews
         
         while True:
             self.logger.info(f"Extracting reviews from page {page_num}")
+            page_start = time.perf_counter()
+            delay_before = self.politeness.total_delay
             
             page_reviews = self.extract_reviews_from_page()
-            initial_count = len(all_reviews)
+            self.merge_page_reviews(page_reviews, all_reviews, seen_review_ids, page_num)
+            self.report_page_progress(page_num, len(all_reviews))
             
-            for review in page_reviews:
-                review_id = review.get('review_id')
-                if review_id and review_id not in seen_review_ids:
-                    seen_review_ids.add(review_id)
-                    all_reviews.append(review)
-                else:
-                    self.logger.debug(f"Skipped duplicate review with ID: {review_id}")
-            
-            duplicates_removed = len(page_reviews) - (len(all_reviews) - initial_count)
-            self.logger.info(f"Extracted {len(page_reviews)} reviews from page {page_num}, {duplicates_removed} duplicates removed. Total unique reviews: {len(all_reviews)}")
+            if self.page_already_known(page_reviews):
+                self.logger.info(f"Every review on page {page_num} is already stored; stopping incremental crawl")
+                break
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = f"reviews/reviews_page_{page_num}_{timestamp}.png"
-            self.driver.save_screenshot(screenshot_path)
-            self.logger.info(f"Saved screenshot to {screenshot_path}")
+            self.diagnostics.capture(self.driver, f"reviews_page_{page_num}")
             
             if max_pages and page_num >= max_pages:
                 self.logger.info(f"Reached maximum page limit ({max_pages})")
@@ -576,15 +954,91 @@ class AmazonReviewExtractor:
                 self.logger.info("No more review pages available")
                 break
                 
-            if not self.goto_next_page():
+            with self.stage_timeline.span("pagination"):
+                moved = self.goto_next_page()
+            if not moved:
                 self.logger.error("Failed to navigate to next page")
                 break
                 
+            self.politeness.pause("between_pages")
+            self.logger.info(f"Page {page_num} cycle took {(time.perf_counter() - page_start) * 1000:.1f} ms, "
+                             f"including {(self.politeness.total_delay - delay_before) * 1000:.1f} ms politeness delay")
             page_num += 1
-            time.sleep(random.uniform(2, 5))
         
         return all_reviews
 
+    def extract_all_reviews_http(self, reviews_url: str, max_pages=None) -> List[Dict]:
+        all_reviews = self.open_review_spool()
+        seen_review_ids = set()
+        page_num = 1
+        url = reviews_url
+        fetcher = HttpReviewFetcher(self.user_agents, self.logger)
+        
+        try:
+            while True:
+                self.logger.info(f"Fetching reviews page {page_num} over HTTP: {url}")
+                page_reviews, html, final_url = self._fetch_http_page(fetcher, url)
+                
+                seeded = False
+                if not page_reviews and not self.http_cookies_seeded:
+                    seeded = self.seed_http_cookies(fetcher, url)
+                    if seeded:
+                        page_reviews, html, final_url = self._fetch_http_page(fetcher, url)
+                
+                if not page_reviews:
+                    self.logger.warning(f"HTTP engine got a challenge or empty result on page {page_num}; continuing with Selenium")
+                    return self.extract_all_reviews_selenium(url, max_pages, page_num, all_reviews, seen_review_ids,
+                                                             navigate=not seeded)
+                
+                self.merge_page_reviews(page_reviews, all_reviews, seen_review_ids, page_num)
+                self.report_page_progress(page_num, len(all_reviews))
+                
+                if self.page_already_known(page_reviews):
+                    self.logger.info(f"Every review on page {page_num} is already stored; stopping incremental crawl")
+                    break
+                
+                if max_pages and page_num >= max_pages:
+                    self.logger.info(f"Reached maximum page limit ({max_pages})")
+                    break
+                
+                next_url = find_next_page_url(html, final_url)
+                if not next_url:
+                    self.logger.info("No more review pages available")
+                    break
+                
+                url = next_url
+                page_num += 1
+        finally:
+            self.logger.info(f"HTTP engine fetched {fetcher.pages_fetched} pages")
+            fetcher.close()
+        
+        return all_reviews
+
+    def _fetch_http_page(self, fetcher: HttpReviewFetcher, url: str):
+        start = time.perf_counter()
+        html, final_url = fetcher.fetch(url)
+        if html is None:
+            return [], None, final_url
+        if fetcher.is_challenge(html, final_url):
+            self.logger.warning(f"CAPTCHA or challenge page returned for {final_url}")
+            CAPTCHAS.labels(engine="http").inc()
+            self.diagnostics.capture_html("http_challenge", html)
+            return [], html, final_url
+        reviews, selector = parse_reviews_html(html)
+        end = time.perf_counter()
+        elapsed_ms = (end - start) * 1000
+        self.stage_timeline.record("page-extraction", start, end, mode="http")
+        self.page_extraction_stats.append({"mode": "http", "reviews": len(reviews), "latency_ms": round(elapsed_ms, 1)})
+        self.logger.info(f"Page fetch and parse (http) took {elapsed_ms:.1f} ms for {len(reviews)} reviews using selector: {selector}")
+        return reviews, html, final_url
+
+    def seed_http_cookies(self, fetcher: HttpReviewFetcher, url: str) -> bool:
+        self.http_cookies_seeded = True
+        if not self.ensure_driver() or not self._safe_get(url, "product reviews page"):
+            return False
+        fetcher.seed_cookies_from_driver(self.driver)
+        return True
+
     def save_reviews_csv(self, reviews: List[Dict], filename=None) -> str:
         try:
             reviews_dir = Path(REVIEWS_DIR)
@@ -600,15 +1054,19 @@ class AmazonReviewExtractor:
             columns = [
                 'review_id', 'reviewer_name', 'rating', 'title', 'body',
                 'date', 'country', 'verified_purchase', 'product_variant',
-                'helpful_votes', 'images', 'extracted_at'
+                'helpful_votes', 'images', 'extracted_at',
+                'sentiment', 'compound', 'pos', 'neg', 'neu', 'duplicate_of', 'duplicate_score'
             ]
             
+            # pandas is only needed for CSV exports, so it is not imported with the module
+            import pandas as pd
             df = pd.DataFrame(reviews)
             if 'images' in df.columns:
                 df['images'] = df['images'].apply(lambda x: ' | '.join(x) if isinstance(x, list) else '')
             
             df = df.reindex(columns=columns)
-            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+            with atomic_path(filepath) as tmp_path:
+                df.to_csv(tmp_path, index=False, encoding='utf-8-sig')
             
             self.logger.info(f"Saved {len(reviews)} reviews to CSV: {filepath}")
             return str(filepath)
@@ -617,10 +1075,9 @@ class AmazonReviewExtractor:
             self.logger.error(f"Error saving reviews to CSV: {str(e)}")
             return None
 
-    @retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
-    def generate_summary(self, reviews):
-        review_text = "\n".join([f"Rating: {r['rating']}, Review: {r['body']}" for r in reviews if r['body']])
-        if not review_text:
+    @retry(wait=wait_fixed(2), stop=stop_after_attempt(3), before_sleep=count_retry("summary"))
+    def generate_summary(self, reviews, summary_session=None):
+        if not any(r.get('body') for r in reviews):
             self.logger.warning("No review text available for summary generation")
             return {
                 "pros": ["No pros available"] * 5,
@@ -631,31 +1088,17 @@ class AmazonReviewExtractor:
             }
 
         try:
-            prompt = f"""
-            Based on the following Amazon reviews, generate:
-            1. 5 pros about the product.
-            2. 5 cons about the product.
-            3. A 5-line summary of the product based on the reviews.
-
-            Reviews:
-            {review_text}
-
-            Return the response in JSON format with keys 'pros', 'cons', and 'summary', where 'pros' and 'cons' are lists of 5 items each, and 'summary' is a list of 5 strings.
-            """
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.7
-            )
-            result = json.loads(response.choices[0].message.content.strip())
-
-            pros = result.get("pros", ["No pros available"] * 5)[:5]
-            cons = result.get("cons", ["No cons available"] * 5)[:5]
-            summary = result.get("summary", ["No summary available"] * 5)[:5]
-            if len(pros) < 5: pros.extend(["No pros available"] * (5 - len(pros)))
-            if len(cons) < 5: cons.extend(["No cons available"] * (5 - len(cons)))
-            if len(summary) < 5: summary.extend(["No summary available"] * (5 - len(summary)))
+            result = None
+            if self.summary_cache is not None:
+                version = self.summarizer.cache_version()
+                result = self.summary_cache.get(self.product_asin or "unknown_asin", reviews, version)
+            if result is None:
+                result = summary_session.finish() if summary_session is not None else self.summarizer.summarize(reviews)
+                if self.summary_cache is not None:
+                    self.summary_cache.put(self.product_asin or "unknown_asin", reviews, version, result)
+            elif summary_session is not None:
+                summary_session.cancel()
+            pros, cons, summary = result["pros"], result["cons"], result["summary"]
 
             sentiment_counts = self.analyze_sentiment(reviews)
             total_reviews = len(reviews)
@@ -679,7 +1122,45 @@ class AmazonReviewExtractor:
                 "total_score": 0
             }
 
-    def run(self, product_url=None, max_pages=None, save_format="json", debug=True):
+    def start_review_pipeline(self):
+        # Pages flow crawl -> sentiment -> summary chunks while the crawl continues; only the reduce is left at the end
+        hold = self.summary_cache is not None and self.summary_cache.has_previous(
+            self.product_asin or "unknown_asin", self.summarizer.cache_version())
+        if hold:
+            # The lookup after the crawl will likely answer from the cache, so map requests wait until it misses
+            self.logger.info(f"A cached summary exists for {self.product_asin}; summary requests are held "
+                             f"until the cache lookup after the crawl")
+        session = self.summarizer.start_session(self.stage_timeline, hold=hold)
+        collected: List[Dict] = []
+        queued_ids = set()
+
+        def score(batch):
+            if score_reviews(batch) and self.review_store is not None:
+                self.review_store.save_sentiment(self.product_asin, batch)
+            return batch
+
+        def summarize(batch):
+            collected.extend(batch)
+            session.add(batch)
+
+        pipeline = ReviewPipeline([("sentiment", score), ("summary-chunking", summarize)],
+                                  timeline=self.stage_timeline, logger=self.logger)
+        pipeline.start()
+
+        def submit(reviews):
+            batch = [r for r in reviews if r.get('review_id') not in queued_ids]
+            queued_ids.update(r.get('review_id') for r in batch)
+            pipeline.submit(batch)
+
+        if self.review_store is not None:
+            # The export covers every stored review, so the summary has to see the ones not re-crawled too
+            submit(self.review_store.get_reviews(self.product_asin))
+        self.page_sink = submit
+        return pipeline, session, collected
+
+    def run(self, product_url=None, max_pages=None, save_format="json", debug=True, engine="selenium", workers=1,
+            incremental=False, pipeline=False):
+        review_pipeline, summary_session = None, None
         try:
             self.logger.info("Starting Amazon Review Extractor")
             if not product_url:
@@ -693,22 +1174,72 @@ class AmazonReviewExtractor:
             if not self.product_asin:
                 self.logger.warning("Could not extract ASIN from product URL, using 'unknown_asin' as fallback")
                 self.product_asin = "unknown_asin"
+            if not self.log_context:
+                self.logger.extra["job"] = self.product_asin
 
-            if not self.setup_driver(debug_mode=debug):
+            if engine not in ENGINES:
+                self.logger.error(f"Unknown extraction engine: {engine}. Choose one of {ENGINES}")
+                return None
+            self.engine = engine
+            self.workers = max(1, workers or 1)
+            self.incremental = incremental
+            self.debug_mode = debug
+            self.progress = {"stage": "starting", "pages_done": 0, "max_pages": max_pages, "reviews": 0}
+            self.review_spool = None
+            self.failed_pages = []
+            self.http_cookies_seeded = False
+            self.stage_timeline = StageTimeline()
+            self.page_started = time.perf_counter()
+
+            # The HTTP engine only launches a browser if it has to fall back; parallel workers open their own sessions
+            if engine == "selenium" and self.workers == 1 and not self.setup_driver(debug_mode=debug):
                 self.logger.error("Failed to set up WebDriver")
                 return None
 
+            if pipeline:
+                review_pipeline, summary_session, pipelined_reviews = self.start_review_pipeline()
+            self.report_progress("crawl", f"Extracting up to {max_pages or 'all'} pages...")
             reviews = self.extract_all_reviews(max_pages)
             self.logger.info(f"Total unique reviews extracted: {len(reviews)}")
-            
-            summary = self.generate_summary(reviews) if reviews else {
-                "pros": ["No pros available"] * 5,
-                "cons": ["No cons available"] * 5,
-                "summary": ["No summary available"] * 5,
-                "review_counts": {"positive": 0, "negative": 0, "neutral": 0, "total": 0},
-                "total_score": 0
-            }
+            if review_pipeline is not None:
+                self.page_sink = None
+                with self.stage_timeline.span("pipeline-drain"):
+                    review_pipeline.close()
+            if self.review_store is not None:
+                # Outputs are exports of everything stored for this product, not just this crawl
+                reviews = self.review_store.get_reviews(self.product_asin)
+                if self.dedup_index is not None:
+                    self.dedup_index.annotate(self.product_asin, reviews)
+                self.logger.info(f"Exporting {len(reviews)} stored reviews for {self.product_asin}")
+            elif review_pipeline is not None and not review_pipeline.errors:
+                # Already scored by the pipeline, unlike the spool copy which was written before scoring
+                reviews = pipelined_reviews
+            else:
+                if review_pipeline is not None:
+                    # A failed stage stops forwarding, so the pipeline's list is missing reviews; the spool has them all
+                    self.logger.warning(f"Pipeline stage failed after {len(pipelined_reviews)} reviews; "
+                                        f"exporting all {len(reviews)} crawled reviews from the spool")
+                reviews = list(reviews)
+            self.report_progress("sentiment", f"Scoring sentiment for {len(reviews)} reviews...", reviews=len(reviews))
+            with self.stage_timeline.span("sentiment"):
+                self.score_sentiment(reviews)
 
+            if review_pipeline is not None and review_pipeline.errors:
+                # A failed stage means the incremental summary is incomplete; summarize from scratch instead
+                summary_session.cancel()
+                summary_session = None
+            self.report_progress("summary", "Generating summary...")
+            with self.stage_timeline.span("summary"):
+                summary = self.generate_summary(reviews, summary_session) if reviews else {
+                    "pros": ["No pros available"] * 5,
+                    "cons": ["No cons available"] * 5,
+                    "summary": ["No summary available"] * 5,
+                    "review_counts": {"positive": 0, "negative": 0, "neutral": 0, "total": 0},
+                    "total_score": 0
+                }
+
+            self.report_progress("save", f"Saving {len(reviews)} reviews as {save_format.upper()}...")
+            save_started = time.perf_counter()
             if save_format.lower() == "csv":
                 filepath = self.save_reviews_csv(reviews)
                 if reviews:
@@ -717,57 +1248,136 @@ class AmazonReviewExtractor:
                     summary_path = Path(REVIEWS_DIR) / f"summary_{asin}_{timestamp}.json"
                     with open(summary_path, 'w', encoding='utf-8') as f:
                         json.dump(summary, f, ensure_ascii=False, indent=2)
+                    self.summary_file = str(summary_path)
                     self.logger.info(f"Saved summary to {summary_path}")
             else:
-                filepath = self.save_reviews(reviews)
-                if reviews and filepath:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                    data["summary"] = summary
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    self.logger.info(f"Updated {filepath} with summary")
+                filepath = self.save_reviews(reviews, summary if reviews else None, save_format.lower())
+            self.stage_timeline.record("save", save_started, time.perf_counter())
+            self.stage_timeline.log(self.logger)
 
             if filepath:
                 self.logger.info(f"Reviews saved to: {filepath}")
+                self.report_progress("saved", f"Saved {len(reviews)} reviews")
+                if self.review_spool is not None and not KEEP_REVIEW_SPOOL:
+                    self.review_spool.discard()
             return filepath if len(reviews) > 0 else None
 
         except Exception as e:
             self.logger.error(f"Unhandled exception in run method: {str(e)}", exc_info=True)
             return None
         finally:
+            self.page_sink = None
+            if review_pipeline is not None:
+                review_pipeline.close()
+            if summary_session is not None:
+                summary_session.cancel()
+            if self.review_spool is not None:
+                self.review_spool.close()
             self.close()
 
     def close(self):
-        if hasattr(self, 'driver') and self.driver is not None:
+        if self.pooled_session is not None:
+            self.driver_pool.release(self.pooled_session)
+            self.logger.info(f"WebDriver returned to pool: {self.driver_pool.stats()}")
+            self.pooled_session = None
+            self.driver = None
+        elif hasattr(self, 'driver') and self.driver is not None:
             try:
                 self.driver.quit()
                 self.logger.info("WebDriver closed successfully")
             except Exception as e:
                 self.logger.error(f"Error closing WebDriver: {e}")
+            self.driver = None
 
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Extract Amazon product reviews")
     parser.add_argument("--product-url", type=str, help="Amazon product URL to extract reviews from")
+    parser.add_argument("--batch", type=str, default=None, help="File with one ASIN or product URL per line to crawl as a batch")
+    parser.add_argument("--batch-workers", type=int, default=BATCH_WORKERS, help="Products crawled at the same time in batch mode")
+    parser.add_argument("--domain-concurrency", type=int, default=BATCH_DOMAIN_CONCURRENCY, help="Batch products crawled at the same time per Amazon domain")
+    parser.add_argument("--batch-domain", type=str, default=BATCH_DEFAULT_DOMAIN, help="Domain used for bare ASINs in the batch file")
+    parser.add_argument("--manifest", type=str, default=None, help="Batch manifest path (default: reviews/batch_manifest_<timestamp>.json)")
     parser.add_argument("--max-pages", type=int, default=None, help="Maximum number of review pages to extract")
-    parser.add_argument("--format", type=str, choices=["json", "csv"], default="json", help="Output file format")
+    parser.add_argument("--format", type=str, choices=SAVE_FORMATS, default="json", help="Output file format (parquet keeps types and the summary in one compressed file)")
     parser.add_argument("--debug", action="store_true", help="Run in debug mode with visible browser")
+    parser.add_argument("--engine", type=str, choices=ENGINES, default="selenium", help="Page fetching engine (http falls back to selenium on CAPTCHA or empty pages)")
+    parser.add_argument("--workers", type=int, default=1, help="Fetch review pages in parallel by page URL with this many workers")
+    parser.add_argument("--politeness", type=str, choices=list(POLITENESS_PRESETS), default=None, help="Human-like delay preset applied on top of page readiness waits (default: POLITENESS env or 'light')")
+    parser.add_argument("--store", type=str, default=REVIEW_STORE_PATH, help="SQLite review store path (use an empty string to disable)")
+    parser.add_argument("--incremental", action="store_true", help="Crawl newest first and stop at the first page of already stored reviews")
+    parser.add_argument("--summary-cache", type=str, default=SUMMARY_CACHE_DIR, help="Directory for cached LLM summaries (use an empty string to disable)")
+    parser.add_argument("--dedup-index", type=str, default=DEDUP_INDEX_PATH, help="SQLite index used to flag copied and near-duplicate reviews across runs (use an empty string to disable)")
+    parser.add_argument("--pipeline", action="store_true", help="Score sentiment and summarize review batches while the crawl is still running")
+    parser.add_argument("--pool-size", type=int, default=0, help="Pre-launch a pool of this many browser sessions (0 disables pooling)")
+    parser.add_argument("--diagnostics", type=str, choices=DIAGNOSTICS_MODES, default=DIAGNOSTICS_MODE, help="When to save screenshots and page sources (sampled also keeps a share of routine pages)")
+    parser.add_argument("--browser-profile", type=str, choices=BROWSER_PROFILES, default=BROWSER_PROFILE, help="Browser profile (lean blocks styles, images, fonts, media and trackers and uses eager page loads)")
     args = parser.parse_args()
     
-    extractor = AmazonReviewExtractor()
-    try:
-        filepath = extractor.run(
-            product_url=args.product_url,
+    driver_pool = None
+    if args.pool_size > 0:
+        driver_pool = create_driver_pool(size=args.pool_size, debug_mode=args.debug, profile=args.browser_profile)
+        driver_pool.warm()
+    elif args.batch:
+        # Batch products borrow browsers from one pool, so sessions are reused instead of relaunched per product
+        driver_pool = create_driver_pool(size=args.batch_workers, debug_mode=args.debug, profile=args.browser_profile)
+    review_store = ReviewStore(args.store) if args.store else None
+    summary_cache = SummaryCache(args.summary_cache) if args.summary_cache else None
+    dedup_index = ReviewDedupIndex(args.dedup_index) if args.dedup_index else None
+    diagnostics = DiagnosticsRecorder(mode=args.diagnostics)
+
+    def new_extractor(log_context=None):
+        return AmazonReviewExtractor(driver_pool=driver_pool, politeness=PolitenessPolicy.from_preset(args.politeness),
+                                     review_store=review_store, summary_cache=summary_cache, diagnostics=diagnostics,
+                                     browser_profile=args.browser_profile, log_context=log_context, dedup_index=dedup_index)
+
+    def run_extraction(extractor, product_url):
+        return extractor.run(
+            product_url=product_url,
             max_pages=args.max_pages,
             save_format=args.format,
-            debug=args.debug
+            debug=args.debug,
+            engine=args.engine,
+            workers=args.workers,
+            incremental=args.incremental,
+            pipeline=args.pipeline
         )
-        if filepath:
-            print(f"Review extraction completed successfully. Output saved to: {filepath}")
+
+    def run_batch_product(product):
+        extractor = new_extractor(log_context=product["asin"])
+        filepath = run_extraction(extractor, product["url"])
+        return {
+            "status": "completed" if filepath else "failed",
+            "output": filepath,
+            "reviews": extractor.progress.get("reviews", 0),
+            "pages": extractor.progress.get("pages_done", 0),
+            "stages": extractor.stage_timeline.summary(),
+            "error": None if filepath else "Extraction failed or no reviews found",
+        }
+
+    extractor = None
+    try:
+        if args.batch:
+            runner = BatchRunner(run_batch_product, workers=args.batch_workers, domain_concurrency=args.domain_concurrency,
+                                 manifest_path=args.manifest,
+                                 settings={"engine": args.engine, "max_pages": args.max_pages, "format": args.format})
+            manifest = runner.run(read_batch_file(args.batch, args.batch_domain))
+            print(f"Batch finished: {manifest['totals']}. Manifest saved to: {runner.manifest_path}")
         else:
-            print("Review extraction failed or no data found")
+            extractor = new_extractor()
+            filepath = run_extraction(extractor, args.product_url)
+            if filepath:
+                print(f"Review extraction completed successfully. Output saved to: {filepath}")
+            else:
+                print("Review extraction failed or no data found")
     except KeyboardInterrupt:
         print("\nProcess interrupted by user")
     finally:
-        extractor.close()
\ No newline at end of file
+        if extractor is not None:
+            extractor.close()
+        diagnostics.close()
+        if diagnostics.stats()["queued"]:
+            print(f"Diagnostics: {diagnostics.stats()}")
+        if driver_pool is not None:
+            print(f"Driver pool stats: {driver_pool.stats()}")
+            driver_pool.close()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from backend.review_sink import atomic_path
+
+# --- Configuration ---
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+# Products crawled at the same time per Amazon domain, however many workers are free
+BATCH_DOMAIN_CONCURRENCY = int(os.getenv("BATCH_DOMAIN_CONCURRENCY", "2"))
+BATCH_DEFAULT_DOMAIN = os.getenv("BATCH_DEFAULT_DOMAIN", "www.amazon.in")
+ASIN_PATTERN = re.compile(r"^[A-Z0-9]{10}$")
+URL_ASIN_PATTERN = re.compile(r"/(?:dp|gp/product|product-reviews)/([A-Z0-9]{10})")
+
+COMPLETED = "completed"
+FAILED = "failed"
+INVALID = "invalid"
+
+
+def parse_target(entry: str, default_domain: str = BATCH_DEFAULT_DOMAIN) -> Dict:
+    # A batch line is either a bare ASIN (crawled on the default domain) or a product URL
+    target = {"input": entry, "asin": None, "url": None, "domain": None}
+    if ASIN_PATTERN.match(entry):
+        target.update(asin=entry, url=f"https://{default_domain}/dp/{entry}", domain=default_domain)
+        return target
+    parsed = urlparse(entry)
+    match = URL_ASIN_PATTERN.search(parsed.path)
+    if parsed.scheme == "https" and parsed.netloc.startswith("www.amazon.") and match:
+        target.update(asin=match.group(1), url=f"https://{parsed.netloc}/dp/{match.group(1)}", domain=parsed.netloc)
+    return target
+
+
+def read_batch_file(path: str, default_domain: str = BATCH_DEFAULT_DOMAIN) -> List[Dict]:
+    targets, seen = [], set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = line.split("#", 1)[0].strip()
+            if not entry:
+                continue
+            target = parse_target(entry, default_domain)
+            key = (target["domain"], target["asin"])
+            if target["asin"] and key in seen:
+                continue
+            seen.add(key)
+            targets.append(target)
+    return targets
+
+
+class BatchRunner:
+    # Workers take the next product whose domain is below its concurrency cap, so a long queue for one
+    # domain never blocks products on another. The manifest is rewritten after every product.
+    def __init__(self, run_product: Callable[[Dict], Dict], workers: int = BATCH_WORKERS,
+                 domain_concurrency: int = BATCH_DOMAIN_CONCURRENCY, manifest_path: Optional[str] = None,
+                 settings: Optional[Dict] = None, logger: Optional[logging.Logger] = None):
+        self.run_product = run_product
+        self.workers = max(1, workers)
+        self.domain_concurrency = max(1, domain_concurrency)
+        self.manifest_path = Path(manifest_path or
+                                  f"reviews/batch_manifest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        self.settings = settings or {}
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self._cond = threading.Condition()
+        self._pending: List[Dict] = []
+        self._active: Dict[str, int] = defaultdict(int)
+        self._products: List[Dict] = []
+        self._started_at = None
+        self._started = 0.0
+
+    def run(self, targets: List[Dict]) -> Dict:
+        self._started_at = datetime.now().isoformat()
+        self._started = time.perf_counter()
+        self._products = [{"input": t["input"], "asin": t["asin"], "url": t["url"], "domain": t["domain"],
+                           "status": "queued" if t["url"] else INVALID, "output": None, "reviews": 0, "pages": 0,
+                           "seconds": None, "stages": {}, "error": None if t["url"] else "Not an ASIN or Amazon product URL"}
+                          for t in targets]
+        self._pending = [product for product in self._products if product["status"] == "queued"]
+        self.logger.info(f"Batch of {len(self._pending)} products ({len(self._products) - len(self._pending)} invalid) "
+                         f"with {self.workers} workers, at most {self.domain_concurrency} per domain")
+        self.write_manifest()
+
+        threads = [threading.Thread(target=self._work, name=f"batch-worker-{i + 1}", daemon=True)
+                   for i in range(min(self.workers, len(self._pending)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.write_manifest(finished=True)
+
+    def _next_product(self) -> Optional[Dict]:
+        with self._cond:
+            while self._pending:
+                for index, product in enumerate(self._pending):
+                    if self._active[product["domain"]] < self.domain_concurrency:
+                        self._active[product["domain"]] += 1
+                        product["status"] = "running"
+                        return self._pending.pop(index)
+                self._cond.wait()
+            return None
+
+    def _work(self):
+        while True:
+            product = self._next_product()
+            if product is None:
+                return
+            start = time.perf_counter()
+            try:
+                result = self.run_product(product)
+            except Exception as e:
+                # One failing product is recorded and the batch carries on
+                self.logger.error(f"Batch product {product['asin']} raised: {str(e)}", exc_info=True)
+                result = {"status": FAILED, "error": str(e)}
+            finally:
+                with self._cond:
+                    self._active[product["domain"]] -= 1
+                    self._cond.notify_all()
+            with self._cond:
+                product.update(result, seconds=round(time.perf_counter() - start, 3))
+            self.logger.info(f"Batch product {product['asin']} {product['status']} in {product['seconds']:.1f}s "
+                             f"({product['reviews']} reviews, {product['pages']} pages)")
+            self.write_manifest()
+
+    def write_manifest(self, finished: bool = False) -> Dict:
+        with self._cond:
+            products = [dict(product) for product in self._products]
+        counts = defaultdict(int)
+        for product in products:
+            counts[product["status"]] += 1
+        manifest = {
+            "started_at": self._started_at,
+            "finished_at": datetime.now().isoformat() if finished else None,
+            "seconds": round(time.perf_counter() - self._started, 3),
+            "settings": self.settings | {"workers": self.workers, "domain_concurrency": self.domain_concurrency},
+            "totals": {"products": len(products), "reviews": sum(p["reviews"] or 0 for p in products), **counts},
+            "products": products,
+        }
+        with self._cond:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_path(self.manifest_path) as tmp_path:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
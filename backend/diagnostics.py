@@ -0,0 +1,184 @@
+import atexit
+import base64
+import gzip
+import itertools
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+# --- Configuration ---
+DIAGNOSTICS_MODES = ["off", "on-error", "sampled"]
+DIAGNOSTICS_MODE = os.getenv("DIAGNOSTICS_MODE", "on-error")
+DIAGNOSTICS_DIR = os.getenv("DIAGNOSTICS_DIR", "reviews/diagnostics")
+# Share of routine (non-error) captures kept in sampled mode
+DIAGNOSTICS_SAMPLE_RATE = float(os.getenv("DIAGNOSTICS_SAMPLE_RATE", "0.1"))
+DIAGNOSTICS_MAX_FILES = int(os.getenv("DIAGNOSTICS_MAX_FILES", "200"))
+DIAGNOSTICS_MAX_BYTES = int(os.getenv("DIAGNOSTICS_MAX_BYTES", str(50 * 1024 * 1024)))
+DIAGNOSTICS_QUEUE_SIZE = 16
+SCREENSHOT_JPEG_QUALITY = 60
+
+_STOP = object()
+
+
+class DiagnosticsRecorder:
+    # Captures are grabbed on the calling thread (one WebDriver round trip) and handed to a single
+    # background writer that decodes, compresses, writes and enforces retention. A full queue drops
+    # the capture rather than stalling the crawl.
+    def __init__(self, mode: str = DIAGNOSTICS_MODE, directory: str = DIAGNOSTICS_DIR,
+                 sample_rate: float = DIAGNOSTICS_SAMPLE_RATE, max_files: int = DIAGNOSTICS_MAX_FILES,
+                 max_bytes: int = DIAGNOSTICS_MAX_BYTES, logger: Optional[logging.Logger] = None):
+        if mode not in DIAGNOSTICS_MODES:
+            raise ValueError(f"Unknown diagnostics mode: {mode}. Choose one of {DIAGNOSTICS_MODES}")
+        self.mode = mode
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self._queue: queue.Queue = queue.Queue(maxsize=DIAGNOSTICS_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._stats = {"queued": 0, "dropped": 0, "written": 0, "bytes_written": 0, "evicted": 0}
+
+    def should_capture(self, error: bool) -> bool:
+        if self.mode == "off":
+            return False
+        if error:
+            return True
+        return self.mode == "sampled" and random.random() < self.sample_rate
+
+    def capture(self, driver, name: str, error: bool = False, page_source: bool = False) -> bool:
+        if driver is None or not self.should_capture(error):
+            return False
+        try:
+            screenshot = self._grab_screenshot(driver)
+            html = driver.page_source if page_source else None
+        except Exception as e:
+            self.logger.warning(f"Could not capture diagnostics for {name}: {str(e)}")
+            return False
+        return self._enqueue(name, screenshot, html)
+
+    def capture_html(self, name: str, html: str, error: bool = True) -> bool:
+        if not html or not self.should_capture(error):
+            return False
+        return self._enqueue(name, None, html)
+
+    @staticmethod
+    def _grab_screenshot(driver):
+        # JPEG straight from Chrome is several times smaller than the PNG save_screenshot() writes
+        try:
+            data = driver.execute_cdp_cmd("Page.captureScreenshot",
+                                          {"format": "jpeg", "quality": SCREENSHOT_JPEG_QUALITY})["data"]
+            return "jpg", data
+        except Exception:
+            return "png", driver.get_screenshot_as_base64()
+
+    def _enqueue(self, name: str, screenshot, html: Optional[str]) -> bool:
+        self._ensure_writer()
+        stamp = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{next(self._sequence):04d}"
+        try:
+            self._queue.put_nowait((f"{stamp}_{name}", screenshot, html))
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            self.logger.warning(f"Diagnostics queue full, dropped capture {name}")
+            return False
+        with self._lock:
+            self._stats["queued"] += 1
+        return True
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._thread = threading.Thread(target=self._write_loop, name="diagnostics-writer", daemon=True)
+                self._thread.start()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write(*item)
+                self._enforce_retention()
+            except Exception as e:
+                self.logger.warning(f"Failed to write diagnostics: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, stem: str, screenshot, html: Optional[str]):
+        written = []
+        if screenshot is not None:
+            extension, data = screenshot
+            path = self.directory / f"{stem}.{extension}"
+            path.write_bytes(base64.b64decode(data))
+            written.append(path)
+        if html is not None:
+            path = self.directory / f"{stem}.html.gz"
+            path.write_bytes(gzip.compress(html.encode("utf-8"), compresslevel=6))
+            written.append(path)
+        size = sum(path.stat().st_size for path in written)
+        with self._lock:
+            self._stats["written"] += len(written)
+            self._stats["bytes_written"] += size
+        self.logger.info(f"Saved diagnostics {', '.join(path.name for path in written)} ({size} bytes)")
+
+    def _enforce_retention(self):
+        files = []
+        for path in self.directory.iterdir():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        while files and (len(files) > self.max_files or total > self.max_bytes):
+            _, size, path = files.pop(0)
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        if evicted:
+            with self._lock:
+                self._stats["evicted"] += evicted
+
+    def flush(self, timeout: Optional[float] = None):
+        # Waits (up to the timeout) for queued captures to reach disk
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self._queue.unfinished_tasks and self._thread is not None and self._thread.is_alive():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+
+    def close(self, timeout: float = 10):
+        if self._thread is not None and self._thread.is_alive():
+            self.flush(timeout)
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats) | {"mode": self.mode, "pending": self._queue.qsize()}
+
+
+_default_recorder: Optional[DiagnosticsRecorder] = None
+_default_lock = threading.Lock()
+
+
+def default_recorder() -> DiagnosticsRecorder:
+    # One writer thread per process, shared by every extractor
+    global _default_recorder
+    with _default_lock:
+        if _default_recorder is None:
+            _default_recorder = DiagnosticsRecorder()
+            atexit.register(_default_recorder.close)
+        return _default_recorder
@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# --- Configuration ---
+DEFAULT_POOL_SIZE = 2
+DEFAULT_IDLE_TIMEOUT_SECONDS = 300
+DEFAULT_MAX_USES = 20
+ACQUIRE_TIMEOUT_SECONDS = 120
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+
+class DriverPool:
+    def __init__(self, factory: Callable[[], Optional[object]], size: int = DEFAULT_POOL_SIZE,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT_SECONDS, max_uses: int = DEFAULT_MAX_USES,
+                 logger: Optional[logging.Logger] = None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.max_uses = max_uses
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self._idle: List[PooledDriver] = []
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.retired = 0
+
+    def warm(self, count: Optional[int] = None) -> int:
+        count = self.size if count is None else min(count, self.size)
+        launched = 0
+        while launched < count:
+            with self._cond:
+                if self._closed or self._total >= self.size:
+                    break
+                self._total += 1
+            session = self._launch()
+            with self._cond:
+                if session is None:
+                    self._total -= 1
+                    break
+                self._idle.append(session)
+                self._cond.notify()
+            launched += 1
+        if launched:
+            self.logger.info(f"Driver pool warmed with {launched} session(s)")
+        return launched
+
+    def acquire(self, timeout: float = ACQUIRE_TIMEOUT_SECONDS) -> Optional[PooledDriver]:
+        deadline = time.monotonic() + timeout
+        while True:
+            stale = []
+            with self._cond:
+                if self._closed:
+                    return None
+                stale = self._take_expired()
+                session = self._idle.pop() if self._idle else None
+                launch = session is None and self._total < self.size
+                if launch:
+                    self._total += 1
+                    self.misses += 1
+                elif session is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.logger.error("Timed out waiting for a pooled WebDriver session")
+                        return None
+                    self._cond.wait(remaining)
+                    continue
+            for expired in stale:
+                self._quit(expired, "idle timeout")
+
+            if launch:
+                session = self._launch()
+                if session is None:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    return None
+                return session
+
+            if self._is_healthy(session):
+                with self._cond:
+                    self.hits += 1
+                return session
+            self._retire(session, "failed health check")
+
+    def release(self, session: Optional[PooledDriver]):
+        if session is None:
+            return
+        session.uses += 1
+        session.last_used = time.monotonic()
+        if self._closed:
+            self._retire(session, "pool closed")
+            return
+        if session.uses >= self.max_uses:
+            self._retire(session, f"reached max uses ({self.max_uses})")
+            return
+        if not self._reset(session):
+            self._retire(session, "reset failed")
+            return
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify()
+
+    def discard(self, session: Optional[PooledDriver]):
+        if session is not None:
+            self._retire(session, "discarded by caller")
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            requests = self.hits + self.misses
+            return {
+                "size": self.size,
+                "open": self._total,
+                "idle": len(self._idle),
+                "in_use": self._total - len(self._idle),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / requests, 3) if requests else 0.0,
+                "created": self.created,
+                "retired": self.retired,
+            }
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._total -= len(idle)
+            self.retired += len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            self._quit(session, "pool closed")
+        self.logger.info(f"Driver pool closed: {self.stats()}")
+
+    def _take_expired(self) -> List[PooledDriver]:
+        now = time.monotonic()
+        expired = [s for s in self._idle if now - s.last_used > self.idle_timeout]
+        if expired:
+            self._idle = [s for s in self._idle if s not in expired]
+            self._total -= len(expired)
+            self.retired += len(expired)
+        return expired
+
+    def _launch(self) -> Optional[PooledDriver]:
+        try:
+            driver = self.factory()
+        except Exception as e:
+            self.logger.error(f"Failed to launch pooled WebDriver: {str(e)}")
+            driver = None
+        if driver is None:
+            return None
+        with self._cond:
+            self.created += 1
+        return PooledDriver(driver)
+
+    def _is_healthy(self, session: PooledDriver) -> bool:
+        try:
+            return session.driver.execute_script("return 1") == 1
+        except Exception as e:
+            self.logger.warning(f"Pooled WebDriver health check failed: {str(e)}")
+            return False
+
+    def _reset(self, session: PooledDriver) -> bool:
+        driver = session.driver
+        try:
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                # Storage is not reachable from about:blank or opaque origins
+                pass
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to reset pooled WebDriver: {str(e)}")
+            return False
+
+    def _retire(self, session: PooledDriver, reason: str):
+        with self._cond:
+            self._total -= 1
+            self.retired += 1
+            self._cond.notify()
+        self._quit(session, reason)
+
+    def _quit(self, session: PooledDriver, reason: str):
+        self.logger.info(f"Retiring pooled WebDriver after {session.uses} use(s): {reason}")
+        try:
+            session.driver.quit()
+        except Exception as e:
+            self.logger.error(f"Error closing pooled WebDriver: {e}")
@@ -0,0 +1,144 @@
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.review_fields import REVIEW_ELEMENT_SELECTORS, REVIEW_FIELD_SELECTORS, build_review_record
+
+# --- Configuration ---
+HTTP_TIMEOUT_SECONDS = 20
+HTTP_POOL_MAXSIZE = 10
+CHALLENGE_URL_MARKERS = ['captcha', 'ap/challenge', 'ap/signin', 'errors/validatecaptcha']
+CHALLENGE_PAGE_MARKERS = [
+    '/errors/validatecaptcha',
+    'enter the characters you see below',
+    'type the characters you see in this image',
+    'api-services-support@amazon.com',
+]
+HIDDEN_CLASSES = {'a-icon-alt', 'aok-hidden', 'a-letter-space'}
+NEXT_PAGE_SELECTORS = ['li.a-last a', 'a[data-hook="pagination-next"]', 'span.a-last a']
+DISABLED_NEXT_SELECTORS = ['li.a-disabled.a-last', 'span.a-last.a-disabled']
+
+
+def create_http_session(user_agent: str, pool_maxsize: int = HTTP_POOL_MAXSIZE) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=1)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': user_agent,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-IN,en;q=0.9',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def _visible_text(element) -> str:
+    # Approximates WebElement.text: skips hidden helpers, keeps <br> line breaks and collapses whitespace
+    parts = []
+
+    def walk(node):
+        if not isinstance(node.tag, str):
+            return
+        classes = set((node.get('class') or '').split())
+        if node.tag in ('script', 'style') or classes & HIDDEN_CLASSES:
+            return
+        if node.tag == 'br':
+            parts.append('\n')
+            return
+        parts.append(node.text or '')
+        for child in node:
+            walk(child)
+            parts.append(child.tail or '')
+
+    walk(element)
+    lines = [' '.join(line.split()) for line in ''.join(parts).split('\n')]
+    return '\n'.join(lines).strip()
+
+
+def parse_reviews_html(html: str) -> Tuple[List[Dict], Optional[str]]:
+    doc = lxml.html.fromstring(html)
+    nodes, matched = [], None
+    for selector in REVIEW_ELEMENT_SELECTORS:
+        nodes = doc.cssselect(selector)
+        if nodes:
+            matched = selector
+            break
+
+    def text(root, field):
+        found = root.cssselect(REVIEW_FIELD_SELECTORS[field])
+        return _visible_text(found[0]) if found else None
+
+    reviews = []
+    for node in nodes:
+        rating = node.cssselect(REVIEW_FIELD_SELECTORS['rating'])
+        raw = {
+            'id': node.get('id'),
+            'name': text(node, 'name'),
+            'rating': rating[0].text_content() if rating else None,
+            'title': text(node, 'title'),
+            'body': text(node, 'body'),
+            'date': text(node, 'date'),
+            'verified': text(node, 'verified'),
+            'votes': text(node, 'votes'),
+            'variant': text(node, 'variant'),
+            'images': [img.get('src') for img in node.cssselect(REVIEW_FIELD_SELECTORS['images'])],
+        }
+        reviews.append(build_review_record(raw))
+    return reviews, matched
+
+
+def find_next_page_url(html: str, current_url: str) -> Optional[str]:
+    doc = lxml.html.fromstring(html)
+    for selector in DISABLED_NEXT_SELECTORS:
+        if doc.cssselect(selector):
+            return None
+    for selector in NEXT_PAGE_SELECTORS:
+        links = doc.cssselect(selector)
+        if links and links[0].get('href'):
+            return urljoin(current_url, links[0].get('href'))
+    return None
+
+
+class HttpReviewFetcher:
+    def __init__(self, user_agents: List[str], logger: Optional[logging.Logger] = None,
+                 session: Optional[requests.Session] = None):
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self.session = session or create_http_session(random.choice(user_agents))
+        self.pages_fetched = 0
+
+    def seed_cookies_from_driver(self, driver) -> int:
+        cookies = driver.get_cookies()
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        self.logger.info(f"Seeded HTTP session with {len(cookies)} cookies from browser")
+        return len(cookies)
+
+    def fetch(self, url: str) -> Tuple[Optional[str], str]:
+        try:
+            response = self.session.get(url, timeout=HTTP_TIMEOUT_SECONDS)
+            self.pages_fetched += 1
+            if response.status_code != 200:
+                self.logger.warning(f"HTTP {response.status_code} fetching {url}")
+                return None, response.url
+            return response.text, response.url
+        except requests.RequestException as e:
+            self.logger.warning(f"HTTP request failed for {url}: {str(e)}")
+            return None, url
+
+    @staticmethod
+    def is_challenge(html: str, final_url: str) -> bool:
+        url = final_url.lower()
+        if any(marker in url for marker in CHALLENGE_URL_MARKERS):
+            return True
+        page = html.lower()
+        return any(marker in page for marker in CHALLENGE_PAGE_MARKERS)
+
+    def close(self):
+        self.session.close()
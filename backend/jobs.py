@@ -0,0 +1,412 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# --- Configuration ---
+DEFAULT_JOB_WORKERS = 2
+JOB_HISTORY_LIMIT = 200
+# memory keeps jobs in the web process; sqlite shares them with other gunicorn workers and the extraction worker
+JOB_BACKEND = os.getenv("JOB_BACKEND", "memory")
+JOB_BACKENDS = ["memory", "sqlite"]
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "reviews/jobs.db")
+# How often the sqlite backend checks for new jobs and for progress on a watched job
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "0.5"))
+# The extraction worker publishes its pool, cache and diagnostics stats this often; it counts as down
+# once its last heartbeat is older than WORKER_HEARTBEAT_MISSES intervals
+WORKER_HEARTBEAT_SECONDS = float(os.getenv("WORKER_HEARTBEAT_SECONDS", "5"))
+WORKER_HEARTBEAT_MISSES = 3
+SQLITE_TIMEOUT_SECONDS = 30
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+FINISHED_STATES = (COMPLETED, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+CREATE TABLE IF NOT EXISTS worker_heartbeat (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pid INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    stats TEXT NOT NULL
+);
+"""
+
+
+def new_job(job_id: str, params: Dict) -> Dict:
+    return {
+        'job_id': job_id,
+        'state': QUEUED,
+        'running': True,
+        'progress': 0,
+        'message': 'Waiting for a free worker...',
+        'stage': 'queued',
+        'pages_done': 0,
+        'max_pages': params.get('num_pages'),
+        'reviews': 0,
+        'version': 0,
+        'results_file': None,
+        'summary_file': None,
+        'error': None,
+        'created_at': datetime.now().isoformat(),
+        'started_at': None,
+        'finished_at': None,
+        'params': params,
+    }
+
+
+class JobRegistry:
+    def __init__(self, runner: Callable[[str, Dict], None], workers: int = DEFAULT_JOB_WORKERS,
+                 history_limit: int = JOB_HISTORY_LIMIT, logger: Optional[logging.Logger] = None):
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.history_limit = history_limit
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending: List[str] = []
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        # Separate condition so progress listeners never consume a wake-up meant for a worker
+        self._changed = threading.Condition(self._lock)
+        self._threads: List[threading.Thread] = []
+
+    def submit(self, **params) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        job = new_job(job_id, params)
+        with self._cond:
+            self._ensure_workers()
+            self._jobs[job_id] = job
+            self._pending.append(job_id)
+            self._evict_finished()
+            self._cond.notify()
+            # Queue positions of the jobs still waiting have not moved, but depth has
+            for pending_id in self._pending:
+                self._touch(self._jobs[pending_id])
+        self.logger.info(f"Queued job {job_id} (queue depth {self.queue_depth()})")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._cond:
+            return self._snapshot(job_id)
+
+    def wait_for_change(self, job_id: str, version: int, timeout: float) -> Optional[Dict]:
+        # Blocks until the job moves past the given version; on timeout the unchanged snapshot is returned
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None and job['version'] == version:
+                self._changed.wait_for(lambda: self._jobs.get(job_id, {}).get('version') != version, timeout)
+            return self._snapshot(job_id)
+
+    def update(self, job_id: str, **fields):
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+                self._touch(job)
+
+    def _snapshot(self, job_id: str) -> Optional[Dict]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = dict(job)
+        snapshot['queue_position'] = self._pending.index(job_id) + 1 if job_id in self._pending else 0
+        snapshot['queue_depth'] = len(self._pending)
+        return snapshot
+
+    def _touch(self, job: Dict):
+        job['version'] += 1
+        self._changed.notify_all()
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job['state']] += 1
+            return counts | {'workers': self.workers, 'queue_depth': len(self._pending)}
+
+    def _ensure_workers(self):
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads) + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job['state'] in FINISHED_STATES]
+        for job_id in finished[:max(0, len(self._jobs) - self.history_limit)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                job_id = self._pending.pop(0)
+                job = self._jobs[job_id]
+                job.update({'state': RUNNING, 'stage': 'starting', 'started_at': datetime.now().isoformat(),
+                            'message': 'Starting extraction...'})
+                self._touch(job)
+                # Everyone still queued moved up one place
+                for pending_id in self._pending:
+                    self._touch(self._jobs[pending_id])
+                params = dict(job['params'])
+            try:
+                self.runner(job_id, params)
+            except Exception as e:
+                self.logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+                self.update(job_id, state=FAILED, error=str(e))
+            with self._cond:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    if job['state'] not in FINISHED_STATES:
+                        job['state'] = FAILED if job.get('error') else COMPLETED
+                    job.update({'running': False, 'progress': 100, 'finished_at': datetime.now().isoformat()})
+                    self._touch(job)
+
+
+class SqliteJobRegistry:
+    # Same interface as JobRegistry, with jobs kept in a SQLite database in WAL mode. Any number of web processes
+    # can submit and watch jobs; the extraction worker process (worker.py) claims and runs them through serve().
+    def __init__(self, runner: Callable[[str, Dict], None], workers: int = DEFAULT_JOB_WORKERS,
+                 history_limit: int = JOB_HISTORY_LIMIT, path: str = JOB_STORE_PATH,
+                 poll_interval: float = JOB_POLL_SECONDS, logger: Optional[logging.Logger] = None):
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.history_limit = history_limit
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self._stop = threading.Event()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so read-modify-write updates from different processes
+        # wait for each other instead of failing when they try to upgrade a read lock
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _load(row) -> Dict:
+        job = json.loads(row[3])
+        job.update(state=row[1], version=row[2])
+        return job
+
+    @staticmethod
+    def _save(conn, job: Dict, touch: bool = True):
+        data = json.dumps({k: v for k, v in job.items() if k not in ('state', 'version')}, ensure_ascii=False)
+        conn.execute("UPDATE jobs SET state = ?, version = version + ?, data = ? WHERE job_id = ?",
+                     (job['state'], 1 if touch else 0, data, job['job_id']))
+
+    @staticmethod
+    def _touch_pending(conn):
+        # Queue positions are derived, so waiting jobs are bumped whenever the queue changes
+        conn.execute("UPDATE jobs SET version = version + 1 WHERE state = ?", (QUEUED,))
+
+    def submit(self, **params) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        job = new_job(job_id, params)
+        with self._transaction() as conn:
+            conn.execute("INSERT INTO jobs (job_id, state, version, data) VALUES (?, ?, 0, '{}')", (job_id, QUEUED))
+            self._save(conn, job, touch=False)
+            self._touch_pending(conn)
+            self._evict_finished(conn)
+        self.logger.info(f"Queued job {job_id} (queue depth {self.queue_depth()})")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            return self._snapshot(conn, job_id)
+
+    def wait_for_change(self, job_id: str, version: int, timeout: float) -> Optional[Dict]:
+        # There is no cross-process notification, so the job row is polled until its version moves
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['version'] != version or time.monotonic() >= deadline:
+                return job
+            time.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+
+    def update(self, job_id: str, **fields):
+        with self._transaction() as conn:
+            row = conn.execute("SELECT job_id, state, version, data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is not None:
+                self._save(conn, self._load(row) | fields)
+
+    def _snapshot(self, conn, job_id: str) -> Optional[Dict]:
+        row = conn.execute("SELECT job_id, state, version, data, rowid FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        snapshot = self._load(row)
+        snapshot['queue_depth'] = conn.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (QUEUED,)).fetchone()[0]
+        snapshot['queue_position'] = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state = ? AND rowid <= ?", (QUEUED, row[4])
+        ).fetchone()[0] if row[1] == QUEUED else 0
+        return snapshot
+
+    def queue_depth(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE state = ?", (QUEUED,)).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0} | dict(rows)
+        return counts | {'workers': self.workers, 'queue_depth': counts[QUEUED]}
+
+    def _evict_finished(self, conn):
+        total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        excess = max(0, total - self.history_limit)
+        if excess:
+            conn.execute(
+                "DELETE FROM jobs WHERE rowid IN (SELECT rowid FROM jobs WHERE state IN (?, ?) ORDER BY rowid LIMIT ?)",
+                (*FINISHED_STATES, excess)
+            )
+
+    def _claim(self) -> Optional[tuple]:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT job_id, state, version, data FROM jobs WHERE state = ? ORDER BY rowid LIMIT 1",
+                               (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            job = self._load(row)
+            job.update({'state': RUNNING, 'stage': 'starting', 'started_at': datetime.now().isoformat(),
+                        'message': 'Starting extraction...'})
+            self._save(conn, job)
+            # Everyone still queued moved up one place
+            self._touch_pending(conn)
+            return job['job_id'], dict(job['params'])
+
+    def _finish(self, job_id: str):
+        with self._transaction() as conn:
+            row = conn.execute("SELECT job_id, state, version, data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            job = self._load(row)
+            if job['state'] not in FINISHED_STATES:
+                job['state'] = FAILED if job.get('error') else COMPLETED
+            job.update({'running': False, 'progress': 100, 'finished_at': datetime.now().isoformat()})
+            self._save(conn, job)
+
+    def recover_interrupted(self) -> int:
+        # Jobs left running by a worker process that died will never finish; fail them so pages stop waiting
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT job_id, state, version, data FROM jobs WHERE state = ?", (RUNNING,)).fetchall()
+            for row in rows:
+                job = self._load(row)
+                job.update({'state': FAILED, 'running': False, 'progress': 100, 'error': "Extraction worker restarted",
+                            'finished_at': datetime.now().isoformat()})
+                self._save(conn, job)
+        if rows:
+            self.logger.warning(f"Marked {len(rows)} interrupted jobs as failed")
+        return len(rows)
+
+    def serve(self, stats: Optional[Callable[[], Dict]] = None):
+        # Runs in the extraction worker process until stop() is called, publishing a heartbeat with its stats
+        self.recover_interrupted()
+        self.logger.info(f"Serving jobs from {self.path} with {self.workers} workers")
+        threads = [threading.Thread(target=self._work, name=f"job-worker-{i + 1}", daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        started_at = datetime.now().isoformat()
+        while not self._stop.is_set():
+            try:
+                self.publish_heartbeat(started_at, stats() if stats else {})
+            except Exception as e:
+                self.logger.error(f"Could not publish worker heartbeat: {str(e)}")
+            self._stop.wait(WORKER_HEARTBEAT_SECONDS)
+        for thread in threads:
+            thread.join()
+        self.publish_heartbeat(started_at, stats() if stats else {}, alive=False)
+
+    def publish_heartbeat(self, started_at: str, stats: Dict, alive: bool = True):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO worker_heartbeat (id, pid, started_at, seen_at, stats) "
+                         "VALUES (1, ?, ?, ?, ?)",
+                         (os.getpid(), started_at, time.time() if alive else 0.0, json.dumps(stats)))
+
+    def worker_status(self) -> Dict:
+        # Read by web processes: the worker's own stats as of its last heartbeat, and whether it is still beating
+        with self._connect() as conn:
+            row = conn.execute("SELECT pid, started_at, seen_at, stats FROM worker_heartbeat WHERE id = 1").fetchone()
+        if row is None:
+            return {'alive': False, 'pid': None, 'started_at': None, 'last_seen_seconds': None, 'stats': {}}
+        age = time.time() - row[2]
+        return {
+            'alive': age < WORKER_HEARTBEAT_SECONDS * WORKER_HEARTBEAT_MISSES,
+            'pid': row[0],
+            'started_at': row[1],
+            'last_seen_seconds': round(age, 1) if row[2] else None,
+            'stats': json.loads(row[3]),
+        }
+
+    def stop(self):
+        self._stop.set()
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                claimed = self._claim()
+            except sqlite3.Error as e:
+                self.logger.error(f"Could not claim a job: {str(e)}")
+                claimed = None
+            if claimed is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            job_id, params = claimed
+            try:
+                self.runner(job_id, params)
+            except Exception as e:
+                self.logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+                self.update(job_id, state=FAILED, error=str(e))
+            self._finish(job_id)
+
+
+def create_job_registry(backend: str, runner: Callable[[str, Dict], None], workers: int = DEFAULT_JOB_WORKERS):
+    if backend == "memory":
+        return JobRegistry(runner, workers=workers)
+    if backend == "sqlite":
+        return SqliteJobRegistry(runner, workers=workers)
+    raise ValueError(f"Unknown job backend: {backend}. Choose one of {JOB_BACKENDS}")
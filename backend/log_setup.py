@@ -0,0 +1,143 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+# --- Configuration ---
+LOGGER_NAME = "AmazonExtractorLogger"
+LOG_DIR = Path(__file__).parent / "logs"
+LOG_FILE = "amazon_extractor.log"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# The log file is rotated once it reaches LOG_MAX_BYTES; older files are deleted after LOG_MAX_AGE_DAYS
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_MAX_AGE_DAYS = float(os.getenv("LOG_MAX_AGE_DAYS", "14"))
+# Long-running processes re-check the age limit on every rollover and at least this often
+LOG_PRUNE_INTERVAL_SECONDS = 3600
+LOG_FORMAT = "%(asctime)s - %(levelname)s - [%(job)s] %(message)s"
+NO_JOB = "-"
+
+_setup_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_settings = None
+_fork_hook_registered = False
+
+
+class JobContextFilter(logging.Filter):
+    # Records from shared components (driver pool, diagnostics, ...) are not tied to one job
+    def filter(self, record):
+        if not hasattr(record, "job"):
+            record.job = NO_JOB
+        return True
+
+
+def prune_logs(directory=LOG_DIR, max_age_days: float = LOG_MAX_AGE_DAYS, keep: Optional[Path] = None) -> int:
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for path in Path(directory).glob("amazon_extractor*.log*"):
+        try:
+            if path != keep and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class PruningRotatingFileHandler(RotatingFileHandler):
+    # Runs on the listener thread, so processes that live for weeks keep deleting old files, not just at start-up
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.next_prune = time.monotonic() + LOG_PRUNE_INTERVAL_SECONDS
+
+    def prune(self):
+        self.next_prune = time.monotonic() + LOG_PRUNE_INTERVAL_SECONDS
+        prune_logs(Path(self.baseFilename).parent, keep=Path(self.baseFilename))
+
+    def doRollover(self):
+        super().doRollover()
+        self.prune()
+
+    def emit(self, record):
+        if time.monotonic() >= self.next_prune:
+            self.prune()
+        super().emit(record)
+
+
+def configure_logging(level: str = LOG_LEVEL, directory=LOG_DIR, to_file: bool = True) -> logging.Logger:
+    global _listener, _settings, _fork_hook_registered
+    logger = logging.getLogger(LOGGER_NAME)
+    # Extractors are built concurrently by batch and job workers; only the first call installs the pipeline
+    with _setup_lock:
+        if _listener is not None:
+            return logger
+        _settings = (level, directory, to_file)
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = []
+        if to_file:
+            directory = Path(directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            prune_logs(directory)
+            file_handler = PruningRotatingFileHandler(directory / LOG_FILE, maxBytes=LOG_MAX_BYTES,
+                                                      backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+        if sys.platform.startswith('win'):
+            sys.stdout.reconfigure(encoding='utf-8')
+
+        # Crawl threads only put records on the queue; file and console writes happen on the listener thread
+        log_queue = queue.SimpleQueue()
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.addFilter(JobContextFilter())
+        logger.setLevel(level)
+        logger.addHandler(queue_handler)
+        _listener = QueueListener(log_queue, *handlers)
+        _listener.start()
+        atexit.register(stop_logging)
+        if not _fork_hook_registered and hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_after_fork)
+            _fork_hook_registered = True
+    return logger
+
+
+def _restart_after_fork():
+    # A forked child (a gunicorn worker of a preloaded master) inherits the queue handler but not the
+    # listener thread, so its records would pile up unread; it gets a pipeline of its own instead
+    global _setup_lock, _listener
+    _setup_lock = threading.Lock()
+    if _listener is None:
+        return
+    _listener = None
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+        logger.removeHandler(handler)
+    configure_logging(*_settings)
+
+
+def stop_logging():
+    # Drains the queue so records logged just before exit are still written
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+            logger.removeHandler(handler)
+
+
+def job_logger(job: Optional[str] = None) -> logging.LoggerAdapter:
+    # Every record logged through the adapter is tagged with the job (app job id or ASIN) it belongs to
+    return logging.LoggerAdapter(configure_logging(), {"job": job or NO_JOB})
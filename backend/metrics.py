@@ -0,0 +1,53 @@
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+# --- Configuration ---
+# Set (before prometheus_client is imported) when several processes record metrics: gunicorn web workers and
+# worker.py each write to files in this directory and /metrics aggregates them
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+REVIEWS_PER_PAGE_BUCKETS = (0, 1, 2, 5, 8, 10, 15, 20, 50)
+
+# Every StageTimeline span (driver setup, page extraction, pagination, crawl, sentiment, summary, save, ...)
+STAGE_SECONDS = Histogram("extractor_stage_seconds", "Time spent in each extraction stage", ["stage"],
+                          buckets=STAGE_BUCKETS)
+NAVIGATION_SECONDS = Histogram("extractor_navigation_attempt_seconds", "Duration of each browser navigation attempt",
+                               ["outcome"], buckets=STAGE_BUCKETS)
+JOB_SECONDS = Histogram("extractor_job_seconds", "End-to-end duration of extraction jobs", ["outcome"],
+                        buckets=STAGE_BUCKETS)
+REVIEWS_PER_PAGE = Histogram("extractor_reviews_per_page", "Reviews found on each crawled page", ["engine"],
+                             buckets=REVIEWS_PER_PAGE_BUCKETS)
+RETRIES = Counter("extractor_retries", "Retried operations", ["operation"])
+CAPTCHAS = Counter("extractor_captchas", "CAPTCHA or challenge pages encountered", ["engine"])
+DUPLICATES_SKIPPED = Counter("extractor_duplicate_reviews_skipped", "Reviews skipped as already seen in the same run")
+DUPLICATES_FLAGGED = Counter("extractor_duplicate_reviews_flagged", "Reviews flagged as copies of an earlier review",
+                             ["kind"])
+# Point-in-time values. Job counts are read from the job registry when /metrics is scraped, so any web worker's
+# latest reading is right; pool sessions are set by the process that owns the pool and summed over live processes.
+JOBS = Gauge("extractor_jobs", "Extraction jobs by state", ["state"], multiprocess_mode="mostrecent")
+DRIVER_POOL_SESSIONS = Gauge("extractor_driver_pool_sessions", "Browser sessions in the pool", ["state"],
+                             multiprocess_mode="livesum")
+
+
+def render_metrics():
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(), CONTENT_TYPE_LATEST
+    from prometheus_client import multiprocess
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    # Drops the live gauges of a process that exited; its counters and histograms keep counting in the totals
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
+
+
+def count_retry(operation: str):
+    # tenacity before_sleep hook factory: counts each retry of the wrapped call
+    def before_sleep(retry_state):
+        RETRIES.labels(operation=operation).inc()
+    return before_sleep
@@ -0,0 +1,112 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.metrics import STAGE_SECONDS
+
+# --- Configuration ---
+PIPELINE_QUEUE_SIZE = 4
+
+_DONE = object()
+
+
+class StageTimeline:
+    # Wall-clock spans per stage, relative to the start of the run, so overlapping stages are visible.
+    # Every span is also observed in the process-wide stage latency histogram served on /metrics.
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, start: float, end: float, **info):
+        STAGE_SECONDS.labels(stage=stage).observe(end - start)
+        with self._lock:
+            self.spans.append({"stage": stage, "start": round(start - self.started, 3),
+                               "end": round(end - self.started, 3), **info})
+
+    @contextmanager
+    def span(self, stage: str, **info):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, start, time.perf_counter(), **info)
+
+    def summary(self) -> Dict[str, Dict]:
+        stages: Dict[str, Dict] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            stage = stages.setdefault(span["stage"], {"first_start": span["start"], "last_end": span["end"],
+                                                      "busy": 0.0, "spans": 0})
+            stage["first_start"] = min(stage["first_start"], span["start"])
+            stage["last_end"] = max(stage["last_end"], span["end"])
+            stage["busy"] = round(stage["busy"] + span["end"] - span["start"], 3)
+            stage["spans"] += 1
+        return stages
+
+    def log(self, logger: logging.Logger):
+        total = round(time.perf_counter() - self.started, 3)
+        for name, stage in sorted(self.summary().items(), key=lambda item: item[1]["first_start"]):
+            logger.info(f"Stage {name}: {stage['first_start']:.2f}s -> {stage['last_end']:.2f}s, "
+                        f"busy {stage['busy']:.2f}s over {stage['spans']} spans")
+        logger.info(f"Run took {total:.2f}s")
+
+
+class ReviewPipeline:
+    # Each stage runs on its own thread and hands batches to the next through a bounded queue,
+    # so a slow stage pushes back on the crawl instead of buffering without limit
+    def __init__(self, stages: List[Tuple[str, Callable]], timeline: Optional[StageTimeline] = None,
+                 queue_size: int = PIPELINE_QUEUE_SIZE, logger: Optional[logging.Logger] = None):
+        self.stages = stages
+        self.timeline = timeline or StageTimeline()
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.threads: List[threading.Thread] = []
+        self.errors: List[Tuple[str, Exception]] = []
+        self.closed = False
+
+    def start(self):
+        for index, (name, fn) in enumerate(self.stages):
+            out_queue = self.queues[index + 1] if index + 1 < len(self.queues) else None
+            thread = threading.Thread(target=self._run_stage, args=(name, fn, self.queues[index], out_queue),
+                                      name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _run_stage(self, name: str, fn: Callable, in_queue: queue.Queue, out_queue: Optional[queue.Queue]):
+        failed = False
+        while True:
+            batch = in_queue.get()
+            if batch is _DONE:
+                break
+            if failed:
+                # Keep draining so upstream stages never block on a dead consumer
+                continue
+            try:
+                with self.timeline.span(name, items=len(batch)):
+                    result = fn(batch)
+                if out_queue is not None and result is not None:
+                    out_queue.put(result)
+            except Exception as e:
+                self.logger.error(f"Pipeline stage {name} failed: {str(e)}", exc_info=True)
+                self.errors.append((name, e))
+                failed = True
+        if out_queue is not None:
+            out_queue.put(_DONE)
+
+    def submit(self, batch: List[Dict]):
+        if batch:
+            self.queues[0].put(batch)
+
+    def close(self):
+        if self.closed:
+            return not self.errors
+        self.closed = True
+        self.queues[0].put(_DONE)
+        for thread in self.threads:
+            thread.join()
+        return not self.errors
@@ -0,0 +1,56 @@
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Human-like jitter ranges in seconds, applied on top of the explicit page readiness waits
+POLITENESS_PRESETS: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "off": {
+        "after_navigation": (0, 0),
+        "before_click": (0, 0),
+        "between_pages": (0, 0),
+        "retry": (0, 0),
+    },
+    "light": {
+        "after_navigation": (0, 0.5),
+        "before_click": (0, 0.3),
+        "between_pages": (0.5, 1.5),
+        "retry": (2, 4),
+    },
+    # Matches the fixed sleeps the extractor used before readiness waits
+    "human": {
+        "after_navigation": (3, 5),
+        "before_click": (1, 2),
+        "between_pages": (2, 5),
+        "retry": (4, 8),
+    },
+}
+DEFAULT_POLITENESS = os.getenv("POLITENESS", "light")
+
+
+class PolitenessPolicy:
+    def __init__(self, delays: Optional[Dict[str, Tuple[float, float]]] = None, name: str = "custom"):
+        self.name = name
+        self.delays = dict(POLITENESS_PRESETS["off"])
+        self.delays.update(delays or {})
+        self.total_delay = 0.0
+        # Parallel page workers share one policy
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_preset(cls, name: Optional[str] = None) -> "PolitenessPolicy":
+        name = (name or DEFAULT_POLITENESS).lower()
+        if name not in POLITENESS_PRESETS:
+            raise ValueError(f"Unknown politeness preset: {name}. Choose one of {list(POLITENESS_PRESETS)}")
+        return cls(POLITENESS_PRESETS[name], name=name)
+
+    def pause(self, kind: str) -> float:
+        low, high = self.delays.get(kind, (0, 0))
+        if high <= 0:
+            return 0.0
+        delay = random.uniform(low, high)
+        time.sleep(delay)
+        with self._lock:
+            self.total_delay += delay
+        return delay
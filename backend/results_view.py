@@ -0,0 +1,134 @@
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.review_sink import atomic_path
+from backend.sentiment import count_sentiments, score_reviews
+
+# --- Configuration ---
+VIEW_CACHE_SIZE = int(os.getenv("RESULTS_VIEW_CACHE_SIZE", "32"))
+VIEW_MODEL_VERSION = 2
+# Columns the results page and review API use; Parquet results are read with only these decoded
+VIEW_COLUMNS = [
+    'review_id', 'reviewer_name', 'rating', 'title', 'body', 'date', 'country',
+    'verified_purchase', 'product_variant', 'helpful_votes', 'images', 'sentiment', 'compound'
+]
+
+
+def view_model_path(filepath: str) -> Path:
+    path = Path(filepath)
+    return path.with_name(f"{path.stem}_view.json")
+
+
+def build_results_view(filepath: str, summary_file: Optional[str] = None, product_url: Optional[str] = None) -> Dict:
+    results = {}
+    summary = {}
+    reviews = []
+
+    if filepath.endswith('.json'):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        reviews = results.get('reviews', [])
+        summary = results.get('summary', {})
+        summary_file = None  # JSON output doesn't have a separate summary file
+    elif filepath.endswith('.parquet'):
+        from backend.review_parquet import read_reviews_parquet
+        reviews, results = read_reviews_parquet(filepath, columns=VIEW_COLUMNS)
+        results['reviews'] = reviews
+        summary = results.get('summary', {})
+        summary_file = None  # Parquet output keeps the summary in its footer
+    elif filepath.endswith('.csv'):
+        import pandas as pd
+        df = pd.read_csv(filepath, encoding='utf-8-sig')
+        # Empty CSV cells come back as NaN; use the same defaults as missing JSON fields
+        df = df.fillna({'reviewer_name': 'Unknown', 'rating': 0.0, 'title': 'No Title', 'date': 'Unknown Date', 'body': ''})
+        reviews = df.to_dict('records')
+        if summary_file and Path(summary_file).exists():
+            with open(summary_file, 'r', encoding='utf-8') as f:
+                summary = json.load(f)
+        else:
+            summary_file = None
+        results = {
+            'metadata': {
+                'product_url': product_url or '',
+                'extraction_date': datetime.now().isoformat(),
+                'total_reviews': len(df),
+                'source': 'Amazon',
+                'extractor_version': '1.1'
+            },
+            'reviews': reviews,
+            'summary': summary
+        }
+
+    # Ensure all expected fields are present in reviews
+    for review in reviews:
+        review.setdefault('reviewer_name', 'Unknown')
+        review.setdefault('rating', 0.0)
+        review.setdefault('title', 'No Title')
+        review.setdefault('date', 'Unknown Date')
+        review.setdefault('body', '')
+
+    # Reviews scored at extraction time keep their labels; older results files are scored once here
+    score_reviews(reviews)
+    sentiment_counts = count_sentiments(reviews)
+
+    # Ensure summary has all expected fields
+    summary.setdefault('pros', ['No pros available'] * 5)
+    summary.setdefault('cons', ['No cons available'] * 5)
+    summary.setdefault('summary', ['No summary available'] * 5)
+    summary.setdefault('total_score', 0)
+    summary['review_counts'] = {
+        'positive': sentiment_counts['positive'],
+        'negative': sentiment_counts['negative'],
+        'neutral': sentiment_counts['neutral'],
+        'total': len(reviews)
+    }
+
+    context = {
+        'product_url': results['metadata']['product_url'],
+        'total_reviews': results['metadata']['total_reviews'],
+        'extraction_date': results['metadata']['extraction_date'],
+        'reviews': reviews,
+        'sentiment': sentiment_counts,
+        'summary': summary,
+        'summary_file': summary_file
+    }
+    return context
+
+
+def save_results_view(filepath: str, view: Dict) -> str:
+    path = view_model_path(filepath)
+    payload = {
+        'version': VIEW_MODEL_VERSION,
+        'source_mtime': os.path.getmtime(filepath),
+        'view': view
+    }
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False)
+    return str(path)
+
+
+def precompute_results_view(filepath: str, summary_file: Optional[str] = None, product_url: Optional[str] = None) -> Dict:
+    view = build_results_view(filepath, summary_file, product_url)
+    save_results_view(filepath, view)
+    return view
+
+
+@lru_cache(maxsize=VIEW_CACHE_SIZE)
+def _cached_results_view(filepath: str, mtime: float, summary_file: Optional[str], product_url: Optional[str]) -> Dict:
+    path = view_model_path(filepath)
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('version') == VIEW_MODEL_VERSION and payload.get('source_mtime') == mtime:
+            return payload['view']
+    return precompute_results_view(filepath, summary_file, product_url)
+
+
+def get_results_view(filepath: str, summary_file: Optional[str] = None, product_url: Optional[str] = None) -> Dict:
+    # Keyed by file and mtime, so a rewritten results file is never served stale
+    return _cached_results_view(filepath, os.path.getmtime(filepath), summary_file, product_url)
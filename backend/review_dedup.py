@@ -0,0 +1,256 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# --- Configuration ---
+DEDUP_INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", "reviews/dedup.db")
+# Estimated Jaccard similarity of word 3-grams at or above which a review is flagged as a near duplicate
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.75"))
+# Shorter reviews ("Good product", "Value for money") are too generic to call near copies of each other;
+# identical texts are still flagged as exact copies whatever their length
+DEDUP_MIN_WORDS = int(os.getenv("DEDUP_MIN_WORDS", "8"))
+SHINGLE_SIZE = 3
+# 32 bands of 4 rows: reviews at 0.75 similarity share a band practically always, so they are never missed;
+# unrelated reviews that share one by chance are dropped when their signatures are compared
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+MINHASH_PRIME = 4294967291
+MINHASH_SEED = 20250501
+SQLITE_TIMEOUT_SECONDS = 30
+# Connections are short-lived, so the OS page cache (through mmap) rather than SQLite's own cache keeps lookups warm
+SQLITE_MMAP_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_fingerprints (
+    id INTEGER PRIMARY KEY,
+    asin TEXT NOT NULL,
+    review_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    duplicate_of TEXT,
+    duplicate_score REAL,
+    duplicate_kind TEXT,
+    first_seen TEXT NOT NULL,
+    UNIQUE (asin, review_id)
+);
+CREATE INDEX IF NOT EXISTS review_fingerprints_fingerprint ON review_fingerprints (fingerprint);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    review INTEGER NOT NULL REFERENCES review_fingerprints (id),
+    PRIMARY KEY (band, bucket, review)
+) WITHOUT ROWID;
+"""
+
+_permutations = None
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return " ".join(re.findall(r"\w+", text))
+
+
+def text_fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def shingles(normalized: str, size: int = SHINGLE_SIZE) -> List[str]:
+    words = normalized.split()
+    if len(words) <= size:
+        return [normalized]
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def _stable_hash(value: bytes) -> int:
+    # Python's hash() is salted per process; signatures are persisted, so they need a stable hash
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "little", signed=True)
+
+
+def minhash_signature(tokens: Iterable[str]):
+    import numpy as np
+    global _permutations
+    if _permutations is None:
+        rng = np.random.default_rng(MINHASH_SEED)
+        _permutations = (rng.integers(1, MINHASH_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64),
+                         rng.integers(0, MINHASH_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64))
+    a, b = _permutations
+    hashes = np.array([_stable_hash(token.encode("utf-8")) & 0xFFFFFFFF for token in set(tokens)], dtype=np.uint64)
+    # a * h + b stays below 2**64 because both a and h are below 2**32
+    return ((np.outer(hashes, a) + b) % MINHASH_PRIME).min(axis=0).astype(np.uint32)
+
+
+def band_buckets(signature) -> List[int]:
+    return [_stable_hash(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()) for band in range(LSH_BANDS)]
+
+
+def signature_similarity(left, right) -> float:
+    return float((left == right).mean())
+
+
+class ReviewDedupIndex:
+    # Content-based duplicate detection that persists across runs and products. Exact copies are found by
+    # a fingerprint of the normalized text, near copies through MinHash signatures bucketed by LSH band,
+    # so checking a review costs a fixed number of indexed lookups however large the index grows.
+    # Duplicates are flagged on the review (duplicate_of / duplicate_score), never removed.
+    def __init__(self, path: str = DEDUP_INDEX_PATH, threshold: float = DEDUP_THRESHOLD,
+                 min_words: int = DEDUP_MIN_WORDS, logger: Optional[logging.Logger] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.min_words = min_words
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn):
+        # Indexes created before the match kind was stored tell exact and near copies apart by score only
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(review_fingerprints)")}
+        if 'duplicate_kind' not in existing:
+            conn.execute("ALTER TABLE review_fingerprints ADD COLUMN duplicate_kind TEXT")
+            conn.execute("UPDATE review_fingerprints SET duplicate_kind = CASE WHEN duplicate_score = 1.0 "
+                         "THEN 'exact' ELSE 'near' END WHERE duplicate_of IS NOT NULL")
+        # Older indexes keyed buckets by the implicit rowid, which VACUUM may renumber. The table is rebuilt with
+        # an explicit id and the buckets are recomputed from the stored signatures.
+        if 'id' not in existing:
+            import numpy as np
+            # One transaction, so an interrupted rebuild leaves the old tables as they were
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            conn.execute("ALTER TABLE review_fingerprints RENAME TO review_fingerprints_old")
+            conn.execute("DROP INDEX review_fingerprints_fingerprint")
+            conn.execute("DROP TABLE lsh_buckets")
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute("INSERT INTO review_fingerprints (asin, review_id, fingerprint, signature, duplicate_of, "
+                         "duplicate_score, duplicate_kind, first_seen) SELECT asin, review_id, fingerprint, "
+                         "signature, duplicate_of, duplicate_score, duplicate_kind, first_seen "
+                         "FROM review_fingerprints_old ORDER BY rowid")
+            conn.execute("DROP TABLE review_fingerprints_old")
+            # Only reviews long enough for near matching were indexed before, so every row gets its buckets
+            for review, signature in conn.execute("SELECT id, signature FROM review_fingerprints").fetchall():
+                buckets = band_buckets(np.frombuffer(signature, dtype=np.uint32))
+                conn.executemany("INSERT OR IGNORE INTO lsh_buckets (band, bucket, review) VALUES (?, ?, ?)",
+                                 [(band, bucket, review) for band, bucket in enumerate(buckets)])
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per operation keeps the index safe to share between job threads
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS)
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_BYTES}")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def review_text(review: Dict) -> str:
+        return normalize_text(review.get('body') or "")
+
+    def flag(self, asin: str, reviews: List[Dict]) -> Dict[str, int]:
+        # Checks each review against everything indexed so far (including earlier reviews in the same list),
+        # sets its duplicate fields and adds it to the index
+        counts = {"exact": 0, "near": 0}
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            for review in reviews:
+                review['duplicate_of'], review['duplicate_score'] = None, None
+                review_id = review.get('review_id')
+                normalized = self.review_text(review)
+                if not review_id or 'error' in review or not normalized:
+                    continue
+                known = conn.execute(
+                    "SELECT duplicate_of, duplicate_score, duplicate_kind FROM review_fingerprints "
+                    "WHERE asin = ? AND review_id = ?",
+                    (asin, review_id)
+                ).fetchone()
+                if known is not None:
+                    # Seen in an earlier run: keep the verdict it got then
+                    review['duplicate_of'], review['duplicate_score'], kind = known
+                else:
+                    kind = self._check_and_add(conn, asin, review, normalized, now)
+                if review['duplicate_of']:
+                    counts[kind] += 1
+        return counts
+
+    def _check_and_add(self, conn, asin: str, review: Dict, normalized: str, now: str) -> Optional[str]:
+        # Returns "exact", "near" or None. Only an identical text fingerprint makes an exact copy; a near copy
+        # whose signature happens to match in full also scores 1.0 but is still counted as near.
+        # Short reviews are only matched exactly and are left out of the LSH buckets.
+        fingerprint = text_fingerprint(normalized)
+        signature = minhash_signature(shingles(normalized))
+        buckets = band_buckets(signature) if len(normalized.split()) >= self.min_words else []
+        match, kind = self._exact_match(conn, fingerprint), "exact"
+        if match is None and buckets:
+            match, kind = self._near_match(conn, signature, buckets), "near"
+        if match is None:
+            kind = None
+        else:
+            review['duplicate_of'], review['duplicate_score'] = match
+        review_key = conn.execute(
+            "INSERT INTO review_fingerprints (asin, review_id, fingerprint, signature, duplicate_of, duplicate_score, "
+            "duplicate_kind, first_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (asin, review['review_id'], fingerprint, signature.tobytes(), review['duplicate_of'],
+             review['duplicate_score'], kind, now)
+        ).lastrowid
+        conn.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (band, bucket, review) VALUES (?, ?, ?)",
+            [(band, bucket, review_key) for band, bucket in enumerate(buckets)]
+        )
+        return kind
+
+    @staticmethod
+    def _exact_match(conn, fingerprint: str) -> Optional[Tuple[str, float]]:
+        row = conn.execute(
+            "SELECT asin, review_id FROM review_fingerprints WHERE fingerprint = ? ORDER BY first_seen LIMIT 1",
+            (fingerprint,)
+        ).fetchone()
+        return (f"{row[0]}:{row[1]}", 1.0) if row else None
+
+    def _near_match(self, conn, signature, buckets: List[int]) -> Optional[Tuple[str, float]]:
+        import numpy as np
+        candidates = set()
+        for band, bucket in enumerate(buckets):
+            candidates.update(row[0] for row in conn.execute(
+                "SELECT review FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+            ))
+        best = None
+        for candidate in candidates:
+            candidate_asin, candidate_id, candidate_signature = conn.execute(
+                "SELECT asin, review_id, signature FROM review_fingerprints WHERE id = ?", (candidate,)
+            ).fetchone()
+            score = signature_similarity(signature, np.frombuffer(candidate_signature, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (f"{candidate_asin}:{candidate_id}", round(score, 3))
+        return best
+
+    def annotate(self, asin: str, reviews: List[Dict]) -> int:
+        # Copies stored verdicts onto reviews loaded back from the review store; returns how many are duplicates
+        with self._connect() as conn:
+            verdicts = dict(((row[0], (row[1], row[2])) for row in conn.execute(
+                "SELECT review_id, duplicate_of, duplicate_score FROM review_fingerprints WHERE asin = ?", (asin,)
+            )))
+        flagged = 0
+        for review in reviews:
+            review['duplicate_of'], review['duplicate_score'] = verdicts.get(review.get('review_id'), (None, None))
+            flagged += review['duplicate_of'] is not None
+        return flagged
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            total, duplicates = conn.execute(
+                "SELECT COUNT(*), COUNT(duplicate_of) FROM review_fingerprints"
+            ).fetchone()
+        return {"indexed": total, "duplicates": duplicates}
@@ -0,0 +1,90 @@
+import hashlib
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Review containers, tried in order until one of them matches
+REVIEW_ELEMENT_SELECTORS = [
+    'div[data-hook="review"]',
+    'div.a-section.review.aok-relative',
+    '#cm_cr-review_list div[data-hook="review"]',
+    '.review',
+]
+
+# Formats of the date part of "Reviewed in India on 7 April 2025" across Amazon sites
+REVIEW_DATE_FORMATS = ["%d %B %Y", "%B %d, %Y", "%d %b %Y"]
+
+# Per-field selectors, relative to a review container
+REVIEW_FIELD_SELECTORS = {
+    'name': '.a-profile-name',
+    'rating': 'i[data-hook="review-star-rating"]',
+    'title': 'a[data-hook="review-title"]',
+    'body': 'span[data-hook="review-body"] span',
+    'date': 'span[data-hook="review-date"]',
+    'verified': 'span[data-hook="avp-badge"]',
+    'votes': 'span[data-hook="helpful-vote-statement"]',
+    'variant': 'a[data-hook="format-strip"]',
+    'images': 'img[data-hook="review-image-tile"]',
+}
+
+
+def parse_review_date(text) -> Optional[datetime]:
+    if isinstance(text, datetime):
+        return text
+    if not isinstance(text, str):
+        return None
+    for fmt in REVIEW_DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _strip(value: Optional[str], default: str) -> str:
+    return value.strip() if value is not None else default
+
+
+def content_review_id(reviewer_name: str, date: str, title: str, body: str) -> str:
+    # Review elements without an id get one derived from their content, so a review that shows up
+    # on two pages or in two runs keeps the same id instead of being counted twice
+    digest = hashlib.sha1("\x1f".join([reviewer_name, date, title, body]).encode("utf-8")).hexdigest()[:12]
+    return f"review_{digest}"
+
+
+def build_review_record(raw: Dict) -> Dict:
+    # `raw` holds the untouched text of each field (None when the element is missing)
+    rating = 0.0
+    rating_text = _strip(raw.get('rating'), "")
+    try:
+        rating = float(rating_text.split()[0]) if rating_text else 0.0
+    except ValueError:
+        pass
+
+    date_text = _strip(raw.get('date'), "")
+    date_match = re.search(r'on\s+(.+)', date_text)
+    date = date_match.group(1).strip() if date_match else ""
+    country_match = re.search(r'in\s+(.+?)\s+on', date_text)
+    country = country_match.group(1).strip() if country_match else ""
+
+    votes_match = re.search(r'(\d+)', _strip(raw.get('votes'), ""))
+    images: List[str] = [src for src in (raw.get('images') or []) if src]
+
+    reviewer_name = _strip(raw.get('name'), "Unknown")
+    title = _strip(raw.get('title'), "No Title")
+    body = _strip(raw.get('body'), "")
+
+    return {
+        'review_id': raw.get('id') or content_review_id(reviewer_name, date, title, body),
+        'reviewer_name': reviewer_name,
+        'rating': rating,
+        'title': title,
+        'date': date,
+        'country': country,
+        'verified_purchase': "Verified Purchase" in _strip(raw.get('verified'), ""),
+        'product_variant': _strip(raw.get('variant'), ""),
+        'body': body,
+        'helpful_votes': int(votes_match.group(1)) if votes_match else 0,
+        'images': images,
+        'extracted_at': datetime.now().isoformat()
+    }
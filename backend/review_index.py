@@ -0,0 +1,148 @@
+import base64
+import math
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.results_view import get_results_view
+from backend.review_fields import parse_review_date
+
+# --- Configuration ---
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+INDEX_CACHE_SIZE = int(os.getenv("REVIEW_INDEX_CACHE_SIZE", "16"))
+
+SENTIMENTS = ("positive", "negative", "neutral")
+# Every sort is newest/highest first; "default" keeps extraction order
+SORTS = ("default", "date", "helpful", "score")
+CARD_FIELDS = [
+    'review_id', 'reviewer_name', 'rating', 'title', 'body', 'date', 'country',
+    'verified_purchase', 'product_variant', 'helpful_votes', 'sentiment', 'compound'
+]
+
+
+def _clean(value):
+    # CSV results read back missing cells as NaN, which is not valid JSON
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _as_number(value, default: float = 0.0) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if math.isnan(number) else number
+
+
+def _date_ordinal(text) -> int:
+    date = parse_review_date(text)
+    return date.toordinal() if date else 0
+
+
+def _as_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(_clean(value))
+
+
+def encode_cursor(sort: str, offset: int, returned: int) -> str:
+    # Position in the sort order plus how many matches were already returned, so pages never rescan
+    return base64.urlsafe_b64encode(f"{sort}:{offset}:{returned}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, offset, returned = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        offset, returned = int(offset), int(returned)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or offset < 0 or returned < 0:
+        raise ValueError("Cursor does not match the requested sort")
+    return offset, returned
+
+
+class ReviewIndex:
+    def __init__(self, reviews: List[Dict]):
+        self.cards = [{field: _clean(review.get(field)) for field in CARD_FIELDS} for review in reviews]
+        for card in self.cards:
+            card['rating'] = _as_number(card['rating'])
+            card['helpful_votes'] = int(_as_number(card['helpful_votes']))
+            card['verified_purchase'] = _as_bool(card['verified_purchase'])
+            if card['sentiment'] not in SENTIMENTS:
+                card['sentiment'] = 'neutral'
+
+        positions = range(len(self.cards))
+        dates = [_date_ordinal(card['date']) for card in self.cards]
+        compounds = [_as_number(card['compound']) for card in self.cards]
+        # Sorted once per results file; queries only walk these lists
+        self.orders: Dict[str, List[int]] = {
+            "default": list(positions),
+            "date": sorted(positions, key=lambda i: dates[i], reverse=True),
+            "helpful": sorted(positions, key=lambda i: self.cards[i]['helpful_votes'], reverse=True),
+            "score": sorted(positions, key=lambda i: compounds[i], reverse=True),
+        }
+        self.by_sentiment: Dict[str, Set[int]] = {sentiment: set() for sentiment in SENTIMENTS}
+        self.by_rating: Dict[int, Set[int]] = {}
+        self.verified: Set[int] = set()
+        for i, card in enumerate(self.cards):
+            self.by_sentiment[card['sentiment']].add(i)
+            self.by_rating.setdefault(int(card['rating']), set()).add(i)
+            if card['verified_purchase']:
+                self.verified.add(i)
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def matching(self, sentiment: Optional[str] = None, rating: Optional[int] = None,
+                 verified: Optional[bool] = None) -> Optional[Set[int]]:
+        # None means no filter applies, so every position matches
+        sets = []
+        if sentiment:
+            sets.append(self.by_sentiment.get(sentiment, set()))
+        if rating is not None:
+            sets.append(self.by_rating.get(rating, set()))
+        if verified is not None:
+            sets.append(self.verified if verified else set(range(len(self.cards))) - self.verified)
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return set.intersection(*sets)
+
+    def query(self, sentiment: Optional[str] = None, rating: Optional[int] = None, verified: Optional[bool] = None,
+              sort: str = "default", cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        if sort not in self.orders:
+            raise ValueError(f"Unknown sort: {sort}. Choose one of {list(SORTS)}")
+        if sentiment and sentiment not in SENTIMENTS:
+            raise ValueError(f"Unknown sentiment: {sentiment}. Choose one of {list(SENTIMENTS)}")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        position, returned = decode_cursor(cursor, sort) if cursor else (0, 0)
+
+        matches = self.matching(sentiment, rating, verified)
+        total = len(self.cards) if matches is None else len(matches)
+        order = self.orders[sort]
+        page: List[Dict] = []
+        while position < len(order) and len(page) < limit:
+            i = order[position]
+            position += 1
+            if matches is None or i in matches:
+                page.append(self.cards[i])
+        returned += len(page)
+        return {
+            'reviews': page,
+            'total': total,
+            'next_cursor': encode_cursor(sort, position, returned) if returned < total and position < len(order) else None,
+        }
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def _cached_review_index(filepath: str, mtime: float, summary_file: Optional[str],
+                         product_url: Optional[str]) -> ReviewIndex:
+    view = get_results_view(filepath, summary_file, product_url)
+    return ReviewIndex(view['reviews'])
+
+
+def get_review_index(filepath: str, summary_file: Optional[str] = None, product_url: Optional[str] = None) -> ReviewIndex:
+    return _cached_review_index(filepath, os.path.getmtime(filepath), summary_file, product_url)
@@ -0,0 +1,111 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from backend.review_fields import parse_review_date
+from backend.review_sink import atomic_path
+
+# --- Configuration ---
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+PARQUET_ROW_GROUP_SIZE = 50000
+# Export metadata and summary travel in the file footer, so a Parquet export is as self-contained as the JSON one
+METADATA_KEY = b"amazon_reviews"
+
+REVIEW_SCHEMA = pa.schema([
+    ("review_id", pa.string()),
+    ("reviewer_name", pa.string()),
+    ("rating", pa.float64()),
+    ("title", pa.string()),
+    ("body", pa.string()),
+    # The scraped text as exported to JSON and CSV, plus its parsed form (null where the format is not recognised)
+    ("date", pa.string()),
+    ("review_date", pa.timestamp("s")),
+    ("country", pa.string()),
+    ("verified_purchase", pa.bool_()),
+    ("product_variant", pa.string()),
+    ("helpful_votes", pa.int32()),
+    ("images", pa.list_(pa.string())),
+    ("extracted_at", pa.timestamp("us")),
+    ("sentiment", pa.dictionary(pa.int8(), pa.string())),
+    ("compound", pa.float64()),
+    ("pos", pa.float64()),
+    ("neg", pa.float64()),
+    ("neu", pa.float64()),
+    ("duplicate_of", pa.string()),
+    ("duplicate_score", pa.float64()),
+])
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _number(value, cast, default=None):
+    try:
+        return cast(value) if value is not None and value == value else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_row(review: Dict) -> Dict:
+    images = review.get("images")
+    return {
+        "review_id": review.get("review_id"),
+        "reviewer_name": review.get("reviewer_name"),
+        "rating": _number(review.get("rating"), float, 0.0),
+        "title": review.get("title"),
+        "body": review.get("body"),
+        "date": review.get("date"),
+        "review_date": parse_review_date(review.get("date")),
+        "country": review.get("country"),
+        "verified_purchase": bool(review.get("verified_purchase")),
+        "product_variant": review.get("product_variant"),
+        "helpful_votes": _number(review.get("helpful_votes"), int, 0),
+        "images": [str(src) for src in images] if isinstance(images, list) else [],
+        "extracted_at": _parse_timestamp(review.get("extracted_at")),
+        "sentiment": review.get("sentiment"),
+        "compound": _number(review.get("compound"), float),
+        "pos": _number(review.get("pos"), float),
+        "neg": _number(review.get("neg"), float),
+        "neu": _number(review.get("neu"), float),
+        "duplicate_of": review.get("duplicate_of") or None,
+        "duplicate_score": _number(review.get("duplicate_score"), float),
+    }
+
+
+def write_reviews_parquet(path, reviews: List[Dict], metadata: Dict, trailer: Optional[Dict] = None,
+                          compression: str = PARQUET_COMPRESSION) -> str:
+    table = pa.Table.from_pylist([_to_row(review) for review in reviews], schema=REVIEW_SCHEMA)
+    footer = json.dumps({"metadata": metadata, **(trailer or {})}, ensure_ascii=False).encode("utf-8")
+    table = table.replace_schema_metadata({METADATA_KEY: footer})
+    with atomic_path(Path(path)) as tmp_path:
+        pq.write_table(table, tmp_path, compression=compression, row_group_size=PARQUET_ROW_GROUP_SIZE)
+    return str(path)
+
+
+def read_parquet_metadata(path) -> Dict:
+    # Footer only; no column data is read
+    schema = pq.read_schema(path, memory_map=True)
+    footer = (schema.metadata or {}).get(METADATA_KEY)
+    return json.loads(footer) if footer else {}
+
+
+def read_reviews_parquet(path, columns: Optional[List[str]] = None) -> Tuple[List[Dict], Dict]:
+    # Only the requested columns are decoded, straight from the memory-mapped file
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    reviews = table.to_pylist()
+    for column in ("review_date", "extracted_at"):
+        if column in table.column_names:
+            for review in reviews:
+                review[column] = review[column].isoformat() if review[column] else None
+    return reviews, read_parquet_metadata(path)
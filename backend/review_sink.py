@@ -0,0 +1,80 @@
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+
+
+@contextmanager
+def atomic_path(path):
+    # Writers fill a temp file next to the target; readers only ever see the old file or the finished one.
+    # The temp name is unique per writer, so processes writing the same target never share one.
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+class ReviewSpool:
+    # Append-only JSONL sink used in place of the in-memory review list during a crawl. Each crawl creates its
+    # own file; opening one that already exists fails rather than mixing two crawls' reviews.
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "x", encoding="utf-8")
+        self._count = 0
+
+    def extend(self, reviews: Iterable[Dict]):
+        for review in reviews:
+            self._file.write(json.dumps(review, ensure_ascii=False) + "\n")
+            self._count += 1
+        # One flush per page, so a crash loses at most the page being written
+        self._file.flush()
+
+    def append(self, review: Dict):
+        self.extend([review])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Dict]:
+        if not self._file.closed:
+            self._file.flush()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+
+def _indented(value, level: int) -> str:
+    return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + " " * level)
+
+
+def write_json_export(path, metadata: Dict, reviews: Iterable[Dict], trailer: Dict) -> int:
+    # Same layout as json.dump(indent=2), but reviews are written one at a time instead of as one document
+    count = 0
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write('{\n  "metadata": ' + _indented(metadata, 2) + ',\n  "reviews": [')
+            for review in reviews:
+                f.write((",\n    " if count else "\n    ") + _indented(review, 4))
+                count += 1
+            f.write("\n  ]" if count else "]")
+            for key, value in trailer.items():
+                f.write(f',\n  {json.dumps(key)}: ' + _indented(value, 2))
+            f.write("\n}")
+    return count
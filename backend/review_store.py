@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# --- Configuration ---
+REVIEW_STORE_PATH = os.getenv("REVIEW_STORE_PATH", "reviews/reviews.db")
+SQLITE_TIMEOUT_SECONDS = 30
+
+REVIEW_COLUMNS = [
+    'review_id', 'reviewer_name', 'rating', 'title', 'body',
+    'date', 'country', 'verified_purchase', 'product_variant',
+    'helpful_votes', 'images', 'extracted_at'
+]
+SENTIMENT_COLUMNS = ['compound', 'pos', 'neg', 'neu', 'sentiment']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    asin TEXT NOT NULL,
+    review_id TEXT NOT NULL,
+    reviewer_name TEXT,
+    rating REAL,
+    title TEXT,
+    body TEXT,
+    date TEXT,
+    country TEXT,
+    verified_purchase INTEGER,
+    product_variant TEXT,
+    helpful_votes INTEGER,
+    images TEXT,
+    extracted_at TEXT,
+    compound REAL,
+    pos REAL,
+    neg REAL,
+    neu REAL,
+    sentiment TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (asin, review_id)
+);
+"""
+
+
+class ReviewStore:
+    def __init__(self, path: str = REVIEW_STORE_PATH, logger: Optional[logging.Logger] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn):
+        # Stores created before sentiment was persisted lack the score columns
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(reviews)")}
+        for column in SENTIMENT_COLUMNS:
+            if column not in existing:
+                column_type = 'TEXT' if column == 'sentiment' else 'REAL'
+                conn.execute(f"ALTER TABLE reviews ADD COLUMN {column} {column_type}")
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per operation keeps the store safe to share between job threads
+        conn = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def known_ids(self, asin: str) -> Set[str]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT review_id FROM reviews WHERE asin = ?", (asin,)).fetchall()
+        return {row[0] for row in rows}
+
+    def count(self, asin: str) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM reviews WHERE asin = ?", (asin,)).fetchone()[0]
+
+    def upsert_reviews(self, asin: str, reviews: Iterable[Dict]) -> int:
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                asin, r['review_id'], r.get('reviewer_name'), r.get('rating'), r.get('title'), r.get('body'),
+                r.get('date'), r.get('country'), int(bool(r.get('verified_purchase'))), r.get('product_variant'),
+                r.get('helpful_votes'), json.dumps(r.get('images') or [], ensure_ascii=False), r.get('extracted_at'),
+                now, now
+            )
+            for r in reviews if r.get('review_id') and 'error' not in r
+        ]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT INTO reviews (asin, review_id, reviewer_name, rating, title, body, date, country,
+                                     verified_purchase, product_variant, helpful_votes, images, extracted_at,
+                                     first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (asin, review_id) DO UPDATE SET
+                    reviewer_name = excluded.reviewer_name,
+                    rating = excluded.rating,
+                    title = excluded.title,
+                    body = excluded.body,
+                    compound = CASE WHEN reviews.body IS excluded.body THEN reviews.compound END,
+                    pos = CASE WHEN reviews.body IS excluded.body THEN reviews.pos END,
+                    neg = CASE WHEN reviews.body IS excluded.body THEN reviews.neg END,
+                    neu = CASE WHEN reviews.body IS excluded.body THEN reviews.neu END,
+                    sentiment = CASE WHEN reviews.body IS excluded.body THEN reviews.sentiment END,
+                    helpful_votes = excluded.helpful_votes,
+                    images = excluded.images,
+                    extracted_at = excluded.extracted_at,
+                    last_seen = excluded.last_seen
+                """,
+                rows
+            )
+            changed = conn.total_changes - before
+        self.logger.debug(f"Stored {changed} reviews for {asin}")
+        return changed
+
+    def save_sentiment(self, asin: str, reviews: Iterable[Dict]) -> int:
+        rows = [
+            (r['compound'], r['pos'], r['neg'], r['neu'], r['sentiment'], asin, r['review_id'])
+            for r in reviews if r.get('review_id') and r.get('compound') is not None and r.get('sentiment')
+        ]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE reviews SET compound = ?, pos = ?, neg = ?, neu = ?, sentiment = ? "
+                "WHERE asin = ? AND review_id = ?",
+                rows
+            )
+            return conn.total_changes - before
+
+    def get_reviews(self, asin: str) -> List[Dict]:
+        columns = REVIEW_COLUMNS + SENTIMENT_COLUMNS
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM reviews WHERE asin = ? ORDER BY rowid", (asin,)
+            ).fetchall()
+        reviews = []
+        for row in rows:
+            review = dict(zip(columns, row))
+            review['verified_purchase'] = bool(review['verified_purchase'])
+            review['images'] = json.loads(review['images'] or '[]')
+            reviews.append(review)
+        return reviews
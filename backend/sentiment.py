@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+# --- Configuration ---
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "1000"))
+# Below this many unscored reviews the process pool costs more than it saves
+SENTIMENT_PROCESS_THRESHOLD = int(os.getenv("SENTIMENT_PROCESS_THRESHOLD", "5000"))
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", str(os.cpu_count() or 1)))
+# Scoring runs in processes threaded with logging, job and pool threads; forking those can deadlock the children
+SENTIMENT_START_METHOD = os.getenv("SENTIMENT_START_METHOD", "forkserver")
+SCORE_KEYS = ("compound", "pos", "neg", "neu")
+EMPTY_SCORES = {"compound": 0.0, "pos": 0.0, "neg": 0.0, "neu": 0.0}
+
+_analyzer = None
+
+
+def get_analyzer():
+    # One analyzer (and one lexicon load) per process, reused by every batch that process scores.
+    # gunicorn loads it in the master before forking, so web workers share the lexicon pages.
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def label_for(compound: float) -> str:
+    if compound >= POSITIVE_THRESHOLD:
+        return "positive"
+    if compound <= NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+
+def score_texts(texts: List[str]) -> List[Dict[str, float]]:
+    analyzer = get_analyzer()
+    results = []
+    for text in texts:
+        if not text:
+            results.append(dict(EMPTY_SCORES))
+            continue
+        scores = analyzer.polarity_scores(text)
+        results.append({key: scores[key] for key in SCORE_KEYS})
+    return results
+
+
+def is_scored(review: Dict) -> bool:
+    compound = review.get("compound")
+    # Blank CSV cells read back as NaN, which counts as unscored
+    return isinstance(compound, (int, float)) and compound == compound and \
+        review.get("sentiment") in ("positive", "negative", "neutral")
+
+
+def score_reviews(reviews: List[Dict], workers: int = SENTIMENT_WORKERS, batch_size: int = SENTIMENT_BATCH_SIZE,
+                  process_threshold: int = SENTIMENT_PROCESS_THRESHOLD) -> int:
+    # Scores every review that has no stored scores yet, in place; returns how many were scored
+    pending = [review for review in reviews if not is_scored(review)]
+    if not pending:
+        return 0
+    texts = [review.get("body") if isinstance(review.get("body"), str) else "" for review in pending]
+
+    if workers > 1 and len(texts) >= process_threshold:
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches)), initializer=get_analyzer,
+                                 mp_context=multiprocessing.get_context(SENTIMENT_START_METHOD)) as executor:
+            results = [scores for batch in executor.map(score_texts, batches) for scores in batch]
+    else:
+        results = score_texts(texts)
+
+    for review, scores in zip(pending, results):
+        review.update(scores)
+        review["sentiment"] = label_for(scores["compound"])
+    return len(pending)
+
+
+def count_sentiments(reviews: List[Dict]) -> Dict[str, int]:
+    # Reviews without a body are labelled neutral but, as before, not counted
+    counts = {"positive": 0, "negative": 0, "neutral": 0}
+    for review in reviews:
+        if review.get("body") and review.get("sentiment") in counts:
+            counts[review["sentiment"]] += 1
+    return counts
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+from tenacity import retry, stop_after_attempt, wait_fixed
+
+from backend.metrics import count_retry
+
+# --- Configuration ---
+SUMMARY_BACKEND = os.getenv("SUMMARY_BACKEND", "openai")
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-3.5-turbo")
+# Any server speaking the chat-completions API, e.g. benchmarks/stub_llm_server.py
+SUMMARY_BASE_URL = os.getenv("SUMMARY_BASE_URL", "http://127.0.0.1:8799/v1")
+# Prompt budget per request; gpt-3.5-turbo has a 4k context and 500 tokens are reserved for the answer
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+SUMMARY_PARALLELISM = int(os.getenv("SUMMARY_PARALLELISM", "4"))
+SUMMARY_MAX_TOKENS = 500
+SUMMARY_TIMEOUT_SECONDS = 60
+# Rough English average; avoids a tokenizer dependency for budgeting
+CHARS_PER_TOKEN = 4
+SUMMARY_ITEMS = 5
+BACKENDS = ["openai", "http"]
+
+MAP_PROMPT = """
+Based on the following Amazon reviews, generate:
+1. 5 pros about the product.
+2. 5 cons about the product.
+3. A 5-line summary of the product based on the reviews.
+
+Reviews:
+{reviews}
+
+Return the response in JSON format with keys 'pros', 'cons', and 'summary', where 'pros' and 'cons' are lists of 5 items each, and 'summary' is a list of 5 strings.
+"""
+
+REDUCE_PROMPT = """
+The following are partial analyses of different batches of Amazon reviews for the same product.
+Merge them into one analysis of the whole product: combine duplicate points, keep the points mentioned most often, and generate:
+1. 5 pros about the product.
+2. 5 cons about the product.
+3. A 5-line summary of the product.
+
+Partial analyses:
+{partials}
+
+Return the response in JSON format with keys 'pros', 'cons', and 'summary', where 'pros' and 'cons' are lists of 5 items each, and 'summary' is a list of 5 strings.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def parse_summary_json(content: str) -> Dict[str, List[str]]:
+    # Models sometimes wrap the JSON in a markdown code fence
+    content = content.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", content, re.DOTALL)
+    if fenced:
+        content = fenced.group(1)
+    result = json.loads(content)
+    return {key: [str(item) for item in result.get(key, [])] for key in ("pros", "cons", "summary")}
+
+
+def pad_summary(result: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    padded = {}
+    for key, filler in (("pros", "No pros available"), ("cons", "No cons available"),
+                        ("summary", "No summary available")):
+        items = list(result.get(key, []))[:SUMMARY_ITEMS]
+        padded[key] = items + [filler] * (SUMMARY_ITEMS - len(items))
+    return padded
+
+
+class OpenAIChatBackend:
+    def __init__(self, model: str = SUMMARY_MODEL):
+        self.model = model
+
+    def complete(self, prompt: str) -> str:
+        # The openai SDK takes about half a second to import, so it is loaded by the first request;
+        # its module-level client reads OPENAI_API_KEY from the environment
+        import openai
+        response = openai.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=SUMMARY_MAX_TOKENS,
+            temperature=0.7
+        )
+        return response.choices[0].message.content
+
+
+class HttpChatBackend:
+    # Plain HTTP client for chat-completions compatible servers, including the offline stub
+    def __init__(self, base_url: str = SUMMARY_BASE_URL, model: str = SUMMARY_MODEL, api_key: Optional[str] = None):
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.model = model
+        self.session = requests.Session()
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def complete(self, prompt: str) -> str:
+        response = self.session.post(self.url, timeout=SUMMARY_TIMEOUT_SECONDS, json={
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": SUMMARY_MAX_TOKENS,
+            "temperature": 0.7,
+        })
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+
+def create_chat_backend(name: str = SUMMARY_BACKEND):
+    if name == "openai":
+        return OpenAIChatBackend()
+    if name == "http":
+        return HttpChatBackend(api_key=os.getenv("OPENAI_API_KEY"))
+    raise ValueError(f"Unknown summary backend: {name}. Choose one of {BACKENDS}")
+
+
+class ReviewSummarizer:
+    def __init__(self, backend=None, chunk_tokens: int = SUMMARY_CHUNK_TOKENS,
+                 parallelism: int = SUMMARY_PARALLELISM, logger: Optional[logging.Logger] = None):
+        self.backend = backend or create_chat_backend()
+        self.chunk_tokens = chunk_tokens
+        self.parallelism = max(1, parallelism)
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+
+    def cache_version(self) -> str:
+        # Anything that changes the output for the same reviews must change the cache key
+        backend = type(self.backend).__name__
+        model = getattr(self.backend, "model", backend)
+        fingerprint = "|".join([MAP_PROMPT, REDUCE_PROMPT, backend, getattr(self.backend, "url", ""), model,
+                                str(self.chunk_tokens)])
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def chunk_texts(self, texts: List[str], template: str) -> List[List[str]]:
+        budget = self.chunk_tokens - estimate_tokens(template)
+        chunks, current, used = [], [], 0
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if tokens > budget:
+                # A single oversized review is cut down to fit a request on its own
+                text = text[:budget * CHARS_PER_TOKEN]
+                tokens = budget
+            if current and used + tokens > budget:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(text)
+            used += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @retry(wait=wait_fixed(2), stop=stop_after_attempt(3), reraise=True, before_sleep=count_retry("summary-request"))
+    def _complete(self, prompt: str) -> Dict[str, List[str]]:
+        return parse_summary_json(self.backend.complete(prompt))
+
+    def _run_prompts(self, prompts: List[str], stage: str) -> List[Dict[str, List[str]]]:
+        def attempt(prompt):
+            try:
+                return self._complete(prompt)
+            except Exception as e:
+                self.logger.warning(f"Summary {stage} request failed: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(self.parallelism, len(prompts)),
+                                thread_name_prefix=f"summary-{stage}") as executor:
+            results = [result for result in executor.map(attempt, prompts) if result is not None]
+        if not results:
+            raise RuntimeError(f"All {len(prompts)} summary {stage} requests failed")
+        if len(results) < len(prompts):
+            self.logger.warning(f"{len(prompts) - len(results)} of {len(prompts)} summary {stage} requests failed")
+        return results
+
+    @staticmethod
+    def review_texts(reviews: List[Dict]) -> List[str]:
+        return [f"Rating: {r.get('rating')}, Review: {r['body']}" for r in reviews if r.get('body')]
+
+    def reduce(self, partials: List[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        # Reduce until a single result is left; partials that do not fit one prompt are merged in groups
+        while len(partials) > 1:
+            rendered = [json.dumps(partial, ensure_ascii=False) for partial in partials]
+            groups = self.chunk_texts(rendered, REDUCE_PROMPT)
+            if len(groups) == len(partials):
+                # Every partial fills a prompt by itself; pair them up so the reduction still converges
+                groups = [rendered[i:i + 2] for i in range(0, len(rendered), 2)]
+            self.logger.info(f"Reducing {len(partials)} partial summaries in {len(groups)} requests")
+            partials = self._run_prompts([REDUCE_PROMPT.format(partials="\n".join(group)) for group in groups],
+                                         "reduce")
+        return pad_summary(partials[0])
+
+    def summarize(self, reviews: List[Dict]) -> Dict[str, List[str]]:
+        texts = self.review_texts(reviews)
+        if not texts:
+            return pad_summary({})
+
+        chunks = self.chunk_texts(texts, MAP_PROMPT)
+        self.logger.info(f"Summarizing {len(texts)} reviews in {len(chunks)} chunks "
+                         f"({self.parallelism} parallel requests)")
+        partials = self._run_prompts([MAP_PROMPT.format(reviews="\n".join(chunk)) for chunk in chunks], "map")
+        return self.reduce(partials)
+
+    def start_session(self, timeline=None, hold: bool = False) -> "SummarySession":
+        return SummarySession(self, timeline, hold)
+
+
+class SummarySession:
+    # Incremental map step: chunks are sent as soon as they fill up while reviews keep arriving,
+    # leaving only the last chunk and the reduce for finish(). A held session only builds the chunks and
+    # sends nothing before finish(), for runs that may still be answered from the summary cache.
+    def __init__(self, summarizer: ReviewSummarizer, timeline=None, hold: bool = False):
+        self.summarizer = summarizer
+        self.timeline = timeline
+        self.logger = summarizer.logger
+        self.executor = ThreadPoolExecutor(max_workers=summarizer.parallelism, thread_name_prefix="summary-map")
+        self.hold = hold
+        self.held: List[List[str]] = []
+        self.pending: List[str] = []
+        self.futures: List[Future] = []
+        self.reviews_added = 0
+
+    def add(self, reviews: List[Dict]):
+        texts = self.summarizer.review_texts(reviews)
+        self.reviews_added += len(texts)
+        chunks = self.summarizer.chunk_texts(self.pending + texts, MAP_PROMPT)
+        for chunk in chunks[:-1]:
+            self._submit(chunk)
+        self.pending = chunks[-1] if chunks else []
+
+    def _submit(self, chunk: List[str]):
+        if self.hold:
+            self.held.append(chunk)
+            return
+        self.futures.append(self.executor.submit(self._map, MAP_PROMPT.format(reviews="\n".join(chunk))))
+
+    def _map(self, prompt: str) -> Optional[Dict[str, List[str]]]:
+        start = time.perf_counter()
+        try:
+            return self.summarizer._complete(prompt)
+        except Exception as e:
+            self.logger.warning(f"Summary map request failed: {str(e)}")
+            return None
+        finally:
+            if self.timeline is not None:
+                self.timeline.record("summary-map", start, time.perf_counter())
+
+    def finish(self) -> Dict[str, List[str]]:
+        self.hold = False
+        for chunk in self.held:
+            self._submit(chunk)
+        self.held = []
+        if self.pending:
+            self._submit(self.pending)
+            self.pending = []
+        results = [future.result() for future in self.futures]
+        self.executor.shutdown()
+        if not results:
+            return pad_summary({})
+        partials = [result for result in results if result is not None]
+        if not partials:
+            raise RuntimeError(f"All {len(results)} summary map requests failed")
+        self.logger.info(f"Summarized {self.reviews_added} reviews in {len(results)} chunks while crawling")
+        start = time.perf_counter()
+        try:
+            return self.summarizer.reduce(partials)
+        finally:
+            if self.timeline is not None:
+                self.timeline.record("summary-reduce", start, time.perf_counter())
+
+    def cancel(self):
+        self.held = []
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from backend.review_sink import atomic_path
+
+# --- Configuration ---
+SUMMARY_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR", "reviews/summary_cache")
+SUMMARY_CACHE_MAX_BYTES = int(os.getenv("SUMMARY_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+SUMMARY_CACHE_MAX_AGE_DAYS = float(os.getenv("SUMMARY_CACHE_MAX_AGE_DAYS", "30"))
+# Reuse the last summary for a product while at most this share of its reviews is new (0 disables near hits)
+SUMMARY_CACHE_NEAR_HIT_THRESHOLD = float(os.getenv("SUMMARY_CACHE_NEAR_HIT_THRESHOLD", "0.1"))
+
+
+def review_fingerprint(review: Dict) -> str:
+    # Case and whitespace changes in the scraped text should not invalidate a summary
+    body = " ".join(str(review.get("body") or "").split()).lower()
+    return hashlib.sha1(f"{review.get('rating')}|{body}".encode("utf-8")).hexdigest()
+
+
+def summary_key(fingerprints: Iterable[str], version: str) -> str:
+    digest = hashlib.sha256(version.encode("utf-8"))
+    for fingerprint in sorted(fingerprints):
+        digest.update(fingerprint.encode("ascii"))
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, path: str = SUMMARY_CACHE_DIR, max_bytes: int = SUMMARY_CACHE_MAX_BYTES,
+                 max_age_days: float = SUMMARY_CACHE_MAX_AGE_DAYS,
+                 near_hit_threshold: float = SUMMARY_CACHE_NEAR_HIT_THRESHOLD,
+                 logger: Optional[logging.Logger] = None):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400
+        self.near_hit_threshold = near_hit_threshold
+        self.logger = logger or logging.getLogger("AmazonExtractorLogger")
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "near_hits": 0, "misses": 0}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def _latest_path(self, asin: str, version: str) -> Path:
+        # Pointer to the newest entry per product and prompt version, used for near hits
+        return self.path / f"latest_{asin}_{version[:16]}.txt"
+
+    def _load(self, path: Path) -> Optional[Dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry.get("created_at", 0) > self.max_age_seconds:
+                return None
+            # Touch on read so size eviction drops the least recently used entries first
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def has_previous(self, asin: str, version: str) -> bool:
+        # Without an earlier summary for the product, a lookup can only miss (exact hits on another product's
+        # identical reviews aside)
+        latest = self._latest_path(asin, version)
+        try:
+            return self._load(self._entry_path(latest.read_text().strip())) is not None
+        except OSError:
+            return False
+
+    def get(self, asin: str, reviews: List[Dict], version: str) -> Optional[Dict]:
+        fingerprints = [review_fingerprint(r) for r in reviews if r.get("body")]
+        key = summary_key(fingerprints, version)
+        entry = self._load(self._entry_path(key))
+        outcome = "hit" if entry else "miss"
+
+        if entry is None and self.near_hit_threshold > 0 and fingerprints:
+            latest = self._latest_path(asin, version)
+            previous = self._load(self._entry_path(latest.read_text().strip())) if latest.exists() else None
+            if previous is not None:
+                new_reviews = len(set(fingerprints) - set(previous["fingerprints"]))
+                if new_reviews / len(fingerprints) <= self.near_hit_threshold:
+                    entry, outcome = previous, "near_hit"
+                    self.logger.info(f"Summary cache near hit for {asin}: {new_reviews} of {len(fingerprints)} "
+                                     f"reviews are new (threshold {self.near_hit_threshold:.0%})")
+
+        with self._lock:
+            self._stats[{"hit": "hits", "near_hit": "near_hits", "miss": "misses"}[outcome]] += 1
+            stats = dict(self._stats)
+        lookups = sum(stats.values())
+        hit_rate = (stats["hits"] + stats["near_hits"]) / lookups
+        self.logger.info(f"Summary cache {outcome.replace('_', ' ')} for {asin} ({key[:12]}); hit rate "
+                         f"{hit_rate:.0%} over {lookups} lookups ({stats['hits']} hits, "
+                         f"{stats['near_hits']} near hits, {stats['misses']} misses)")
+        return entry["result"] if entry else None
+
+    def put(self, asin: str, reviews: List[Dict], version: str, result: Dict) -> str:
+        fingerprints = [review_fingerprint(r) for r in reviews if r.get("body")]
+        key = summary_key(fingerprints, version)
+        entry = {
+            "key": key,
+            "asin": asin,
+            "version": version,
+            "created_at": time.time(),
+            "fingerprints": sorted(set(fingerprints)),
+            "result": result,
+        }
+        with atomic_path(self._entry_path(key)) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+        with atomic_path(self._latest_path(asin, version)) as tmp_path:
+            tmp_path.write_text(key)
+        self.evict()
+        return key
+
+    def evict(self) -> int:
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.path.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        for pointer in self.path.glob("latest_*.txt"):
+            try:
+                if not self._entry_path(pointer.read_text().strip()).exists():
+                    pointer.unlink()
+            except OSError:
+                continue
+        if removed:
+            self.logger.info(f"Evicted {removed} summary cache entries ({total} bytes kept)")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,99 @@
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.amazon_review import REVIEWS_BASE_URL, create_chrome_driver
+from backend.browser_profile import BROWSER_PROFILES
+
+# Bytes come from the Resource Timing API: transferSize where the server allows it, otherwise the
+# encoded body size. Blocked requests never start, so they add nothing.
+PAGE_STATS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+const size = e => e.transferSize || e.encodedBodySize || 0;
+return {
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+    load_ms: nav ? nav.loadEventEnd : null,
+    requests: resources.length + 1,
+    bytes: resources.reduce((total, e) => total + size(e), nav ? size(nav) : 0)
+};
+"""
+
+
+def process_tree_rss(root_pid: int) -> int:
+    # Sum VmRSS over chromedriver and every Chrome process below it (Linux /proc only)
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total, pending = 0, [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def run_profile(profile, urls, repeat, logger):
+    driver = create_chrome_driver(logger, debug_mode=False, profile=profile)
+    if driver is None:
+        raise RuntimeError(f"Could not start Chrome for the {profile} profile")
+    loads, peak_rss = [], 0
+    try:
+        for _ in range(repeat):
+            for url in urls:
+                start = time.perf_counter()
+                driver.get(url)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                stats = driver.execute_script(PAGE_STATS_SCRIPT)
+                loads.append({"url": url, "get_ms": round(elapsed_ms, 1), **stats})
+                if os.path.isdir("/proc"):
+                    peak_rss = max(peak_rss, process_tree_rss(driver.service.process.pid))
+    finally:
+        driver.quit()
+    get_ms = [load["get_ms"] for load in loads]
+    return {
+        "profile": profile,
+        "pages": len(loads),
+        "get_ms_median": round(statistics.median(get_ms), 1),
+        "get_ms_mean": round(statistics.mean(get_ms), 1),
+        "bytes_per_page": int(statistics.mean(load["bytes"] for load in loads)),
+        "requests_per_page": round(statistics.mean(load["requests"] for load in loads), 1),
+        "peak_rss_mb": round(peak_rss / (1024 * 1024), 1) if peak_rss else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare page-load time, bytes and Chrome memory across browser profiles")
+    parser.add_argument("--asin", type=str, default="B0DGJH94KM", help="Product whose first review pages are loaded")
+    parser.add_argument("--urls", type=str, nargs="*", default=None, help="Explicit URLs to load instead of review pages")
+    parser.add_argument("--pages", type=int, default=3, help="Review pages per pass when --urls is not given")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the URL list per profile")
+    parser.add_argument("--profiles", type=str, nargs="+", choices=BROWSER_PROFILES, default=BROWSER_PROFILES)
+    args = parser.parse_args()
+
+    base_url = REVIEWS_BASE_URL or "https://www.amazon.in"
+    urls = args.urls or [f"{base_url.rstrip('/')}/product-reviews/{args.asin}?pageNumber={page}"
+                         for page in range(1, args.pages + 1)]
+    logger = logging.getLogger("bench_browser_profile")
+    print(json.dumps([run_profile(profile, urls, args.repeat, logger) for profile in args.profiles], indent=2))
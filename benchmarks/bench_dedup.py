@@ -0,0 +1,65 @@
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.review_dedup import ReviewDedupIndex
+
+PROBES = 200
+
+
+def synthetic_review(rng: random.Random, vocabulary, review_id: str, words: int = 40):
+    return {"review_id": review_id, "body": " ".join(rng.choice(vocabulary) for _ in range(words))}
+
+
+def near_copy(rng: random.Random, review, review_id: str, edits: int = 1):
+    words = review["body"].split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = "edited"
+    return {"review_id": review_id, "body": " ".join(words)}
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    vocabulary = [f"w{i}" for i in range(args.vocabulary)]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_dedup_") as workdir:
+        index = ReviewDedupIndex(str(Path(workdir) / "dedup.db"))
+        indexed = []
+        for size in args.sizes:
+            batch = [synthetic_review(rng, vocabulary, f"R{i}") for i in range(len(indexed), size)]
+            start = time.perf_counter()
+            for offset in range(0, len(batch), 100):
+                index.flag("B0INDEXED", batch[offset:offset + 100])
+            build_seconds = time.perf_counter() - start
+            indexed.extend(batch)
+
+            # Half unrelated reviews, half copies of indexed ones with one word changed
+            probes = [synthetic_review(rng, vocabulary, f"P{size}_{i}") for i in range(PROBES // 2)]
+            probes += [near_copy(rng, rng.choice(indexed), f"C{size}_{i}") for i in range(PROBES // 2)]
+            start = time.perf_counter()
+            counts = index.flag(f"B0PROBE{size}", probes)
+            probe_seconds = time.perf_counter() - start
+            results.append({
+                "indexed": size,
+                "insert_ms_per_review": round(build_seconds * 1000 / max(1, len(batch)), 3),
+                "check_ms_per_review": round(probe_seconds * 1000 / len(probes), 3),
+                "near_copies_found": counts["near"] + counts["exact"],
+                "near_copies_planted": PROBES // 2,
+                "false_positives": sum(1 for p in probes[:PROBES // 2] if p["duplicate_of"]),
+                "index_mb": round(sum(f.stat().st_size for f in Path(workdir).iterdir()) / (1024 * 1024), 1),
+            })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure duplicate checks per review as the dedup index grows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Distinct words in the synthetic reviews")
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
@@ -0,0 +1,233 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+import backend.amazon_review as amazon_review
+from backend.amazon_review import AmazonReviewExtractor
+from backend.diagnostics import DiagnosticsRecorder
+from backend.log_setup import LOGGER_NAME
+from backend.politeness import PolitenessPolicy
+from backend.summarizer import HttpChatBackend, ReviewSummarizer
+from bench_browser_profile import process_tree_rss
+from fixture_server import SCENARIOS, expected_reviews, serve
+from stub_llm_server import serve as serve_llm
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+# Lower is better for these; everything else compared is higher-is-better
+LOWER_IS_BETTER = {"seconds", "per_review_ms", "round_trips_per_page", "peak_rss_mb", "log_records_per_page",
+                   "log_ms_per_page"}
+
+
+class RoundTripCounter:
+    # Counts WebDriver commands (each one is an HTTP round trip to chromedriver) while active
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._original = WebDriver.execute
+
+    def __enter__(self):
+        counter = self
+
+        def execute(driver, *args, **kwargs):
+            with counter._lock:
+                counter.count += 1
+            return counter._original(driver, *args, **kwargs)
+
+        WebDriver.execute = execute
+        return self
+
+    def __exit__(self, *exc):
+        WebDriver.execute = self._original
+
+
+class LogOverhead:
+    # Records the extractor logged and the time logging calls blocked the threads that made them
+    def __init__(self, logger_name: str = LOGGER_NAME):
+        self.logger = logging.getLogger(logger_name)
+        self.records = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        overhead = self
+        original = self.logger.handle
+
+        def handle(record):
+            start = time.perf_counter()
+            try:
+                return original(record)
+            finally:
+                with overhead._lock:
+                    overhead.records += 1
+                    overhead.seconds += time.perf_counter() - start
+
+        self.logger.handle = handle
+        return self
+
+    def __exit__(self, *exc):
+        del self.logger.handle
+
+
+class RssSampler:
+    # Peak resident memory of this process plus any browsers it launched, sampled in the background
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_tree_rss(os.getpid()))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if os.path.isdir("/proc"):
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+            self.peak = max(self.peak, process_tree_rss(os.getpid()))
+        else:
+            # ru_maxrss is KiB on Linux and bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def run_scenario(asin, engine, workers, max_pages, llm_url):
+    extractor = AmazonReviewExtractor(politeness=PolitenessPolicy.from_preset("off"),
+                                      summarizer=ReviewSummarizer(HttpChatBackend(llm_url)),
+                                      diagnostics=DiagnosticsRecorder(mode="off"))
+    with RoundTripCounter() as trips, RssSampler() as rss, LogOverhead() as logs:
+        start = time.perf_counter()
+        try:
+            output = extractor.run(product_url=f"https://www.amazon.in/dp/{asin}", max_pages=max_pages, save_format="json",
+                                   debug=False, engine=engine, workers=workers)
+        finally:
+            extractor.close()
+        seconds = time.perf_counter() - start
+
+    stages = extractor.stage_timeline.summary()
+    pages = len(extractor.page_extraction_stats)
+    reviews = sum(stat["reviews"] for stat in extractor.page_extraction_stats)
+    extract_ms = sum(stat["latency_ms"] for stat in extractor.page_extraction_stats)
+    crawl = stages.get("crawl")
+    crawl_seconds = crawl["last_end"] - crawl["first_start"] if crawl else seconds
+    return {
+        "scenario": asin,
+        "layout": SCENARIOS[asin]["layout"],
+        "engine": engine,
+        "workers": workers,
+        "ok": output is not None,
+        "seconds": round(seconds, 3),
+        "pages": pages,
+        "reviews": reviews,
+        "expected_reviews": expected_reviews(asin),
+        "pages_per_sec": round(pages / crawl_seconds, 2) if crawl_seconds > 0 else None,
+        "per_review_ms": round(extract_ms / reviews, 3) if reviews else None,
+        "round_trips_per_page": round(trips.count / pages, 1) if pages else None,
+        "peak_rss_mb": round(rss.peak / (1024 * 1024), 1),
+        "log_records_per_page": round(logs.records / pages, 1) if pages else None,
+        "log_ms_per_page": round(logs.seconds * 1000 / pages, 3) if pages else None,
+        "stages": {name: stage["busy"] for name, stage in stages.items()},
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline_path, results):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["scenario"], r["engine"], r["workers"]): r for r in json.load(f)["results"]}
+    for result in results:
+        before = baseline.get((result["scenario"], result["engine"], result["workers"]))
+        if before is None:
+            continue
+        changes = []
+        for metric in ("seconds", "pages_per_sec", "per_review_ms", "round_trips_per_page", "peak_rss_mb",
+                       "log_records_per_page", "log_ms_per_page"):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            delta = (new - old) / old
+            worse = delta > 0 if metric in LOWER_IS_BETTER else delta < 0
+            changes.append(f"{metric} {old} -> {new} ({delta:+.0%}{' worse' if worse and abs(delta) > 0.1 else ''})")
+        print(f"{result['scenario']} {result['engine']} x{result['workers']}: " + "; ".join(changes), file=sys.stderr)
+
+
+def main(args):
+    server = serve(port=args.port, latency=args.latency)
+    llm = serve_llm(port=args.llm_port, latency=args.llm_latency)
+    # Product URLs stay amazon.in so they pass validation; review pages are fetched from the fixture server
+    amazon_review.REVIEWS_BASE_URL = f"http://127.0.0.1:{args.port}"
+    workdir = tempfile.mkdtemp(prefix="bench_scraper_")
+    cwd = os.getcwd()
+    results = []
+    try:
+        # Exports and spools land in a scratch directory instead of the repo's reviews/
+        os.chdir(workdir)
+        for asin in args.scenarios:
+            for engine in args.engines:
+                for workers in args.workers:
+                    results.append(run_scenario(asin, engine, workers, args.max_pages,
+                                                f"http://127.0.0.1:{args.llm_port}/v1"))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        server.shutdown()
+        llm.shutdown()
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": {"latency": args.latency, "llm_latency": args.llm_latency, "max_pages": args.max_pages},
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_scraper_{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the extractor end to end against local review-page fixtures")
+    parser.add_argument("--scenarios", type=str, nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--engines", type=str, nargs="+", choices=amazon_review.ENGINES, default=["http"],
+                        help="Fetching engines to run (selenium needs Chrome and chromedriver)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1], help="Parallel page worker counts")
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the fixture server adds to each page")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds each stub summary request takes")
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--llm-port", type=int, default=8799)
+    parser.add_argument("--output", type=str, default=None, help="Result file (default: benchmarks/results/bench_scraper_<commit>.json)")
+    parser.add_argument("--compare", type=str, default=None, help="Earlier result file to print metric changes against")
+    main(parser.parse_args())
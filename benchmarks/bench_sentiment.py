@@ -0,0 +1,46 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.sentiment import SENTIMENT_WORKERS, score_reviews
+
+REVIEWS_DIR = Path(__file__).resolve().parent.parent / "reviews"
+
+
+def load_bodies():
+    bodies = []
+    for path in sorted(REVIEWS_DIR.glob("amazon_reviews_*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            bodies.extend(r["body"] for r in json.load(f).get("reviews", []) if r.get("body"))
+    return bodies
+
+
+def run(sizes, workers):
+    bodies = load_bodies()
+    results = []
+    for size in sizes:
+        for mode, mode_workers in (("single-process", 1), ("process-pool", workers)):
+            reviews = [{"body": bodies[i % len(bodies)]} for i in range(size)]
+            start = time.perf_counter()
+            score_reviews(reviews, workers=mode_workers, process_threshold=0)
+            elapsed = time.perf_counter() - start
+            results.append({
+                "reviews": size,
+                "mode": mode,
+                "workers": mode_workers,
+                "seconds": round(elapsed, 3),
+                "reviews_per_second": round(size / elapsed, 1),
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batch sentiment scoring throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Review counts to score")
+    parser.add_argument("--workers", type=int, default=SENTIMENT_WORKERS, help="Process pool size")
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.workers), indent=2))
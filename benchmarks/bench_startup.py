@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+IMPORT_SNIPPET = ("import sys, time; sys.path.insert(0, {root!r}); start = time.perf_counter(); import app; "
+                  "print(time.perf_counter() - start)")
+BOOT_TIMEOUT_SECONDS = 60
+
+
+def quiet_env(workdir, **overrides):
+    # No browser prewarm and no state shared with a real deployment
+    return os.environ | {"DRIVER_POOL_PREWARM": "0", "JOB_STORE_PATH": str(Path(workdir) / "jobs.db"),
+                         "REVIEW_STORE_PATH": str(Path(workdir) / "reviews.db")} | overrides
+
+
+def import_seconds(root, workdir, repeats):
+    # A fresh interpreter per sample, so nothing is already in sys.modules
+    samples = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET.format(root=str(root))], capture_output=True,
+                                text=True, cwd=workdir, env=quiet_env(workdir, JOB_BACKEND="sqlite"), check=True)
+        samples.append(float(output.stdout.strip().splitlines()[-1]))
+    return round(statistics.median(samples), 3)
+
+
+def cli_help_seconds(root, workdir, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, str(Path(root) / "backend" / "amazon_review.py"), "--help"],
+                       capture_output=True, cwd=workdir, env=quiet_env(workdir), check=True)
+        samples.append(time.perf_counter() - start)
+    return round(statistics.median(samples), 3)
+
+
+def memory_mb(pid):
+    # Rss counts pages shared with the master in full; Pss splits them between the processes sharing them
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss", "Private_Dirty"):
+                values[key.lower()] = round(int(rest.split()[0]) / 1024, 1)
+    return values
+
+
+def children(pid):
+    found = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(stat.parent.name))
+    return found
+
+
+def gunicorn_memory(root, workdir, workers, preload, port):
+    env = quiet_env(workdir, WEB_CONCURRENCY=str(workers), PORT=str(port), GUNICORN_PRELOAD=str(preload).lower())
+    start = time.perf_counter()
+    master = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", str(Path(root) / "gunicorn.conf.py"),
+                               "--pythonpath", str(root), "app:app"], cwd=workdir, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + BOOT_TIMEOUT_SECONDS
+        while True:
+            try:
+                requests.get(f"http://127.0.0.1:{port}/metrics", timeout=1)
+                break
+            except requests.RequestException:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("gunicorn did not come up")
+                time.sleep(0.05)
+        boot_seconds = time.perf_counter() - start
+        # Every worker renders a page and the metrics before memory is read
+        for _ in range(workers * 10):
+            requests.get(f"http://127.0.0.1:{port}/", timeout=5)
+            requests.get(f"http://127.0.0.1:{port}/metrics", timeout=5)
+        web_workers, job_workers = [], []
+        for pid in children(master.pid):
+            cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+            if b"worker.py" in cmdline:
+                # The master starts a supervisor; the extraction worker is its child
+                job_workers.extend(memory_mb(worker) for worker in children(pid))
+            else:
+                web_workers.append(memory_mb(pid))
+        return {
+            "preload": preload,
+            "workers": workers,
+            "boot_seconds": round(boot_seconds, 3),
+            "master": memory_mb(master.pid),
+            "web_worker_rss_mb": round(statistics.mean(w["rss"] for w in web_workers), 1),
+            "web_worker_pss_mb": round(statistics.mean(w["pss"] for w in web_workers), 1),
+            "web_workers_total_pss_mb": round(sum(w["pss"] for w in web_workers), 1),
+            "extraction_worker": job_workers[0] if job_workers else None,
+        }
+    finally:
+        master.terminate()
+        master.wait(timeout=60)
+
+
+def main(args):
+    root = Path(args.root).resolve()
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        report = {
+            "root": str(root),
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "import_app_seconds": import_seconds(root, workdir, args.repeats),
+            "cli_help_seconds": cli_help_seconds(root, workdir, args.repeats),
+            "gunicorn": [gunicorn_memory(root, workdir, args.workers, preload, args.port) for preload in args.preload],
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_startup_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure app import time, CLI start-up and gunicorn worker memory")
+    parser.add_argument("--root", type=str, default=str(ROOT), help="Checkout to measure (e.g. a worktree of an older commit)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=3, help="Gunicorn web workers")
+    parser.add_argument("--preload", type=lambda value: value.lower() == "true", nargs="+", default=[False, True],
+                        help="Gunicorn runs to measure, with and without --preload")
+    parser.add_argument("--port", type=int, default=8786)
+    parser.add_argument("--output", type=str, default=None)
+    main(parser.parse_args())
@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.summarizer import MAP_PROMPT, HttpChatBackend, ReviewSummarizer, SUMMARY_CHUNK_TOKENS
+from stub_llm_server import serve
+
+REVIEWS_DIR = Path(__file__).resolve().parent.parent / "reviews"
+
+
+def load_reviews():
+    reviews = []
+    for path in sorted(REVIEWS_DIR.glob("amazon_reviews_*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            reviews.extend(r for r in json.load(f).get("reviews", []) if r.get("body"))
+    return reviews
+
+
+def run(sizes, parallelism, latency, chunk_tokens, port):
+    server = serve(port=port, latency=latency)
+    base = load_reviews()
+    results = []
+    try:
+        for size in sizes:
+            reviews = [base[i % len(base)] for i in range(size)]
+            for workers in parallelism:
+                summarizer = ReviewSummarizer(HttpChatBackend(f"http://127.0.0.1:{port}/v1"),
+                                              chunk_tokens=chunk_tokens, parallelism=workers)
+                start = time.perf_counter()
+                summarizer.summarize(reviews)
+                elapsed = time.perf_counter() - start
+                results.append({
+                    "reviews": size,
+                    "chunks": len(summarizer.chunk_texts(
+                        [f"Rating: {r.get('rating')}, Review: {r['body']}" for r in reviews], MAP_PROMPT)),
+                    "parallelism": workers,
+                    "seconds": round(elapsed, 3),
+                })
+    finally:
+        server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chunked summarization against the offline stub server")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="Review counts to summarize")
+    parser.add_argument("--parallelism", type=int, nargs="+", default=[1, 4], help="Concurrent request limits")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds each stub completion takes")
+    parser.add_argument("--chunk-tokens", type=int, default=SUMMARY_CHUNK_TOKENS, help="Prompt token budget per request")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.parallelism, args.latency, args.chunk_tokens, args.port), indent=2))
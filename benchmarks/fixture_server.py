@@ -0,0 +1,121 @@
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Offline stand-in for Amazon's review pages: serves the HTML fixtures in benchmarks/fixtures with
+# per-page review IDs and pagination, so the extractor can be benchmarked end to end without the network.
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# One fake ASIN per scenario; `empty_last` appends a page with no reviews, `captcha_page` answers that
+# page (and everything after it) with a robot check
+SCENARIOS = {
+    "B0FIXSTD01": {"layout": "standard", "pages": 5, "empty_last": True},
+    "B0FIXLEG01": {"layout": "legacy", "pages": 5},
+    "B0FIXMOD01": {"layout": "modern", "pages": 5, "empty_last": True},
+    "B0FIXCAP01": {"layout": "standard", "pages": 5, "captcha_page": 3},
+}
+
+PAGINATION = {
+    "standard": ('<ul class="a-pagination"><li class="a-last"><a href="{url}">Next page</a></li></ul>',
+                 '<ul class="a-pagination"><li class="a-disabled a-last">Next page</li></ul>'),
+    "legacy": ('<div class="a-text-center"><span class="a-last"><a href="{url}">Next</a></span></div>',
+               '<div class="a-text-center"><span class="a-last a-disabled">Next</span></div>'),
+    "modern": ('<div class="a-form-actions"><a data-hook="pagination-next" class="a-button-text" href="{url}">Next page</a></div>',
+               ''),
+}
+
+
+def load_fixtures():
+    return {path.stem: path.read_text(encoding="utf-8") for path in FIXTURES_DIR.glob("*.html")}
+
+
+def page_url(asin: str, page: int) -> str:
+    return f"/product-reviews/{asin}?ie=UTF8&reviewerType=all_reviews&pageNumber={page}"
+
+
+def render_page(fixtures, asin: str, page: int) -> str:
+    scenario = SCENARIOS[asin]
+    layout = scenario["layout"]
+    if scenario.get("captcha_page") and page >= scenario["captcha_page"]:
+        return fixtures["captcha"]
+    last_page = scenario["pages"] + (1 if scenario.get("empty_last") else 0)
+    next_link, no_next = PAGINATION[layout]
+    pagination = next_link.format(url=page_url(asin, page + 1)) if page < last_page else no_next
+    template = fixtures["empty"] if page > scenario["pages"] else fixtures[layout]
+    return template.replace("{{page}}", f"{page:03d}").replace("{{pagination}}", pagination)
+
+
+def expected_reviews(asin: str) -> int:
+    scenario = SCENARIOS[asin]
+    pages = scenario["pages"]
+    if scenario.get("captcha_page"):
+        pages = min(pages, scenario["captcha_page"] - 1)
+    return pages * 10
+
+
+class FixtureState:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.fixtures = load_fixtures()
+        self.lock = threading.Lock()
+        self.requests = {}
+
+
+def make_handler(state: FixtureState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path.rstrip("/") == "/stats":
+                with state.lock:
+                    self._send(200, json.dumps(state.requests), "application/json")
+                return
+            match = re.match(r"^/(?:product-reviews|dp)/([A-Z0-9]{10})", parsed.path)
+            if not match or match.group(1) not in SCENARIOS:
+                self._send(404, "<html><body>Document not found</body></html>")
+                return
+            asin = match.group(1)
+            page = int(parse_qs(parsed.query).get("pageNumber", ["1"])[0])
+            with state.lock:
+                state.requests[asin] = state.requests.get(asin, 0) + 1
+            time.sleep(state.latency)
+            if parsed.path.startswith("/dp/"):
+                self._send(200, f'<html><body><a data-hook="see-all-reviews-link-foot" href="{page_url(asin, 1)}">'
+                                f'See all reviews</a></body></html>')
+            else:
+                self._send(200, render_page(state.fixtures, asin, page))
+
+        def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8798, latency: float = 0.0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(FixtureState(latency)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded review-page fixtures for offline scraper runs")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8798)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(FixtureState(args.latency)))
+    print(f"Fixture server on http://{args.host}:{args.port} with scenarios: {', '.join(SCENARIOS)}")
+    server.serve_forever()
@@ -0,0 +1,98 @@
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Offline stand-in for the chat-completions API: answers every summary prompt with canned JSON
+# after a fixed latency, so chunking, parallelism and reduction can be exercised without OpenAI.
+
+
+class StubState:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+def build_answer(prompt: str, request_num: int) -> dict:
+    reviews = len(re.findall(r"Rating: ", prompt))
+    partials = len(re.findall(r'\{"pros"', prompt))
+    source = f"{reviews} reviews" if reviews else f"{partials} partial analyses"
+    return {
+        "pros": [f"Pro {i + 1} from request {request_num} ({source})" for i in range(5)],
+        "cons": [f"Con {i + 1} from request {request_num} ({source})" for i in range(5)],
+        "summary": [f"Summary line {i + 1} from request {request_num} ({source})" for i in range(5)],
+    }
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                with state.lock:
+                    body = {"requests": state.requests, "max_in_flight": state.max_in_flight}
+                self._send(200, body)
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": "not found"})
+                return
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            prompt = "\n".join(message.get("content", "") for message in payload.get("messages", []))
+            with state.lock:
+                state.requests += 1
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+                request_num = state.requests
+            try:
+                time.sleep(state.latency)
+                content = json.dumps(build_answer(prompt, request_num))
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+            self._send(200, {
+                "id": f"stub-{request_num}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "stub"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                          "total_tokens": (len(prompt) + len(content)) // 4},
+            })
+
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8799, latency: float = 0.5) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(StubState(latency)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local chat-completions stub for offline summary runs")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds each completion takes")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(args.latency)))
+    print(f"Stub chat-completions server on http://{args.host}:{args.port}/v1 (latency {args.latency}s)")
+    server.serve_forever()
@@ -0,0 +1,59 @@
+import gc
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Job state lives in SQLite, so any number of web workers can serve status, progress and results
+os.environ.setdefault('JOB_BACKEND', 'sqlite')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+# Threads keep long-lived progress streams from blocking other requests
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+# Import the app once in the master; forked workers share its modules copy-on-write instead of importing them again
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Metrics are recorded by every web worker and by worker.py, where the extractions run. Each process writes them
+# to this directory and /metrics adds them up. It has to exist before the app is preloaded, and a fresh one per
+# start keeps counters from an earlier run out of this one's totals.
+if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='amazon_extractor_metrics_')
+    os.environ['_REMOVE_METRICS_DIR_ON_EXIT'] = '1'
+Path(os.environ['PROMETHEUS_MULTIPROC_DIR']).mkdir(parents=True, exist_ok=True)
+
+
+def on_starting(server):
+    # Extractions run in a separate process that claims queued jobs from the shared store. It is started under
+    # a supervisor that replaces it if it crashes.
+    if os.environ['JOB_BACKEND'] == 'sqlite':
+        server.job_worker = subprocess.Popen([sys.executable, str(Path(__file__).resolve().parent / 'worker.py'),
+                                              '--supervise'])
+        server.log.info(f"Started extraction worker supervisor (pid {server.job_worker.pid})")
+
+
+def when_ready(server):
+    # Runs in the master just before the workers are forked. The VADER lexicon is read-only after loading,
+    # and frozen objects are skipped by the garbage collector, so workers never write to (and copy) those pages.
+    from backend.sentiment import get_analyzer
+    get_analyzer()
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    job_worker = getattr(server, 'job_worker', None)
+    if job_worker is not None and job_worker.poll() is None:
+        job_worker.terminate()
+        try:
+            job_worker.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            job_worker.kill()
+    if os.environ.get('_REMOVE_METRICS_DIR_ON_EXIT'):
+        shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
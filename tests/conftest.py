@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The app modules import as backend.*, and the offline servers live in benchmarks/ next to their benchmarks
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "benchmarks")]
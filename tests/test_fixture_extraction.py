@@ -0,0 +1,117 @@
+import json
+
+import pytest
+import requests
+
+import backend.amazon_review as amazon_review
+from backend.amazon_review import AmazonReviewExtractor
+from backend.diagnostics import DiagnosticsRecorder
+from backend.politeness import PolitenessPolicy
+from backend.summarizer import HttpChatBackend, ReviewSummarizer
+from backend.summary_cache import SummaryCache
+from fixture_server import expected_reviews, serve
+from stub_llm_server import serve as serve_llm
+
+
+@pytest.fixture(scope="module")
+def fixture_url():
+    # Port 0 lets the OS pick a free port, so a server already running on the default one does not get in the way
+    server = serve(port=0)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def llm_url():
+    server = serve_llm(port=0, latency=0)
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+def llm_requests(llm_url):
+    return requests.get(f"{llm_url}/stats", timeout=5).json()["requests"]
+
+
+@pytest.fixture
+def crawl(fixture_url, llm_url, tmp_path, monkeypatch):
+    monkeypatch.setattr(amazon_review, "REVIEWS_BASE_URL", fixture_url)
+    monkeypatch.setattr(amazon_review, "REVIEWS_DIR", str(tmp_path))
+    # No browser here, so every Selenium fallback finds its WebDriver unavailable
+    monkeypatch.setattr(AmazonReviewExtractor, "setup_driver", lambda self, debug_mode=True: False)
+
+    def run(asin, workers=1, pipeline=False, summary_cache=None):
+        extractor = AmazonReviewExtractor(politeness=PolitenessPolicy.from_preset("off"),
+                                          summarizer=ReviewSummarizer(HttpChatBackend(llm_url), chunk_tokens=400),
+                                          summary_cache=summary_cache, diagnostics=DiagnosticsRecorder(mode="off"))
+        output = extractor.run(product_url=f"https://www.amazon.in/dp/{asin}", save_format="json", debug=False,
+                               engine="http", workers=workers, pipeline=pipeline)
+        assert output is not None
+        with open(output, encoding="utf-8") as f:
+            return extractor, json.load(f)
+
+    return run
+
+
+@pytest.mark.parametrize("asin", ["B0FIXSTD01", "B0FIXLEG01", "B0FIXMOD01"])
+def test_layouts_parse_every_review(crawl, asin):
+    extractor, export = crawl(asin)
+    reviews = export["reviews"]
+    assert len(reviews) == expected_reviews(asin)
+    assert export["metadata"]["total_reviews"] == expected_reviews(asin)
+    assert export["metadata"]["failed_pages"] == []
+    assert len({review["review_id"] for review in reviews}) == len(reviews)
+    for review in reviews:
+        assert review["body"] and review["title"] and review["date"]
+        assert 1 <= review["rating"] <= 5
+    assert sum(export["sentiment_analysis"].values()) == len(reviews)
+    assert len(export["summary"]["pros"]) == 5
+
+
+def test_challenge_falls_back_to_browser(crawl, monkeypatch):
+    fallbacks = []
+    original = AmazonReviewExtractor.extract_all_reviews_selenium
+
+    def record_fallback(self, reviews_url, max_pages=None, page_num=1, all_reviews=None, seen_review_ids=None,
+                        navigate=True):
+        fallbacks.append({"page": page_num, "reviews": len(all_reviews), "url": reviews_url})
+        return original(self, reviews_url, max_pages, page_num, all_reviews, seen_review_ids, navigate)
+
+    monkeypatch.setattr(AmazonReviewExtractor, "extract_all_reviews_selenium", record_fallback)
+    extractor, export = crawl("B0FIXCAP01")
+    assert len(fallbacks) == 1
+    assert fallbacks[0]["page"] == 3
+    assert fallbacks[0]["reviews"] == 20
+    assert "pageNumber=3" in fallbacks[0]["url"]
+    # The pages before the CAPTCHA are kept even though the fallback could not go further
+    assert len(export["reviews"]) == expected_reviews("B0FIXCAP01")
+
+
+def test_parallel_crawl_records_failed_pages(crawl):
+    extractor, export = crawl("B0FIXCAP01", workers=3)
+    failed = export["metadata"]["failed_pages"]
+    assert failed == sorted(failed)
+    assert failed[0] == 3
+    assert len(failed) >= amazon_review.PARALLEL_MAX_FAILED_PAGES
+    assert len(export["reviews"]) == expected_reviews("B0FIXCAP01")
+    assert {review["review_id"][:4] for review in export["reviews"]} == {"R001", "R002"}
+
+
+def test_parallel_crawl_does_not_trust_unverified_empty_page(crawl):
+    extractor, export = crawl("B0FIXSTD01", workers=3)
+    assert len(export["reviews"]) == expected_reviews("B0FIXSTD01")
+    assert [review["review_id"] for review in export["reviews"]] == sorted(r["review_id"] for r in export["reviews"])
+    # Page 6 really is empty, but without a browser to confirm it the crawl reports it instead of stopping quietly
+    assert export["metadata"]["failed_pages"][0] == 6
+
+
+def test_pipelined_rerun_is_answered_from_summary_cache(crawl, llm_url, tmp_path):
+    cache = SummaryCache(str(tmp_path / "summary_cache"))
+    before = llm_requests(llm_url)
+    extractor, first = crawl("B0FIXLEG01", pipeline=True, summary_cache=cache)
+    assert llm_requests(llm_url) > before
+    before = llm_requests(llm_url)
+    extractor, second = crawl("B0FIXLEG01", pipeline=True, summary_cache=cache)
+    # The map requests are held until the lookup, so a cached product costs no LLM calls at all
+    assert llm_requests(llm_url) == before
+    assert second["summary"]["pros"] == first["summary"]["pros"]
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,133 @@
+import time
+
+import pytest
+import requests
+
+from backend.summarizer import (MAP_PROMPT, HttpChatBackend, OpenAIChatBackend, ReviewSummarizer, estimate_tokens)
+from stub_llm_server import serve as serve_llm
+
+
+@pytest.fixture
+def stub_llm():
+    servers = []
+
+    def start(latency=0.0):
+        server = serve_llm(port=0, latency=latency)
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def stub_requests(url):
+    return requests.get(f"{url}/stats", timeout=5).json()["requests"]
+
+
+def make_reviews(count, words=40):
+    return [{"review_id": f"R{i:04d}", "rating": i % 5 + 1, "body": " ".join(["battery"] * words) + f" review {i}"}
+            for i in range(count)]
+
+
+def test_chunks_respect_token_budget():
+    summarizer = ReviewSummarizer(HttpChatBackend("http://127.0.0.1:9/v1"), chunk_tokens=400)
+    texts = summarizer.review_texts(make_reviews(30))
+    chunks = summarizer.chunk_texts(texts, MAP_PROMPT)
+    budget = 400 - estimate_tokens(MAP_PROMPT)
+    assert len(chunks) > 1
+    assert [text for chunk in chunks for text in chunk] == texts
+    assert all(sum(estimate_tokens(text) for text in chunk) <= budget for chunk in chunks)
+
+
+def test_oversized_review_is_cut_to_fit():
+    summarizer = ReviewSummarizer(HttpChatBackend("http://127.0.0.1:9/v1"), chunk_tokens=400)
+    chunks = summarizer.chunk_texts(summarizer.review_texts(make_reviews(1, words=2000)), MAP_PROMPT)
+    assert len(chunks) == 1
+    assert estimate_tokens(chunks[0][0]) <= 400 - estimate_tokens(MAP_PROMPT) + 1
+
+
+def test_single_chunk_needs_no_reduce(stub_llm):
+    url = stub_llm()
+    result = ReviewSummarizer(HttpChatBackend(url)).summarize(make_reviews(3))
+    assert stub_requests(url) == 1
+    assert "(3 reviews)" in result["pros"][0]
+    assert all(len(result[key]) == 5 for key in ("pros", "cons", "summary"))
+
+
+def test_map_then_reduce(stub_llm):
+    url = stub_llm()
+    summarizer = ReviewSummarizer(HttpChatBackend(url), chunk_tokens=400, parallelism=3)
+    reviews = make_reviews(30)
+    chunks = summarizer.chunk_texts(summarizer.review_texts(reviews), MAP_PROMPT)
+    result = summarizer.summarize(reviews)
+    # The answer comes from a reduce request, which merges partial analyses rather than reviews
+    assert "partial analyses" in result["summary"][0]
+    assert stub_requests(url) > len(chunks)
+
+
+def test_session_maps_while_reviews_arrive(stub_llm):
+    url = stub_llm()
+    summarizer = ReviewSummarizer(HttpChatBackend(url), chunk_tokens=400, parallelism=2)
+    reviews = make_reviews(30)
+    chunks = summarizer.chunk_texts(summarizer.review_texts(reviews), MAP_PROMPT)
+    session = summarizer.start_session()
+    for start in range(0, len(reviews), 5):
+        session.add(reviews[start:start + 5])
+    # Every full chunk is already on its way; only the last one waits for finish()
+    assert len(session.futures) == len(chunks) - 1
+    result = session.finish()
+    assert session.reviews_added == len(reviews)
+    assert len(session.futures) == len(chunks)
+    assert "partial analyses" in result["pros"][0]
+
+
+def test_session_cancel_after_partial_map(stub_llm):
+    url = stub_llm(latency=0.3)
+    summarizer = ReviewSummarizer(HttpChatBackend(url), chunk_tokens=400, parallelism=1)
+    session = summarizer.start_session()
+    session.add(make_reviews(30))
+    submitted = len(session.futures)
+    assert submitted > 2
+    time.sleep(0.1)
+    started = time.perf_counter()
+    session.cancel()
+    assert time.perf_counter() - started < 0.3
+    time.sleep(0.5)
+    # The request in flight finishes, but queued chunks are never sent
+    assert stub_requests(url) < submitted
+    assert sum(future.cancelled() for future in session.futures) >= submitted - 2
+
+
+def test_held_session_sends_nothing_before_finish(stub_llm):
+    url = stub_llm()
+    summarizer = ReviewSummarizer(HttpChatBackend(url), chunk_tokens=400)
+    session = summarizer.start_session(hold=True)
+    session.add(make_reviews(30))
+    assert session.futures == [] and len(session.held) > 1
+    result = session.finish()
+    assert "partial analyses" in result["pros"][0]
+    assert stub_requests(url) > len(session.futures)
+
+
+def test_held_session_cancel_sends_nothing(stub_llm):
+    url = stub_llm()
+    session = ReviewSummarizer(HttpChatBackend(url), chunk_tokens=400).start_session(hold=True)
+    session.add(make_reviews(30))
+    session.cancel()
+    assert stub_requests(url) == 0
+
+
+def test_cache_version_tracks_backend_and_model():
+    http = ReviewSummarizer(HttpChatBackend("http://127.0.0.1:9/v1", model="gpt-3.5-turbo"))
+    assert http.cache_version() == ReviewSummarizer(HttpChatBackend("http://127.0.0.1:9/v1",
+                                                                    model="gpt-3.5-turbo")).cache_version()
+    versions = {
+        http.cache_version(),
+        ReviewSummarizer(HttpChatBackend("http://127.0.0.1:9/v1", model="gpt-4o-mini")).cache_version(),
+        ReviewSummarizer(HttpChatBackend("http://127.0.0.1:10/v1", model="gpt-3.5-turbo")).cache_version(),
+        ReviewSummarizer(OpenAIChatBackend(model="gpt-3.5-turbo")).cache_version(),
+        ReviewSummarizer(HttpChatBackend("http://127.0.0.1:9/v1", model="gpt-3.5-turbo"),
+                         chunk_tokens=1000).cache_version(),
+    }
+    assert len(versions) == 5
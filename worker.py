@@ -0,0 +1,100 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+# The worker only makes sense with a job store shared with the web processes
+os.environ.setdefault('JOB_BACKEND', 'sqlite')
+
+# --- Configuration ---
+# A worker that exits on its own is restarted after this delay, doubled (up to the maximum) each time
+# it exits again within WORKER_STABLE_SECONDS of starting
+WORKER_RESTART_DELAY_SECONDS = float(os.environ.get('WORKER_RESTART_DELAY_SECONDS', 2))
+WORKER_MAX_RESTART_DELAY_SECONDS = 60
+WORKER_STABLE_SECONDS = 60
+# Below gunicorn's 30 s grace period, so the worker is never left running after the supervisor is killed
+WORKER_STOP_TIMEOUT_SECONDS = 25
+
+
+def serve():
+    from backend.log_setup import configure_logging
+
+    # Extractions run here, so this process writes the rotating log file; web processes only log to stdout
+    configure_logging()
+
+    from app import app, job_registry, prewarm_driver_pool, driver_pool, diagnostics, local_stats
+
+    if app.config['JOB_BACKEND'] != 'sqlite':
+        raise SystemExit("worker.py needs JOB_BACKEND=sqlite")
+    # gunicorn stops the worker with SIGTERM; running jobs finish their current call and new ones are not claimed
+    signal.signal(signal.SIGTERM, lambda signum, frame: job_registry.stop())
+    prewarm_driver_pool()
+    try:
+        # The heartbeat carries this process's pool, cache and diagnostics stats to /status
+        job_registry.serve(stats=local_stats)
+    finally:
+        diagnostics.close()
+        driver_pool.close()
+
+
+def supervise():
+    # Keeps one worker process running: a worker that crashes or is killed is replaced, so queued jobs
+    # do not wait forever while the web processes keep accepting them
+    from backend.log_setup import configure_logging
+    from backend.metrics import mark_process_dead
+
+    logger = configure_logging(to_file=False)
+    stopping = threading.Event()
+    state = {'child': None}
+
+    def stop(signum, frame):
+        stopping.set()
+        child = state['child']
+        if child is not None and child.poll() is None:
+            child.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    parent = os.getppid()
+    delay = WORKER_RESTART_DELAY_SECONDS
+    while not stopping.is_set():
+        started = time.monotonic()
+        child = state['child'] = subprocess.Popen([sys.executable, os.path.abspath(__file__)])
+        logger.info(f"Started extraction worker (pid {child.pid})")
+        while child.poll() is None and not stopping.wait(1):
+            if os.getppid() != parent:
+                # gunicorn went away without stopping us (e.g. it could not bind); never leave a worker behind
+                logger.warning("Parent process exited; stopping the extraction worker")
+                stopping.set()
+        if stopping.is_set():
+            if child.poll() is None:
+                child.terminate()
+            try:
+                child.wait(timeout=WORKER_STOP_TIMEOUT_SECONDS)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Extraction worker (pid {child.pid}) did not stop in time; killing it")
+                child.kill()
+                child.wait()
+            mark_process_dead(child.pid)
+            break
+        mark_process_dead(child.pid)
+        ran = time.monotonic() - started
+        if ran >= WORKER_STABLE_SECONDS:
+            delay = WORKER_RESTART_DELAY_SECONDS
+        logger.error(f"Extraction worker (pid {child.pid}) exited with code {child.returncode} after {ran:.0f}s; "
+                     f"restarting in {delay:.0f}s")
+        stopping.wait(delay)
+        delay = min(delay * 2, WORKER_MAX_RESTART_DELAY_SECONDS)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run queued extraction jobs from the shared SQLite job store")
+    parser.add_argument('--supervise', action='store_true',
+                        help="Run the worker as a child process and restart it whenever it exits")
+    if parser.parse_args().supervise:
+        supervise()
+    else:
+        serve()